@@ -1,13 +1,21 @@
 # app/admin_service.py
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from app.db import get_session
-from models.admin_staff import AdminStaff
-from models.trainer import Trainer
+from app.errors import ServiceError, NotFound, BookingConflict, describe
+from app.identity_cache import lookup_admin, lookup_trainer
 from models.room import Room
 from models.fitness_class import FitnessClass
 from models.equipment import Equipment
 from models.equipment_maintenance import EquipmentMaintenance
+from models.personal_training_session import PersonalTrainingSession
+from models.booking_interval import overlap_conflict, find_overlaps, bulk_insert_class_intervals
+from models.room_occupancy import apply_bookings, class_booking
+from models.trainer_workload import mark_weeks, week_of
+from app.scheduling import ProposedBooking, find_timetable_conflicts, weekly_occurrences
 
 
 def admin_menu():
@@ -17,6 +25,8 @@ def admin_menu():
         print("1. Create class / book room")
         print("2. Log equipment issue")
         print("3. Update equipment maintenance status")
+        print("4. Create recurring class series")
+        print("5. Work the maintenance queue (claim next issue)")
         print("0. Back to main menu")
 
         choice = input("Select an option: ").strip()
@@ -27,6 +37,10 @@ def admin_menu():
             log_equipment_issue()
         elif choice == "3":
             update_maintenance_issue()
+        elif choice == "4":
+            create_class_series()
+        elif choice == "5":
+            work_maintenance_queue()
         elif choice == "0":
             break
         else:
@@ -36,11 +50,11 @@ def admin_menu():
 # Helpers
 
 def find_admin_by_email(session, email: str):
-    return session.query(AdminStaff).filter_by(email=email).first()
+    return lookup_admin(session, email)
 
 
 def find_trainer_by_email(session, email: str):
-    return session.query(Trainer).filter_by(email=email).first()
+    return lookup_trainer(session, email)
 
 
 def parse_datetime(label: str):
@@ -52,6 +66,328 @@ def parse_datetime(label: str):
         return None
 
 
+def parse_date(label: str):
+    d_str = input(f"{label} (YYYY-MM-DD): ").strip()
+    try:
+        return datetime.strptime(d_str, "%Y-%m-%d").date()
+    except ValueError:
+        print("Invalid date format. Please use YYYY-MM-DD.")
+        return None
+
+
+def parse_weekdays(label: str):
+    days_str = input(f"{label} (1 = Monday ... 7 = Sunday, comma separated): ").strip()
+    try:
+        days = sorted({int(d) for d in days_str.split(",") if d.strip()})
+    except ValueError:
+        days = []
+    if not days or days[0] < 1 or days[-1] > 7:
+        print("Invalid weekdays. Example: 1,3,5")
+        return None
+    return days
+
+
+def print_booking_conflict(session, conflict, room_id, trainer_email, start_time, end_time):
+    # Explain an overlap rejected by the database (error path only)
+    if conflict == "room":
+        print("\nError: This time overlaps with an existing booking in that room:")
+        overlaps = find_overlaps(session, start_time, end_time, room_id=room_id)
+    else:
+        trainer = require_trainer(session, trainer_email)
+        print(
+            f"\nError: {trainer.first_name} {trainer.last_name} is already "
+            "booked at that time:"
+        )
+        overlaps = find_overlaps(session, start_time, end_time, trainer_id=trainer.trainer_id)
+
+    for b in overlaps:
+        if b.class_id is not None:
+            c = session.get(FitnessClass, b.class_id)
+            print(f"  - {c.class_name} from {c.start_time} to {c.end_time} (status: {c.status})")
+        else:
+            pt = session.get(PersonalTrainingSession, b.session_id)
+            print(f"  - PT session from {pt.start_time} to {pt.end_time} (status: {pt.status})")
+
+
+# Admin operations
+#
+# create_class / schedule_class_series / report_equipment_issue /
+# set_maintenance_status take a session and plain values, raise ServiceError
+# with a message for the user and leave the commit to the caller; the menu
+# functions further down only prompt, commit and print.
+
+MAINTENANCE_STATUSES = ("open", "in_progress", "resolved")
+
+
+def require_admin(session, email: str):
+    if not email:
+        raise ServiceError("Admin email is required.")
+    admin = find_admin_by_email(session, email)
+    if not admin:
+        raise NotFound("Admin not found.")
+    return admin
+
+
+def require_trainer(session, email: str):
+    trainer = find_trainer_by_email(session, email)
+    if not trainer:
+        raise NotFound("Trainer not found.")
+    return trainer
+
+
+def require_active_room(session, room_id: int):
+    room = session.get(Room, room_id)
+    if not room:
+        raise NotFound("Room not found.")
+    if not room.is_active:
+        raise ServiceError("Selected room is not active.")
+    return room
+
+
+def check_capacity(room, capacity: int):
+    if capacity <= 0 or capacity > room.capacity:
+        raise ServiceError("Capacity must be between 1 and the room capacity.")
+
+
+def create_class(session, admin_email, trainer_email, room_id: int, class_name, start_time,
+                 end_time, capacity: int, description=None):
+    admin = require_admin(session, admin_email)
+    trainer = require_trainer(session, trainer_email)
+    room = require_active_room(session, room_id)
+    if not class_name:
+        raise ServiceError("Class name is required.")
+    if end_time <= start_time:
+        raise ServiceError("End time must be after start time.")
+    check_capacity(room, capacity)
+
+    new_class = FitnessClass(
+        trainer_id=trainer.trainer_id,
+        room_id=room.room_id,
+        created_by_admin_id=admin.admin_id,
+        class_name=class_name,
+        description=description or None,
+        start_time=start_time,
+        end_time=end_time,
+        capacity=capacity,
+        status="scheduled",
+    )
+
+    # Room / trainer double booking is rejected by the booking_intervals
+    # exclusion constraints when the class is inserted
+    session.add(new_class)
+    try:
+        session.flush()
+    except IntegrityError as e:
+        conflict = overlap_conflict(e)
+        if conflict is None:
+            raise
+        raise BookingConflict(conflict)
+    return new_class
+
+
+def insert_class_series(session, admin, trainer, room, class_name, description,
+                        capacity, occurrences):
+    # Bulk-create one class per (start, end) occurrence. All occurrences are
+    # checked with one query; clean ones go in with one INSERT ... RETURNING.
+    # Returns (created class ids, {occurrence index: [Conflict, ...]}).
+    proposals = [
+        ProposedBooking(room.room_id, trainer.trainer_id, start, end)
+        for start, end in occurrences
+    ]
+    conflicts = find_timetable_conflicts(session, proposals)
+
+    rows = [
+        dict(
+            trainer_id=trainer.trainer_id,
+            room_id=room.room_id,
+            created_by_admin_id=admin.admin_id,
+            class_name=class_name,
+            description=description or None,
+            start_time=p.start_time,
+            end_time=p.end_time,
+            capacity=capacity,
+            status="scheduled",
+        )
+        for n, p in enumerate(proposals)
+        if n not in conflicts
+    ]
+    if not rows:
+        return [], conflicts
+
+    # start_time is unique within a series, so it maps returned ids back to
+    # rows without forcing row-by-row ordered inserts
+    returned = session.execute(
+        insert(FitnessClass).returning(FitnessClass.class_id, FitnessClass.start_time),
+        rows,
+    ).all()
+    ids_by_start = {start: class_id for class_id, start in returned}
+    for row in rows:
+        row["class_id"] = ids_by_start[row["start_time"]]
+    bulk_insert_class_intervals(session, rows)
+    apply_bookings(session.connection(), [class_booking(row) for row in rows])
+    mark_weeks(session.connection(), {(trainer.trainer_id, week_of(row["start_time"])) for row in rows})
+    return sorted(ids_by_start.values()), conflicts
+
+
+def schedule_class_series(session, admin_email, trainer_email, room_id: int, class_name,
+                          weekdays, start_clock, duration_minutes: int, first_date, last_date,
+                          capacity: int, description=None):
+    # Returns (created class ids, conflicts, occurrences) as insert_class_series
+    admin = require_admin(session, admin_email)
+    trainer = require_trainer(session, trainer_email)
+    room = require_active_room(session, room_id)
+    if not class_name:
+        raise ServiceError("Class name is required.")
+    if not weekdays or min(weekdays) < 1 or max(weekdays) > 7:
+        raise ServiceError("Invalid weekdays. Example: 1,3,5")
+    if duration_minutes <= 0:
+        raise ServiceError("Duration must be positive.")
+    if last_date < first_date:
+        raise ServiceError("Last date must not be before the first date.")
+    check_capacity(room, capacity)
+
+    occurrences = weekly_occurrences(
+        sorted(set(weekdays)), start_clock, timedelta(minutes=duration_minutes), first_date, last_date
+    )
+    if not occurrences:
+        raise ServiceError("No dates in that range fall on the chosen days.")
+
+    try:
+        class_ids, conflicts = insert_class_series(
+            session, admin, trainer, room, class_name, description, capacity, occurrences
+        )
+    except IntegrityError as e:
+        conflict = overlap_conflict(e)
+        if conflict is None:
+            raise
+        # Someone booked the room / trainer between our check and insert
+        raise BookingConflict(
+            conflict,
+            "A conflicting booking was made concurrently. Nothing was created; please retry.",
+        )
+    return class_ids, conflicts, occurrences
+
+
+def report_equipment_issue(session, admin_email, equipment_id: int, issue_description, priority: int = 0):
+    admin = require_admin(session, admin_email)
+    equipment = session.get(Equipment, equipment_id)
+    if not equipment:
+        raise NotFound("Equipment not found.")
+    if not issue_description:
+        raise ServiceError("Issue description is required.")
+    if priority < 0:
+        raise ServiceError("Priority must not be negative.")
+
+    maintenance = EquipmentMaintenance(
+        equipment_id=equipment.equipment_id,
+        admin_id=admin.admin_id,
+        reported_at=datetime.utcnow(),
+        status="open",
+        issue_description=issue_description,
+        resolution_notes=None,
+        priority=priority,
+    )
+
+    # Mark equipment as non-operational 
+    equipment.is_operational = False
+
+    session.add(maintenance)
+    session.flush()
+    return maintenance
+
+
+def recent_maintenance(session, limit: int = 20):
+    # Newest maintenance records with their equipment
+    return (
+        session.query(EquipmentMaintenance)
+        .options(joinedload(EquipmentMaintenance.equipment))
+        .order_by(EquipmentMaintenance.reported_at.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def get_maintenance(session, maintenance_id: int):
+    # identity map first, so the menu's second look costs no query
+    record = session.get(
+        EquipmentMaintenance, maintenance_id, options=[joinedload(EquipmentMaintenance.equipment)]
+    )
+    if not record:
+        raise NotFound("Maintenance record not found.")
+    return record
+
+
+def set_maintenance_status(session, maintenance_id: int, status, resolution_notes=None):
+    record = get_maintenance(session, maintenance_id)
+    if status not in MAINTENANCE_STATUSES:
+        raise ServiceError("Invalid status.")
+
+    record.status = status
+    if status == "open":
+        # back to the queue for anyone to claim
+        record.claimed_by_admin_id = None
+        record.claimed_at = None
+    if status == "resolved":
+        record.resolved_at = datetime.utcnow()
+        if resolution_notes:
+            record.resolution_notes = resolution_notes
+
+        # If resolved, mark equipment as operational again 
+        if record.equipment:
+            record.equipment.is_operational = True
+
+    session.flush()
+    return record
+
+
+# Maintenance work queue
+#
+# Unresolved issues are read from the partial ix_equipment_maintenance_queue
+# index. claim_next_issue hands each technician a different open issue:
+# rows being claimed by other transactions are skipped instead of waited on
+# (SKIP LOCKED, PostgreSQL), so the caller should commit straight away.
+
+QUEUE_STATUSES = ("open", "in_progress")
+
+
+def maintenance_queue(session, limit: int = 20):
+    # In-progress then open issues, highest priority and oldest first
+    m = EquipmentMaintenance
+    return (
+        session.query(m)
+        .options(joinedload(m.equipment))
+        .filter(m.status.in_(QUEUE_STATUSES))
+        .order_by(m.status, m.priority.desc(), m.reported_at)
+        .limit(limit)
+        .all()
+    )
+
+
+def claim_next_issue(session, admin_email, by_priority: bool = True):
+    # Mark the next open issue in_progress for this admin; highest priority
+    # first (oldest first within a priority), or strictly oldest first
+    admin = require_admin(session, admin_email)
+    m = EquipmentMaintenance
+    order = (m.priority.desc(), m.reported_at) if by_priority else (m.reported_at,)
+    record = (
+        session.query(m)
+        # the IN repeats the index predicate, which SQLite needs to match it
+        .filter(m.status.in_(QUEUE_STATUSES), m.status == "open")
+        .order_by(*order, m.maintenance_id)
+        .with_for_update(skip_locked=True)
+        .populate_existing()
+        .first()
+    )
+    if record is None:
+        raise NotFound("No open maintenance issues.")
+
+    record.status = "in_progress"
+    record.claimed_by_admin_id = admin.admin_id
+    record.claimed_at = datetime.utcnow()
+    session.flush()
+    return record
+
+
 # Room booking / class
 
 def create_class_booking():
@@ -63,18 +399,9 @@ def create_class_booking():
         return
 
     session = get_session()
+    trainer_email = room_id = start_time = end_time = None
     try:
-        admin = find_admin_by_email(session, admin_email)
-        if not admin:
-            print("Admin not found.")
-            return
-
-        # Choose trainer
         trainer_email = input("Trainer email: ").strip()
-        trainer = find_trainer_by_email(session, trainer_email)
-        if not trainer:
-            print("Trainer not found.")
-            return
 
         # Choose room
         print("\nAvailable rooms:")
@@ -90,19 +417,7 @@ def create_class_booking():
             print("Room ID must be an integer.")
             return
 
-        room = session.query(Room).filter_by(room_id=room_id).first()
-        if not room:
-            print("Room not found.")
-            return
-        if not room.is_active:
-            print("Selected room is not active.")
-            return
-
         class_name = input("Class name: ").strip()
-        if not class_name:
-            print("Class name is required.")
-            return
-
         description = input("Description (optional): ").strip()
         start_time = parse_datetime("Start datetime")
         if start_time is None:
@@ -110,63 +425,120 @@ def create_class_booking():
         end_time = parse_datetime("End datetime")
         if end_time is None:
             return
-        if end_time <= start_time:
-            print("End time must be after start time.")
-            return
 
-        capacity_str = input(f"Capacity (<= room capacity {room.capacity}): ").strip()
+        capacity_str = input("Capacity (<= room capacity): ").strip()
         try:
             capacity = int(capacity_str)
         except ValueError:
             print("Capacity must be an integer.")
             return
 
-        if capacity <= 0 or capacity > room.capacity:
-            print("Capacity must be between 1 and the room capacity.")
+        new_class = create_class(
+            session, admin_email, trainer_email, room_id, class_name,
+            start_time, end_time, capacity, description,
+        )
+        session.commit()
+        print(
+            f"\nClass created successfully with ID {new_class.class_id} "
+            f"in room {new_class.room.room_name}."
+        )
+
+    except BookingConflict as e:
+        session.rollback()
+        print_booking_conflict(session, e.kind, room_id, trainer_email, start_time, end_time)
+    except ServiceError as e:
+        session.rollback()
+        print(e)
+    except Exception as e:
+        session.rollback()
+        print("Error while creating class / booking room:", describe(e))
+    finally:
+        session.close()
+
+
+def create_class_series():
+    # Admins create a weekly repeating class over a date range
+    print("\nCreate Recurring Class Series")
+    admin_email = input("Enter your admin email: ").strip()
+    if not admin_email:
+        print("Admin email is required.")
+        return
+
+    session = get_session()
+    try:
+        trainer_email = input("Trainer email: ").strip()
+
+        room_id_str = input("Room ID: ").strip()
+        try:
+            room_id = int(room_id_str)
+        except ValueError:
+            print("Room ID must be an integer.")
             return
 
-        # Simple room conflict check 
-        overlapping_classes = (
-            session.query(FitnessClass)
-            .filter(
-                FitnessClass.room_id == room.room_id,
-                FitnessClass.start_time < end_time,
-                FitnessClass.end_time > start_time,
-                FitnessClass.status != "cancelled",
-            )
-            .all()
-        )
-        if overlapping_classes:
-            print("\nError: This time overlaps with an existing class in that room:")
-            for c in overlapping_classes:
-                print(
-                    f"  - {c.class_name} from {c.start_time} to {c.end_time} "
-                    f"(status: {c.status})"
-                )
+        class_name = input("Class name: ").strip()
+        description = input("Description (optional): ").strip()
+
+        weekdays = parse_weekdays("Days of week")
+        if weekdays is None:
             return
 
-        new_class = FitnessClass(
-            trainer_id=trainer.trainer_id,
-            room_id=room.room_id,
-            created_by_admin_id=admin.admin_id,
-            class_name=class_name,
-            description=description or None,
-            start_time=start_time,
-            end_time=end_time,
-            capacity=capacity,
-            status="scheduled",
+        start_str = input("Start time (HH:MM, 24-hour): ").strip()
+        try:
+            start_clock = datetime.strptime(start_str, "%H:%M").time()
+        except ValueError:
+            print("Invalid time format. Please use HH:MM (e.g. 09:30).")
+            return
+
+        duration_str = input("Duration (minutes): ").strip()
+        try:
+            duration = int(duration_str)
+        except ValueError:
+            print("Duration must be an integer.")
+            return
+
+        first_date = parse_date("First date")
+        if first_date is None:
+            return
+        last_date = parse_date("Last date")
+        if last_date is None:
+            return
+
+        capacity_str = input("Capacity (<= room capacity): ").strip()
+        try:
+            capacity = int(capacity_str)
+        except ValueError:
+            print("Capacity must be an integer.")
+            return
+
+        class_ids, conflicts, occurrences = schedule_class_series(
+            session, admin_email, trainer_email, room_id, class_name, weekdays, start_clock,
+            duration, first_date, last_date, capacity, description,
         )
 
-        session.add(new_class)
+        if conflicts:
+            print(f"\n{len(conflicts)} of {len(occurrences)} occurrences conflict and were skipped:")
+            for n in sorted(conflicts):
+                start, end = occurrences[n]
+                reasons = sorted({c.kind for c in conflicts[n]})
+                print(f"  - {start} to {end}: {' and '.join(reasons)} already booked")
+
+        if not class_ids:
+            session.rollback()
+            print("\nNo classes were created.")
+            return
+
         session.commit()
         print(
-            f"\nClass created successfully with ID {new_class.class_id} "
-            f"in room {room.room_name}."
+            f"\nCreated {len(class_ids)} classes of '{class_name}' "
+            f"in room {room_id} (IDs {class_ids[0]}..{class_ids[-1]})."
         )
 
+    except ServiceError as e:
+        session.rollback()
+        print(e)
     except Exception as e:
         session.rollback()
-        print("Error while creating class / booking room:", e)
+        print("Error while creating class series:", describe(e))
     finally:
         session.close()
 
@@ -183,11 +555,6 @@ def log_equipment_issue():
 
     session = get_session()
     try:
-        admin = find_admin_by_email(session, admin_email)
-        if not admin:
-            print("Admin not found.")
-            return
-
         print("\nEquipment list:")
         equipment_list = session.query(Equipment).all()
         if not equipment_list:
@@ -209,38 +576,27 @@ def log_equipment_issue():
             print("Equipment ID must be an integer.")
             return
 
-        equipment = session.query(Equipment).filter_by(equipment_id=eq_id).first()
-        if not equipment:
-            print("Equipment not found.")
-            return
-
         issue_description = input("Describe the issue: ").strip()
-        if not issue_description:
-            print("Issue description is required.")
+        priority_str = input("Priority (0 = normal, higher is more urgent) [0]: ").strip() or "0"
+        try:
+            priority = int(priority_str)
+        except ValueError:
+            print("Priority must be an integer.")
             return
 
-        maintenance = EquipmentMaintenance(
-            equipment_id=equipment.equipment_id,
-            admin_id=admin.admin_id,
-            reported_at=datetime.utcnow(),
-            status="open",
-            issue_description=issue_description,
-            resolution_notes=None,
-        )
-
-        # Mark equipment as non-operational 
-        equipment.is_operational = False
-
-        session.add(maintenance)
+        maintenance = report_equipment_issue(session, admin_email, eq_id, issue_description, priority)
         session.commit()
         print(
             f"\nIssue logged with ID {maintenance.maintenance_id} "
-            f"for equipment '{equipment.equipment_name}'."
+            f"for equipment '{maintenance.equipment.equipment_name}'."
         )
 
+    except ServiceError as e:
+        session.rollback()
+        print(e)
     except Exception as e:
         session.rollback()
-        print("Error while logging equipment issue:", e)
+        print("Error while logging equipment issue:", describe(e))
     finally:
         session.close()
 
@@ -252,12 +608,7 @@ def update_maintenance_issue():
     session = get_session()
     try:
         # Show recent/open issues to choose from
-        open_issues = (
-            session.query(EquipmentMaintenance)
-            .order_by(EquipmentMaintenance.reported_at.desc())
-            .limit(20)
-            .all()
-        )
+        open_issues = recent_maintenance(session)
 
         if not open_issues:
             print("No maintenance records found.")
@@ -279,14 +630,7 @@ def update_maintenance_issue():
             print("Maintenance ID must be an integer.")
             return
 
-        record = (
-            session.query(EquipmentMaintenance)
-            .filter_by(maintenance_id=m_id)
-            .first()
-        )
-        if not record:
-            print("Maintenance record not found.")
-            return
+        record = get_maintenance(session, m_id)
 
         print(
             f"\nUpdating maintenance record {record.maintenance_id} "
@@ -295,27 +639,82 @@ def update_maintenance_issue():
         print("Valid statuses: open, in_progress, resolved")
         new_status = input("New status: ").strip().lower()
 
-        if new_status not in ("open", "in_progress", "resolved"):
-            print("Invalid status.")
+        notes = None
+        if new_status == "resolved":
+            notes = input("Resolution notes (optional): ").strip()
+
+        set_maintenance_status(session, m_id, new_status, notes)
+        session.commit()
+        print("Maintenance record updated successfully.")
+
+    except ServiceError as e:
+        session.rollback()
+        print(e)
+    except Exception as e:
+        session.rollback()
+        print("Error while updating maintenance:", describe(e))
+    finally:
+        session.close()
+
+
+def work_maintenance_queue():
+    # Claim the next open issue from the shared queue, then resolve it, hand
+    # it back or keep working on it
+    print("\nMaintenance Work Queue")
+    admin_email = input("Enter your admin email: ").strip()
+    if not admin_email:
+        print("Admin email is required.")
+        return
+
+    session = get_session()
+    try:
+        queue = maintenance_queue(session)
+        if not queue:
+            print("The maintenance queue is empty.")
             return
 
-        record.status = new_status
+        print("\nOpen and in-progress issues:")
+        for m in queue:
+            eq_name = m.equipment.equipment_name if m.equipment else f"ID {m.equipment_id}"
+            print(
+                f"  ID {m.maintenance_id}: equipment '{eq_name}', priority={m.priority}, "
+                f"status={m.status}, reported_at={m.reported_at}"
+            )
+
+        by_priority = input("\nClaim highest priority first? (Y/n): ").strip().lower() != "n"
+        record = claim_next_issue(session, admin_email, by_priority)
+        # commit right away so the claim is visible and the row lock released
+        session.commit()
+
+        equipment = record.equipment
+        eq_name = equipment.equipment_name if equipment else f"ID {record.equipment_id}"
+        print(
+            f"\nClaimed issue {record.maintenance_id} on equipment '{eq_name}' "
+            f"(priority {record.priority}): {record.issue_description}"
+        )
 
+        new_status = input(
+            "New status: 'resolved', 'open' to hand it back, or Enter to keep working on it: "
+        ).strip().lower()
+        if not new_status:
+            return
+        if new_status not in ("resolved", "open"):
+            print("Invalid status.")
+            return
+
+        notes = None
         if new_status == "resolved":
-            record.resolved_at = datetime.utcnow()
             notes = input("Resolution notes (optional): ").strip()
-            if notes:
-                record.resolution_notes = notes
-
-            # If resolved, mark equipment as operational again 
-            if record.equipment:
-                record.equipment.is_operational = True
 
+        set_maintenance_status(session, record.maintenance_id, new_status, notes)
         session.commit()
         print("Maintenance record updated successfully.")
 
+    except ServiceError as e:
+        session.rollback()
+        print(e)
     except Exception as e:
         session.rollback()
-        print("Error while updating maintenance:", e)
+        print("Error while working the maintenance queue:", describe(e))
     finally:
         session.close()
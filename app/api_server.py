@@ -0,0 +1,285 @@
+# app/api_server.py
+"""
+JSON API server: the member, trainer and admin operations over HTTP
+
+One asyncio process serves many kiosks / staff tablets at once. Every
+operation in app/operations.py is exposed as
+
+    POST /api/<operation>   body: the operation's arguments as a JSON object
+
+and answers {"ok": true, "result": ...} or {"ok": false, "error": "..."}
+(400 bad request, 404 not found, 409 booking conflict, 503 shutting down,
+504 timed out). GET /health and GET /operations are for monitoring.
+
+Requests run on SQLAlchemy's async engine (asyncpg / aiosqlite): each one
+gets its own AsyncSession and transaction and calls the same service
+function the menus use through run_sync. At most --max-concurrency requests
+hold a database session at a time (default: pool size + overflow); the rest
+wait, and a request that hasn't finished --timeout seconds after it arrived
+is cancelled and rolled back. Needs `pip install greenlet asyncpg` (or
+aiosqlite for SQLite). Run from project root:
+
+    python3 -m app.api_server --port 8080
+    python3 -m app.api_server --unix /tmp/fitness.sock --max-concurrency 20 --timeout 5
+
+    curl -s localhost:8080/api/dashboard -d '{"email": "ana@example.com"}'
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+import sys
+import traceback
+from collections import Counter
+from contextlib import suppress
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.errors import BookingConflict, NotFound, ServiceError
+from app.identity_cache import invalidate_member
+from app.instrumentation import install_from_env, operation as sql_operation
+from app.operations import OPERATIONS, prepare
+from models.base import build_async_engine, engine_options_from_env
+
+MAX_BODY = 1 << 20          # bytes
+MAX_HEADERS = 100
+IDLE_TIMEOUT = 60           # seconds a kept-alive connection may sit idle
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiSession(Session):
+    # sync session class under the AsyncSessions, for ORM event listeners
+    pass
+
+
+async def read_request(reader):
+    # (method, path, headers, body), or None when the client hung up
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _version = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HttpError(400, "too many headers")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HttpError(400, "bad Content-Length")
+    if length > MAX_BODY:
+        raise HttpError(413, f"body larger than {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length > 0 else b""
+    return method.upper(), target.split("?", 1)[0], headers, body
+
+
+def run_operation(session, name, spec, args):
+    # Runs inside AsyncSession.run_sync with the plain Session
+    with sql_operation(f"api_server.{name}"):
+        return spec.result(spec.run(session, **args))
+
+
+class ApiServer:
+
+    def __init__(self, engine, max_concurrency: int, timeout: float):
+        self.engine = engine
+        self.sessions = async_sessionmaker(engine, sync_session_class=ApiSession, expire_on_commit=False)
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.closing = False
+        self.in_flight = 0
+        self.counts = Counter()   # status -> responses
+
+    # request handling
+
+    async def execute(self, name, spec, args):
+        async with self.slots:
+            async with self.sessions() as session:
+                async with session.begin():
+                    result = await session.run_sync(run_operation, name, spec, args)
+        if spec.member_changed and args.get("email"):
+            invalidate_member(args["email"])
+        return result
+
+    async def call(self, name, body: bytes):
+        try:
+            args = json.loads(body) if body.strip() else {}
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise HttpError(400, f"invalid JSON: {e}")
+        try:
+            spec, args = prepare(name, args)
+        except ValueError as e:
+            raise HttpError(404 if name not in OPERATIONS else 400, str(e))
+
+        try:
+            result = await asyncio.wait_for(self.execute(name, spec, args), self.timeout)
+        except asyncio.TimeoutError:
+            raise HttpError(504, f"timed out after {self.timeout:g}s")
+        except BookingConflict as e:
+            raise HttpError(409, str(e).strip())
+        except NotFound as e:
+            raise HttpError(404, str(e).strip())
+        except ServiceError as e:
+            raise HttpError(400, str(e).strip())
+        except SQLAlchemyError as e:
+            print(f"{name}: database error: {e}", file=sys.stderr)
+            raise HttpError(500, "database error")
+        return result
+
+    async def dispatch(self, method, path, body):
+        # (status, payload)
+        if path == "/health":
+            return 200, dict(
+                ok=not self.closing, in_flight=self.in_flight,
+                max_concurrency=self.max_concurrency, responses=dict(self.counts),
+            )
+        if path == "/operations":
+            return 200, dict(ok=True, result={
+                name: dict(read_only=spec.read_only) for name, spec in OPERATIONS.items()
+            })
+        if not path.startswith("/api/"):
+            raise HttpError(404, f"no such path: {path}")
+        if method != "POST":
+            raise HttpError(405, "use POST")
+        if self.closing:
+            raise HttpError(503, "server is shutting down")
+
+        self.in_flight += 1
+        try:
+            return 200, dict(ok=True, result=await self.call(path[len("/api/"):], body))
+        finally:
+            self.in_flight -= 1
+
+    async def respond(self, writer, status, payload, keep_alive):
+        self.counts[status] += 1
+        body = json.dumps(payload, default=str).encode()
+        head = (
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while not self.closing:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), IDLE_TIMEOUT)
+                except HttpError as e:
+                    await self.respond(writer, e.status, dict(ok=False, error=str(e)), False)
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    status, payload = await self.dispatch(method, path, body)
+                except HttpError as e:
+                    status, payload = e.status, dict(ok=False, error=str(e))
+                except Exception:
+                    traceback.print_exc()
+                    status, payload = 500, dict(ok=False, error="internal error")
+                await self.respond(writer, status, payload, keep_alive and not self.closing)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with suppress(Exception):
+                await writer.wait_closed()
+
+    async def drain(self, grace: float):
+        # Stop taking requests and give in-flight ones up to `grace` seconds
+        self.closing = True
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + grace
+        while self.in_flight and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+
+
+async def serve(args):
+    engine = build_async_engine()
+    install_from_env(engine.sync_engine, ApiSession)
+    api = ApiServer(engine, args.max_concurrency, args.timeout)
+
+    if args.unix:
+        server = await asyncio.start_unix_server(api.handle_connection, path=args.unix)
+        where = args.unix
+    else:
+        server = await asyncio.start_server(api.handle_connection, args.host, args.port)
+        where = f"http://{args.host}:{args.port}"
+    print(
+        f"Serving {len(OPERATIONS)} operations on {where} "
+        f"(max {args.max_concurrency} concurrent, {args.timeout:g}s timeout)",
+        file=sys.stderr,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+
+    async with server:
+        await stop.wait()
+        server.close()
+        await api.drain(args.timeout)
+    await engine.dispose()
+    print("Server stopped.", file=sys.stderr)
+
+
+def main():
+    options = engine_options_from_env()
+    parser = argparse.ArgumentParser(description="Serve the club operations as a JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of TCP")
+    parser.add_argument(
+        "--max-concurrency", type=int, default=options["pool_size"] + options["max_overflow"],
+        help="requests holding a database session at once (default: pool size + overflow)",
+    )
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds per request (default 10)")
+    args = parser.parse_args()
+    if args.max_concurrency < 1 or args.timeout <= 0:
+        parser.error("--max-concurrency and --timeout must be positive")
+    asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# app/archive.py
+"""
+Move finished classes (with their registrations) and PT sessions out of the
+hot tables into the archive tables
+
+Classes and PT sessions that ended before the horizon (default: 180 days ago)
+are copied to classes_archive, class_registrations_archive and
+personal_training_sessions_archive and deleted from the hot tables together
+with their booking intervals, one batch per transaction. An interrupted run
+loses nothing and the next run carries on where it stopped. Operational
+queries (schedules, overlap checks, upcoming classes) only ever see the hot
+tables; full-history reads, reports and summary rebuilds also read the
+archive (models/archive.py). Run from project root:
+
+    python3 -m app.archive run                          # older than 180 days
+    python3 -m app.archive run --older-than-days 365 --batch-size 500
+    python3 -m app.archive status
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from sqlalchemy import delete, func, insert, literal, select, union_all
+
+from models import (
+    engine,
+    BookingInterval,
+    ClassRegistration,
+    FitnessClass,
+    PersonalTrainingSession,
+)
+from models.archive import ArchivedClass, ArchivedClassRegistration, ArchivedPTSession
+
+HORIZON_DAYS = 180
+ARCHIVE_BATCH = 1000   # classes or sessions per transaction
+
+
+class HistoryEntry(NamedTuple):
+    kind: str          # "class" or "pt"
+    booking_id: int    # class_id / session_id
+    name: str
+    start_time: datetime
+    end_time: datetime
+    status: str        # attendance status for classes, session status for PT
+
+
+def _copy(connection, source, target, key_column, ids, now):
+    columns = [c.name for c in source.c]
+    connection.execute(
+        insert(target).from_select(
+            columns + ["archived_at"],
+            select(*source.c, literal(now, target.c.archived_at.type)).where(key_column.in_(ids)),
+        )
+    )
+
+
+def archive_classes_batch(connection, cutoff: datetime, batch_size: int = ARCHIVE_BATCH) -> int:
+    # Archive up to batch_size classes that ended before cutoff, with their
+    # registrations; returns how many classes moved
+    classes = FitnessClass.__table__
+    registrations = ClassRegistration.__table__
+    ids = connection.execute(
+        select(classes.c.class_id)
+        .where(classes.c.end_time < cutoff)
+        .order_by(classes.c.class_id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not ids:
+        return 0
+    now = datetime.utcnow()
+    _copy(connection, classes, ArchivedClass.__table__, classes.c.class_id, ids, now)
+    _copy(connection, registrations, ArchivedClassRegistration.__table__, registrations.c.class_id, ids, now)
+    connection.execute(delete(registrations).where(registrations.c.class_id.in_(ids)))
+    connection.execute(delete(BookingInterval).where(BookingInterval.class_id.in_(ids)))
+    connection.execute(delete(classes).where(classes.c.class_id.in_(ids)))
+    return len(ids)
+
+
+def archive_sessions_batch(connection, cutoff: datetime, batch_size: int = ARCHIVE_BATCH) -> int:
+    sessions = PersonalTrainingSession.__table__
+    ids = connection.execute(
+        select(sessions.c.session_id)
+        .where(sessions.c.end_time < cutoff)
+        .order_by(sessions.c.session_id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not ids:
+        return 0
+    _copy(connection, sessions, ArchivedPTSession.__table__, sessions.c.session_id, ids, datetime.utcnow())
+    connection.execute(delete(BookingInterval).where(BookingInterval.session_id.in_(ids)))
+    connection.execute(delete(sessions).where(sessions.c.session_id.in_(ids)))
+    return len(ids)
+
+
+def run_archive(cutoff: datetime, batch_size: int = ARCHIVE_BATCH, log=print):
+    # Archive everything that ended before cutoff, one committed batch at a
+    # time; returns {"classes": n, "pt_sessions": n}
+    moved = {}
+    for label, archive_batch in (("classes", archive_classes_batch), ("pt_sessions", archive_sessions_batch)):
+        moved[label] = 0
+        while True:
+            with engine.begin() as connection:
+                count = archive_batch(connection, cutoff, batch_size)
+            if not count:
+                break
+            moved[label] += count
+            log(f"  {label}: {moved[label]} archived")
+    return moved
+
+
+def member_history(session, member_id: int, full_history: bool = False, limit: int = 50):
+    # The member's classes and PT sessions, newest first; archived ones only
+    # with full_history
+    def classes(c, r):
+        return (
+            select(literal("class").label("kind"), c.class_id.label("booking_id"), c.class_name.label("name"),
+                   c.start_time, c.end_time, r.attendance_status.label("status"))
+            .select_from(r)
+            .join(c, c.class_id == r.class_id)
+            .where(r.member_id == member_id)
+        )
+
+    def sessions(s):
+        return (
+            select(literal("pt").label("kind"), s.session_id.label("booking_id"),
+                   literal("Personal training").label("name"), s.start_time, s.end_time, s.status)
+            .where(s.member_id == member_id)
+        )
+
+    parts = [classes(FitnessClass, ClassRegistration), sessions(PersonalTrainingSession)]
+    if full_history:
+        parts += [classes(ArchivedClass, ArchivedClassRegistration), sessions(ArchivedPTSession)]
+    history = union_all(*parts).subquery()
+    rows = session.execute(
+        select(history).order_by(history.c.start_time.desc(), history.c.booking_id.desc()).limit(limit)
+    )
+    return [HistoryEntry(*row) for row in rows]
+
+
+def _status(cutoff: datetime):
+    with engine.connect() as connection:
+        def count(stmt):
+            return connection.execute(stmt).scalar()
+        return dict(
+            classes_pending=count(select(func.count()).where(FitnessClass.end_time < cutoff)),
+            pt_sessions_pending=count(
+                select(func.count()).where(PersonalTrainingSession.end_time < cutoff)
+            ),
+            classes_archived=count(select(func.count()).select_from(ArchivedClass)),
+            registrations_archived=count(select(func.count()).select_from(ArchivedClassRegistration)),
+            pt_sessions_archived=count(select(func.count()).select_from(ArchivedPTSession)),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive finished classes and PT sessions")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("run", "move finished rows to the archive"), ("status", "rows pending / archived")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--older-than-days", type=int, default=HORIZON_DAYS,
+                       help=f"archive what ended this many days ago or earlier (default {HORIZON_DAYS})")
+    sub.choices["run"].add_argument("--batch-size", type=int, default=ARCHIVE_BATCH)
+    args = parser.parse_args()
+
+    if args.older_than_days < 0:
+        parser.error("--older-than-days must not be negative")
+    cutoff = datetime.utcnow() - timedelta(days=args.older_than_days)
+
+    if args.command == "status":
+        for key, value in _status(cutoff).items():
+            print(f"{key:<24} {value}")
+        return
+
+    if args.batch_size <= 0:
+        parser.error("--batch-size must be positive")
+    started = time.perf_counter()
+    moved = run_archive(cutoff, args.batch_size)
+    print(
+        f"Archived {moved['classes']} classes and {moved['pt_sessions']} PT sessions "
+        f"ended before {cutoff:%Y-%m-%d %H:%M} in {time.perf_counter() - started:.1f}s."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# app/batch_runner.py
+"""
+Headless batch runner: execute service operations from a JSONL file
+
+Each line is one operation from app/operations.py, e.g.
+
+    {"op": "register_member", "args": {"first_name": "Ana", "last_name": "Li",
+                                       "email": "ana@example.com", "password": "x"}}
+    {"op": "add_health_metric", "args": {"email": "ana@example.com", "weight": 61.5}}
+    {"op": "register_for_class", "args": {"email": "ana@example.com", "class_id": 12}}
+
+Lines are grouped into transactions of --transaction-size operations and the
+groups run on --workers threads, each with its own session. Every operation
+runs in a savepoint, so a rejected one (unknown member, booking conflict,
+...) is reported and the rest of its transaction still commits. Operations
+keep file order within a transaction; across transactions they run
+concurrently, so use --workers 1 when later lines depend on earlier ones in
+another transaction. One result line per operation is written in file order.
+
+    python3 -m app.batch_runner ops.jsonl
+    python3 -m app.batch_runner ops.jsonl --workers 8 --transaction-size 200 --output results.jsonl
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db import get_session, remove_session
+from app.errors import ServiceError
+from app.identity_cache import invalidate_member
+from app.instrumentation import operation as sql_operation
+from app.operations import prepare
+
+
+def parse_line(text: str):
+    # (op name, Operation, arguments); ValueError describes a bad line.
+    # Dates / times and numeric arguments are converted and type-checked
+    # here (see prepare), so a bad value fails its own line only.
+    try:
+        entry = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON: {e}")
+    if not isinstance(entry, dict):
+        raise ValueError("expected a JSON object")
+    name = entry.get("op")
+    spec, args = prepare(name, entry.get("args"))
+    return name, spec, args
+
+
+def run_operation(session, name, spec, args):
+    # Returns (ok, result or error message). A failure rolls back its
+    # savepoint only.
+    try:
+        with session.begin_nested(), sql_operation(f"batch_runner.{name}"):
+            return True, spec.result(spec.run(session, **args))
+    except ServiceError as e:
+        return False, str(e).strip()
+    except SQLAlchemyError as e:
+        return False, f"database error: {getattr(e, 'orig', None) or e}"
+    except (TypeError, ValueError) as e:
+        # a value of the wrong shape that got past parse_line
+        return False, f"bad arguments for {name}: {e}"
+
+
+def run_transaction(items):
+    # items: [(line number, text)]. Runs on a worker thread with its own
+    # session; returns one result dict per item.
+    results = []
+    changed_members = []
+    session = get_session()
+    try:
+        for line_no, text in items:
+            try:
+                name, spec, args = parse_line(text)
+            except ValueError as e:
+                results.append(dict(line=line_no, op=None, ok=False, error=str(e)))
+                continue
+            ok, outcome = run_operation(session, name, spec, args)
+            if ok:
+                results.append(dict(line=line_no, op=name, ok=True, result=outcome))
+                if spec.member_changed:
+                    changed_members.append(args.get("email") or "")
+            else:
+                results.append(dict(line=line_no, op=name, ok=False, error=outcome))
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        # nothing in this transaction was kept
+        error = f"transaction rolled back: {e}"
+        return [
+            dict(line=r["line"], op=r["op"], ok=False, error=r.get("error") or error)
+            for r in results
+        ] + [
+            dict(line=line_no, op=None, ok=False, error=error)
+            for line_no, _ in items[len(results):]
+        ]
+    finally:
+        remove_session()
+        for email in changed_members:
+            invalidate_member(email)
+
+    return results
+
+
+def read_transactions(lines, size: int):
+    # Yields lists of (line number, text), skipping blank lines
+    numbered = (
+        (n, text) for n, text in enumerate(lines, start=1) if text.strip()
+    )
+    while True:
+        chunk = list(islice(numbered, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(lines, out, workers: int = 4, transaction_size: int = 100):
+    # Returns (operations, succeeded). At most 2 * workers transactions are
+    # read ahead, so memory stays flat for any file size.
+    total = succeeded = 0
+    pending = {}       # transaction index -> future
+    done = {}          # finished out of order, waiting for earlier ones
+    next_out = 0
+
+    def emit(results):
+        nonlocal total, succeeded
+        for r in results:
+            out.write(json.dumps(r, default=str) + "\n")
+            total += 1
+            succeeded += r["ok"]
+
+    def collect():
+        nonlocal next_out
+        finished, _ = wait(pending.values(), return_when=FIRST_COMPLETED)
+        for index in [i for i, f in pending.items() if f in finished]:
+            done[index] = pending.pop(index).result()
+        while next_out in done:
+            emit(done.pop(next_out))
+            next_out += 1
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for index, chunk in enumerate(read_transactions(lines, transaction_size)):
+            pending[index] = pool.submit(run_transaction, chunk)
+            if len(pending) >= 2 * workers:
+                collect()
+        while pending:
+            collect()
+    out.flush()
+    return total, succeeded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run service operations from a JSONL file")
+    parser.add_argument("path", help="JSONL file of operations ('-' for stdin)")
+    parser.add_argument("--workers", type=int, default=4, help="worker threads (default 4)")
+    parser.add_argument(
+        "--transaction-size", type=int, default=100,
+        help="operations per transaction (default 100)",
+    )
+    parser.add_argument("--output", help="write result lines here instead of stdout")
+    args = parser.parse_args()
+    if args.workers < 1 or args.transaction_size < 1:
+        parser.error("--workers and --transaction-size must be at least 1")
+
+    source = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    started = time.perf_counter()
+    try:
+        total, succeeded = run_batch(source, out, args.workers, args.transaction_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed else 0.0
+    print(
+        f"{total} operations, {succeeded} succeeded, {total - succeeded} failed "
+        f"in {elapsed:.2f}s ({rate:.0f} ops/s)",
+        file=sys.stderr,
+    )
+    sys.exit(0 if succeeded == total else 1)
+
+
+if __name__ == "__main__":
+    main()
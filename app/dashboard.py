@@ -0,0 +1,241 @@
+# app/dashboard.py
+# Member dashboard data in a single round trip.
+#
+# One SELECT returns the member, their latest health metric, active goals,
+# attended-class count and upcoming PT sessions. Goals and sessions come back
+# as JSON arrays built by the database, so the statement yields exactly one
+# row no matter how many goals / sessions there are.
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import select, func, literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.functions import FunctionElement
+
+from models.member import Member
+from models.health_metric import HealthMetric
+from models.fitness_goal import FitnessGoal
+from models.class_registration import ClassRegistration
+from models.archive import ArchivedClassRegistration
+from models.personal_training_session import PersonalTrainingSession
+
+
+class LatestMetric(NamedTuple):
+    recorded_at: datetime
+    weight: Optional[Decimal]
+    heart_rate: Optional[int]
+    body_fat_pct: Optional[Decimal]
+
+
+class GoalSummary(NamedTuple):
+    goal_type: str
+    target_value: Decimal
+    unit: str
+    target_date: Optional[date]
+
+
+class SessionSummary(NamedTuple):
+    start_time: datetime
+    end_time: datetime
+    status: str
+    room_id: int
+
+
+class DashboardData(NamedTuple):
+    member_id: int
+    first_name: str
+    last_name: str
+    email: str
+    latest_metric: Optional[LatestMetric]
+    active_goals: List[GoalSummary]
+    classes_attended: int
+    upcoming_sessions: List[SessionSummary]
+
+
+# Portable JSON building blocks (PostgreSQL / SQLite)
+
+class json_object(FunctionElement):
+    # json_object("key", expr, "key2", expr2, ...)
+    inherit_cache = True
+
+
+class json_array_agg(FunctionElement):
+    inherit_cache = True
+
+
+@compiles(json_object)
+def _json_object_default(element, compiler, **kw):
+    return "json_object(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(json_object, "postgresql")
+def _json_object_pg(element, compiler, **kw):
+    return "json_build_object(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(json_array_agg)
+def _json_array_agg_default(element, compiler, **kw):
+    return "json_group_array(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(json_array_agg, "postgresql")
+def _json_array_agg_pg(element, compiler, **kw):
+    return "json_agg(%s)" % compiler.process(element.clauses, **kw)
+
+
+def _json_pairs(**columns):
+    args = []
+    for key, column in columns.items():
+        # keys are inlined so the server never has to guess a bind type
+        args += [literal_column(f"'{key}'"), column]
+    return json_object(*args)
+
+
+def dashboard_statement(email: str, now: datetime):
+    m = (
+        select(Member.member_id, Member.first_name, Member.last_name, Member.email)
+        .where(func.lower(Member.email) == email.strip().lower())
+        .cte("m")
+    )
+
+    # newest metric via (member_id, recorded_at DESC); joined below
+    newest = aliased(HealthMetric)
+    latest_metric_id = (
+        select(newest.metric_id)
+        .where(newest.member_id == m.c.member_id)
+        .order_by(newest.recorded_at.desc())
+        .limit(1)
+        .correlate(m)
+        .scalar_subquery()
+    )
+
+    goals = (
+        select(
+            json_array_agg(
+                _json_pairs(
+                    goal_type=FitnessGoal.goal_type,
+                    target_value=FitnessGoal.target_value,
+                    unit=FitnessGoal.unit,
+                    target_date=FitnessGoal.target_date,
+                )
+            )
+        )
+        .where(FitnessGoal.member_id == m.c.member_id, FitnessGoal.status == "active")
+        .scalar_subquery()
+    )
+
+    attended = (
+        select(func.count(ClassRegistration.registration_id))
+        .where(
+            ClassRegistration.member_id == m.c.member_id,
+            ClassRegistration.attendance_status == "attended",
+        )
+        .scalar_subquery()
+    )
+    # lifetime count: archived classes too (app/archive.py)
+    attended_archived = (
+        select(func.count(ArchivedClassRegistration.registration_id))
+        .where(
+            ArchivedClassRegistration.member_id == m.c.member_id,
+            ArchivedClassRegistration.attendance_status == "attended",
+        )
+        .scalar_subquery()
+    )
+
+    sessions = (
+        select(
+            json_array_agg(
+                _json_pairs(
+                    start_time=PersonalTrainingSession.start_time,
+                    end_time=PersonalTrainingSession.end_time,
+                    status=PersonalTrainingSession.status,
+                    room_id=PersonalTrainingSession.room_id,
+                )
+            )
+        )
+        .where(
+            PersonalTrainingSession.member_id == m.c.member_id,
+            PersonalTrainingSession.start_time >= now,
+        )
+        .scalar_subquery()
+    )
+
+    return select(
+        m.c.member_id,
+        m.c.first_name,
+        m.c.last_name,
+        m.c.email,
+        HealthMetric.recorded_at,
+        HealthMetric.weight,
+        HealthMetric.heart_rate,
+        HealthMetric.body_fat_pct,
+        goals.label("goals"),
+        (attended + attended_archived).label("attended"),
+        sessions.label("sessions"),
+    ).select_from(m.outerjoin(HealthMetric, HealthMetric.metric_id == latest_metric_id))
+
+
+def _json_list(value):
+    # psycopg2 decodes json columns; SQLite hands back text
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def _as_datetime(value):
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def _as_decimal(value):
+    return None if value is None else Decimal(str(value))
+
+
+def fetch_dashboard(session, email: str, now: datetime = None) -> Optional[DashboardData]:
+    # Everything show_dashboard needs, or None if the member doesn't exist
+    now = now or datetime.utcnow()
+    row = session.execute(dashboard_statement(email, now)).first()
+    if row is None:
+        return None
+
+    latest = None
+    if row.recorded_at is not None:
+        latest = LatestMetric(row.recorded_at, row.weight, row.heart_rate, row.body_fat_pct)
+
+    goals = [
+        GoalSummary(
+            g["goal_type"],
+            _as_decimal(g["target_value"]),
+            g["unit"],
+            date.fromisoformat(g["target_date"][:10]) if g["target_date"] else None,
+        )
+        for g in _json_list(row.goals)
+    ]
+
+    sessions = sorted(
+        (
+            SessionSummary(
+                _as_datetime(s["start_time"]),
+                _as_datetime(s["end_time"]),
+                s["status"],
+                s["room_id"],
+            )
+            for s in _json_list(row.sessions)
+        ),
+        key=lambda s: s.start_time,
+    )
+
+    return DashboardData(
+        row.member_id,
+        row.first_name,
+        row.last_name,
+        row.email,
+        latest,
+        goals,
+        row.attended or 0,
+        sessions,
+    )
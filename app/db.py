@@ -1,5 +1,108 @@
 # app/db.py
-from models import SessionLocal
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session
+
+from app.instrumentation import install_from_env
+from models import SessionLocal, engine
+
+# One session per thread. Every service call made from the same terminal /
+# worker thread reuses it, and the engine pool bounds how many database
+# connections all threads together can hold.
+ScopedSession = scoped_session(SessionLocal)
+
 
 def get_session():
-    return SessionLocal()
+    return ScopedSession()
+
+
+def remove_session():
+    # Drop the thread's session and hand its connection back to the pool
+    ScopedSession.remove()
+
+
+@contextmanager
+def session_scope():
+    # Unit of work: commit on success, roll back on error, always release
+    session = get_session()
+    try:
+        started = time.perf_counter()
+        session.connection()  # check out now so pool wait is measured here
+        pool_metrics.record_wait(time.perf_counter() - started)
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+class PoolMetrics:
+    # Counters fed by pool events; read with snapshot()
+
+    def __init__(self, bound_engine):
+        self._engine = bound_engine
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+        pool = bound_engine.pool
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        event.listen(pool, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_conn, record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_conn, record, proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_conn, record):
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_conn, record, exc):
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self):
+        pool = self._engine.pool
+        with self._lock:
+            data = dict(
+                connects=self.connects,
+                checkouts=self.checkouts,
+                checkins=self.checkins,
+                invalidations=self.invalidations,
+                wait_avg_ms=(self.wait_total / self.wait_count * 1000) if self.wait_count else 0.0,
+                wait_max_ms=self.wait_max * 1000,
+            )
+        # QueuePool exposes live sizing; other pools (SQLite) may not
+        for name in ("size", "checkedout", "overflow"):
+            getter = getattr(pool, name, None)
+            if callable(getter):
+                data[name] = getter()
+        return data
+
+
+pool_metrics = PoolMetrics(engine)
+
+# None unless FITNESS_SQL_INSTRUMENT is set
+instrumentation = install_from_env(engine, SessionLocal)
@@ -0,0 +1,28 @@
+# app/errors.py
+# Errors raised by the service functions. The message is meant for the
+# person who asked (menu user, batch file author); anything else that goes
+# wrong is a bug or an outage and is left to propagate.
+
+
+class ServiceError(Exception):
+    pass
+
+
+class NotFound(ServiceError):
+    pass
+
+
+class BookingConflict(ServiceError):
+    # kind is "room" or "trainer", as returned by overlap_conflict()
+
+    def __init__(self, kind: str, message: str = None):
+        super().__init__(message or f"The {kind} is already booked at that time.")
+        self.kind = kind
+
+
+def describe(error: Exception) -> str:
+    # For the menus' last-resort handlers: the exception type is always
+    # shown, so an error without a message (StopIteration, KeyError(), ...)
+    # isn't printed as an empty string
+    message = str(error)
+    return f"{type(error).__name__}: {message}" if message else type(error).__name__
@@ -0,0 +1,157 @@
+# app/goal_progress.py
+"""
+Goal-progress engine: evaluate every active fitness goal in one pass
+
+For each measure (weight, body fat, heart rate) a single statement returns
+every active goal on that measure with its baseline reading (the last one
+before start_date, else the first one after) and the member's latest
+reading, each found by an index probe on (member_id, recorded_at DESC).
+Rows are streamed, progress is computed in Python, and goals that reached
+their target are marked completed in batched UPDATEs.
+
+    python3 -m app.goal_progress             # evaluate + mark completed
+    python3 -m app.goal_progress --dry-run   # evaluate only
+"""
+
+import argparse
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import aliased
+
+from app.db import session_scope
+from models.fitness_goal import FitnessGoal
+from models.health_metric import HealthMetric
+
+# goal_type -> (health_metrics column, rule)
+#   decrease_by / increase_by: target_value is the change wanted (e.g. lose 5 kg)
+#   reach: target_value is the level wanted (e.g. 18 % body fat)
+GOAL_RULES = {
+    "weight_loss": ("weight", "decrease_by"),
+    "weight_gain": ("weight", "increase_by"),
+    "body_fat": ("body_fat_pct", "reach"),
+    "body_fat_loss": ("body_fat_pct", "decrease_by"),
+    "resting_heart_rate": ("heart_rate", "reach"),
+}
+
+
+class GoalProgress(NamedTuple):
+    goal_id: int
+    member_id: int
+    goal_type: str
+    target_value: float
+    baseline: Optional[float]
+    latest: Optional[float]
+    progress: Optional[float]   # 0.0 .. 1.0+ ; None without readings
+    completed: bool
+
+
+def compute_progress(rule: str, baseline, latest, target):
+    if baseline is None or latest is None:
+        return None
+    if rule == "decrease_by":
+        return (baseline - latest) / target if target else None
+    if rule == "increase_by":
+        return (latest - baseline) / target if target else None
+    # reach: fraction of the distance from baseline to the target level
+    if baseline == target:
+        return 1.0
+    return (baseline - latest) / (baseline - target)
+
+
+def _reading(measure: str, when: str = None):
+    # Correlated lookup of one reading for the goal's member:
+    # when=None latest, "before" last before start_date, "after" first on/after
+    h = aliased(HealthMetric)
+    column = getattr(h, measure)
+    conditions = [h.member_id == FitnessGoal.member_id, column.isnot(None)]
+    order = h.recorded_at.desc()
+    if when == "before":
+        conditions.append(h.recorded_at < FitnessGoal.start_date)
+    elif when == "after":
+        conditions.append(h.recorded_at >= FitnessGoal.start_date)
+        order = h.recorded_at.asc()
+    return select(column).where(*conditions).order_by(order).limit(1).scalar_subquery()
+
+
+def goals_statement(measure: str, goal_types):
+    g = FitnessGoal
+    return (
+        select(
+            g.goal_id,
+            g.member_id,
+            g.goal_type,
+            g.target_value,
+            _reading(measure, "before").label("baseline_before"),
+            _reading(measure, "after").label("baseline_after"),
+            _reading(measure).label("latest"),
+        )
+        .where(g.status == "active", g.goal_type.in_(goal_types))
+        .order_by(g.goal_id)
+    )
+
+
+def iter_goal_progress(session, batch_size: int = 5000):
+    # Yields a GoalProgress for every active goal with a known goal_type
+    by_measure = {}
+    for goal_type, (measure, _) in GOAL_RULES.items():
+        by_measure.setdefault(measure, []).append(goal_type)
+
+    for measure, goal_types in by_measure.items():
+        stmt = goals_statement(measure, goal_types).execution_options(yield_per=batch_size)
+        for row in session.execute(stmt):
+            rule = GOAL_RULES[row.goal_type][1]
+            baseline = row.baseline_before if row.baseline_before is not None else row.baseline_after
+            baseline = None if baseline is None else float(baseline)
+            latest = None if row.latest is None else float(row.latest)
+            target = float(row.target_value)
+            progress = compute_progress(rule, baseline, latest, target)
+            yield GoalProgress(
+                row.goal_id,
+                row.member_id,
+                row.goal_type,
+                target,
+                baseline,
+                latest,
+                progress,
+                progress is not None and progress >= 1.0,
+            )
+
+
+def mark_completed(session, goal_ids, batch_size: int = 1000):
+    ids = list(goal_ids)
+    for i in range(0, len(ids), batch_size):
+        session.execute(
+            update(FitnessGoal)
+            .where(FitnessGoal.goal_id.in_(ids[i:i + batch_size]), FitnessGoal.status == "active")
+            .values(status="completed")
+            .execution_options(synchronize_session=False)
+        )
+
+
+def run_goal_progress(session, apply: bool = True):
+    # Returns (goals evaluated, goals completed); the caller commits
+    evaluated = 0
+    completed_ids = []
+    for result in iter_goal_progress(session):
+        evaluated += 1
+        if result.completed:
+            completed_ids.append(result.goal_id)
+    if apply and completed_ids:
+        mark_completed(session, completed_ids)
+    return evaluated, len(completed_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate active fitness goals")
+    parser.add_argument("--dry-run", action="store_true", help="don't mark goals completed")
+    args = parser.parse_args()
+
+    with session_scope() as session:
+        evaluated, completed = run_goal_progress(session, apply=not args.dry_run)
+    verb = "would be" if args.dry_run else "were"
+    print(f"Evaluated {evaluated} active goals; {completed} {verb} marked completed.")
+
+
+if __name__ == "__main__":
+    main()
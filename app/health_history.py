@@ -0,0 +1,76 @@
+# app/health_history.py
+# Health history reads that stay cheap for members with years of readings.
+#
+# Pages use keyset pagination on (recorded_at, metric_id), newest first: each
+# page starts from the last row of the previous one via the
+# (member_id, recorded_at DESC) index, so page 500 costs the same as page 1.
+# Exports stream rows from a server-side cursor instead of calling .all().
+import base64
+import csv
+from datetime import datetime
+
+from sqlalchemy import select, and_, or_
+
+from models.health_metric import HealthMetric
+
+EXPORT_COLUMNS = ("recorded_at", "weight", "heart_rate", "body_fat_pct", "notes")
+
+
+def encode_cursor(metric) -> str:
+    # Opaque "continue after this row" token
+    raw = f"{metric.recorded_at.isoformat()}|{metric.metric_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        recorded_at, metric_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(recorded_at), int(metric_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid page cursor.")
+
+
+def fetch_health_page(session, member_id: int, cursor: str = None, page_size: int = 20):
+    # Returns (metrics newest first, cursor for the next page or None)
+    query = session.query(HealthMetric).filter(HealthMetric.member_id == member_id)
+    if cursor:
+        recorded_at, metric_id = decode_cursor(cursor)
+        query = query.filter(
+            HealthMetric.recorded_at <= recorded_at,
+            or_(
+                HealthMetric.recorded_at < recorded_at,
+                and_(HealthMetric.recorded_at == recorded_at, HealthMetric.metric_id < metric_id),
+            ),
+        )
+    rows = (
+        query.order_by(HealthMetric.recorded_at.desc(), HealthMetric.metric_id.desc())
+        .limit(page_size + 1)
+        .all()
+    )
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+
+def iter_health_history(session, member_id: int, batch_size: int = 1000):
+    # Stream every metric row (oldest first) in constant memory
+    stmt = (
+        select(HealthMetric.metric_id, *(getattr(HealthMetric, c) for c in EXPORT_COLUMNS))
+        .where(HealthMetric.member_id == member_id)
+        .order_by(HealthMetric.recorded_at, HealthMetric.metric_id)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in session.execute(stmt):
+        yield row
+
+
+def export_health_csv(session, member_id: int, out) -> int:
+    # Write the member's full history to a text file object; returns row count
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_COLUMNS)
+    count = 0
+    for row in iter_health_history(session, member_id):
+        writer.writerow(["" if getattr(row, c) is None else getattr(row, c) for c in EXPORT_COLUMNS])
+        count += 1
+    return count
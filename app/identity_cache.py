@@ -0,0 +1,187 @@
+# app/identity_cache.py
+# email -> (id, name) lookups for the member / trainer / admin menus.
+#
+# Almost every action starts by resolving the email typed at the kiosk.
+# Results are kept in a small per-process LRU with a time-to-live, so a
+# returning user costs no query at all; a miss selects only the four columns
+# needed, through the lower(email) functional index. Emails match case-
+# insensitively. Misses are not cached, and the member entry is dropped when
+# register_member / update_profile change it. A lookup made in a transaction
+# that has written something is only cached once that transaction commits,
+# so a rolled-back insert or update never leaves an entry behind.
+#
+# The cache is per process: with several processes (API workers, batch
+# runners, kiosks) a change made in one is seen by the others only when
+# their entry expires, after at most FITNESS_IDENTITY_CACHE_TTL seconds.
+# Lower it, or set it to 0 to turn the cache off, where that matters.
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from models.member import Member
+from models.trainer import Trainer
+from models.admin_staff import AdminStaff
+
+CACHE_SIZE = int(os.environ.get("FITNESS_IDENTITY_CACHE_SIZE") or 10_000)
+CACHE_TTL = float(os.environ.get("FITNESS_IDENTITY_CACHE_TTL") or 300)
+
+
+class MemberRef(NamedTuple):
+    member_id: int
+    email: str
+    first_name: str
+    last_name: str
+
+
+class TrainerRef(NamedTuple):
+    trainer_id: int
+    email: str
+    first_name: str
+    last_name: str
+
+
+class AdminRef(NamedTuple):
+    admin_id: int
+    email: str
+    first_name: str
+    last_name: str
+
+
+class IdentityCache:
+    # Bounded LRU of normalised email -> ref with a time-to-live; thread safe
+
+    def __init__(self, max_size: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return dict(size=len(self._entries), hits=self.hits, misses=self.misses)
+
+
+def normalise_email(email: str) -> str:
+    return email.strip().lower()
+
+
+# model, primary key, ref type
+_ROLES = {
+    "member": (Member, Member.member_id, MemberRef),
+    "trainer": (Trainer, Trainer.trainer_id, TrainerRef),
+    "admin": (AdminStaff, AdminStaff.admin_id, AdminRef),
+}
+
+caches = {role: IdentityCache() for role in _ROLES}
+
+
+# Session.info keys: the transaction has written / lookups to cache on commit
+_WROTE = "identity_cache_wrote"
+_PENDING = "identity_cache_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_written(session, flush_context):
+    session.info[_WROTE] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement(state):
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_WROTE] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _cache_pending(session):
+    for cache, key, ref in session.info.pop(_PENDING, ()):
+        cache.put(key, ref)
+    session.info.pop(_WROTE, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_pending(session, previous_transaction):
+    # savepoint rollbacks too: entries from before the savepoint are just
+    # looked up again later
+    session.info.pop(_PENDING, None)
+    if not previous_transaction.nested and previous_transaction.parent is None:
+        session.info.pop(_WROTE, None)
+
+
+def _lookup(role: str, session, email: str):
+    key = normalise_email(email)
+    if not key:
+        return None
+    cache = caches[role]
+    ref = cache.get(key)
+    if ref is not None:
+        return ref
+
+    model, pk, ref_type = _ROLES[role]
+    row = session.execute(
+        select(pk, model.email, model.first_name, model.last_name)
+        .where(func.lower(model.email) == key)
+        .order_by(pk)
+        .limit(1)
+    ).first()
+    if row is None:
+        return None
+    ref = ref_type(*row)
+    if session.info.get(_WROTE):
+        # may be this transaction's own uncommitted row
+        session.info.setdefault(_PENDING, []).append((cache, key, ref))
+    else:
+        cache.put(key, ref)
+    return ref
+
+
+def lookup_member(session, email: str) -> Optional[MemberRef]:
+    return _lookup("member", session, email)
+
+
+def lookup_trainer(session, email: str) -> Optional[TrainerRef]:
+    return _lookup("trainer", session, email)
+
+
+def lookup_admin(session, email: str) -> Optional[AdminRef]:
+    return _lookup("admin", session, email)
+
+
+def invalidate_member(email: str):
+    caches["member"].invalidate(normalise_email(email))
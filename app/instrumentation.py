@@ -0,0 +1,188 @@
+# app/instrumentation.py
+# Opt-in SQL instrumentation (FITNESS_SQL_INSTRUMENT=1).
+#
+# Engine events time every statement and charge it to the service function
+# that caused it, found by walking the Python stack to the outermost app/
+# frame below the role menu (e.g. trainer_service.view_schedule). ORM events
+# count lazy relationship loads per transaction; the same relationship lazy
+# loaded over and over in one transaction is reported as an N+1. A summary
+# table is printed at exit and slow statements, N+1s and the summary are
+# appended to a JSONL log when FITNESS_SQL_LOG is set.
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+from sqlalchemy import event
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+# plumbing that runs statements on behalf of its caller
+SKIP_FILES = {os.path.join(APP_DIR, "instrumentation.py"), os.path.join(APP_DIR, "db.py")}
+
+# a context variable rather than a thread local: API requests share the
+# event loop thread, each in its own task / greenlet context
+_operation = ContextVar("sql_operation", default=None)
+
+
+@contextmanager
+def operation(name: str):
+    # Charge statements in this block to `name` instead of the stack walk
+    token = _operation.set(name)
+    try:
+        yield
+    finally:
+        _operation.reset(token)
+
+
+def current_operation() -> str:
+    name = _operation.get()
+    if name:
+        return name
+    label = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        filename = code.co_filename
+        if filename.startswith(APP_DIR) and filename not in SKIP_FILES:
+            if code.co_name.endswith("_menu") or code.co_name == "<module>":
+                break
+            label = f"{os.path.basename(filename)[:-3]}.{code.co_name}"
+        elif label is not None and filename not in SKIP_FILES:
+            break
+        frame = frame.f_back
+    return label or "(outside app)"
+
+
+class SqlInstrumentation:
+
+    def __init__(self, slow_ms: float = 100, log_path: str = None, n_plus_one: int = 3, out=None):
+        self.slow_ms = slow_ms
+        self.n_plus_one = n_plus_one
+        self.out = out or sys.stderr
+        self._lock = threading.Lock()
+        self._log = open(log_path, "a", encoding="utf-8") if log_path else None
+        self.stats = {}          # operation -> counters
+        self.findings = Counter()  # (operation, relationship) -> N+1 transactions
+
+    def install(self, engine, session_factory):
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(session_factory, "do_orm_execute", self._orm_execute)
+        event.listen(session_factory, "after_transaction_end", self._transaction_end)
+        atexit.register(self.finish)
+        return self
+
+    # engine events
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("instrumentation", []).append((time.perf_counter(), current_operation()))
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started, name = conn.info["instrumentation"].pop()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        # psycopg2 reports rows for SELECT too; sqlite3 only for DML
+        rows = max(cursor.rowcount, 0)
+        slow = elapsed_ms >= self.slow_ms
+        with self._lock:
+            stats = self.stats.setdefault(
+                name, dict(statements=0, total_ms=0.0, max_ms=0.0, rows=0, slow=0, n_plus_one=0)
+            )
+            stats["statements"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["rows"] += rows
+            stats["slow"] += slow
+        if slow:
+            self._write(
+                "slow_statement",
+                operation=name,
+                ms=round(elapsed_ms, 3),
+                rows=rows,
+                statement=" ".join(statement.split())[:1000],
+            )
+
+    # ORM events
+
+    def _orm_execute(self, state):
+        if state.lazy_loaded_from is None:
+            return
+        relationship = str(state.loader_strategy_path.path[-1])
+        loads = state.session.info.setdefault("lazy_loads", Counter())
+        loads[(current_operation(), relationship)] += 1
+
+    def _transaction_end(self, session, transaction):
+        if transaction.parent is not None:
+            return
+        loads = session.info.pop("lazy_loads", None)
+        if not loads:
+            return
+        for (name, relationship), count in loads.items():
+            if count < self.n_plus_one:
+                continue
+            with self._lock:
+                self.findings[(name, relationship)] += 1
+                stats = self.stats.get(name)
+                if stats is not None:
+                    stats["n_plus_one"] += 1
+            self._write("n_plus_one", operation=name, relationship=relationship, lazy_loads=count)
+
+    # output
+
+    def _write(self, kind: str, **fields):
+        if self._log is None:
+            return
+        line = json.dumps(dict(kind=kind, at=datetime.utcnow().isoformat(), **fields))
+        with self._lock:
+            self._log.write(line + "\n")
+            self._log.flush()
+
+    def summary(self):
+        # Per-operation totals, busiest first
+        with self._lock:
+            items = [dict(operation=name, **stats) for name, stats in self.stats.items()]
+        items.sort(key=lambda s: s["total_ms"], reverse=True)
+        for item in items:
+            item["avg_ms"] = item["total_ms"] / item["statements"]
+        return items
+
+    def print_summary(self):
+        items = self.summary()
+        if not items:
+            return
+        out = self.out
+        print("\nSQL by operation", file=out)
+        print(f"{'operation':<45} {'stmts':>7} {'total ms':>10} {'avg ms':>8} {'max ms':>8} "
+              f"{'rows':>9} {'slow':>5} {'N+1':>4}", file=out)
+        for s in items:
+            print(f"{s['operation']:<45} {s['statements']:>7} {s['total_ms']:>10.1f} {s['avg_ms']:>8.2f} "
+                  f"{s['max_ms']:>8.1f} {s['rows']:>9} {s['slow']:>5} {s['n_plus_one']:>4}", file=out)
+        if self.findings:
+            print("\nRepeated lazy loads (N+1):", file=out)
+            for (name, relationship), transactions in self.findings.most_common():
+                print(f"  {name}: {relationship} in {transactions} transaction(s)", file=out)
+
+    def finish(self):
+        for item in self.summary():
+            self._write("summary", **{k: round(v, 3) if isinstance(v, float) else v for k, v in item.items()})
+        self.print_summary()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+def install_from_env(engine, session_factory):
+    # Returns the active SqlInstrumentation, or None when not enabled
+    value = os.environ.get("FITNESS_SQL_INSTRUMENT", "")
+    if value.strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    return SqlInstrumentation(
+        slow_ms=float(os.environ.get("FITNESS_SQL_SLOW_MS") or 100),
+        log_path=os.environ.get("FITNESS_SQL_LOG") or None,
+        n_plus_one=int(os.environ.get("FITNESS_SQL_N_PLUS_ONE") or 3),
+    ).install(engine, session_factory)
@@ -1,10 +1,20 @@
 # app/main.py
 
+from app.db import remove_session
 from app.member_service import member_menu
 from app.trainer_service import trainer_menu
 from app.admin_service import admin_menu
 
 
+def run_role_menu(menu):
+    # All actions in one role menu share the thread's session; release it
+    # (and its pooled connection) when the user leaves the menu
+    try:
+        menu()
+    finally:
+        remove_session()
+
+
 def main_menu():
     while True:
         print("\nHealth & Fitness Club Management System")
@@ -16,11 +26,11 @@ def main_menu():
         choice = input("Please select if you are a member, trainer or admin staff: ").strip()
 
         if choice == "1":
-            member_menu()
+            run_role_menu(member_menu)
         elif choice == "2":
-           trainer_menu()
+            run_role_menu(trainer_menu)
         elif choice == "3":
-            admin_menu()
+            run_role_menu(admin_menu)
         elif choice == "0":
             print("Goodbye!")
             break
@@ -1,12 +1,28 @@
 # app/member_service.py
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
 from app.db import get_session
+from app.errors import ServiceError, NotFound, BookingConflict, describe
+from app.identity_cache import lookup_member, invalidate_member
+from app.slot_finder import find_free_slots, within_availability
+from app.dashboard import fetch_dashboard
+from app.archive import member_history
+from app.health_history import fetch_health_page, export_health_csv
+from app.registration_service import (
+    register_for_class,
+    cancel_registration,
+    waitlist_position,
+    upcoming_classes,
+)
 from models.member import Member
 from models.health_metric import HealthMetric
 from models.fitness_goal import FitnessGoal
 from models.personal_training_session import PersonalTrainingSession
 from models.class_registration import ClassRegistration
+from models.room import Room
+from models.trainer import Trainer
+from models.booking_interval import overlap_conflict
 
 
 def member_menu():
@@ -18,6 +34,10 @@ def member_menu():
         print("3. Add health metric (health history)")
         print("4. View dashboard")
         print("5. View health history")
+        print("6. Book personal training session")
+        print("7. Register for a group class")
+        print("8. Cancel a class registration")
+        print("9. Export health history (CSV)")
         print("0. Back to main menu")
 
         choice = input("Select an option: ").strip()
@@ -32,6 +52,14 @@ def member_menu():
             show_dashboard()
         elif choice == "5":
             view_health_history()
+        elif choice == "6":
+            book_personal_training()
+        elif choice == "7":
+            register_for_group_class()
+        elif choice == "8":
+            cancel_class_registration()
+        elif choice == "9":
+            export_health_history()
         elif choice == "0":
             break
         else:
@@ -39,6 +67,162 @@ def member_menu():
 
 
 # Member operations
+#
+# create_member / update_member_profile / record_health_metric / book_pt_slot
+# do the work for one request: they take a session and plain values, raise
+# ServiceError with a message for the user and leave the commit to the
+# caller. The menu functions below them only prompt, commit and print.
+
+def require_member(session, email: str):
+    # MemberRef for the email, or ServiceError
+    if not email:
+        raise ServiceError("Email is required.")
+    member = find_member_by_email(session, email)
+    if not member:
+        raise NotFound("Member not found.")
+    return member
+
+
+def create_member(session, first_name, last_name, email, password,
+                  date_of_birth=None, gender=None, phone=None):
+    if not first_name or not last_name or not email or not password:
+        raise ServiceError("First name, last name, email, and password are required.")
+    # Check if email already exists (in any letter case)
+    if lookup_member(session, email):
+        raise ServiceError("A member with that email already exists.")
+
+    member = Member(
+        first_name=first_name,
+        last_name=last_name,
+        email=email,
+        password_hash=password,
+        date_of_birth=date_of_birth,
+        gender=gender or None,
+        phone=phone or None,
+    )
+    session.add(member)
+    session.flush()
+    return member
+
+
+def update_member_profile(session, email, first_name=None, last_name=None, phone=None,
+                          gender=None, date_of_birth=None, password=None):
+    # Blank / None values keep the current value
+    ref = require_member(session, email)
+    member = session.get(Member, ref.member_id)
+    if first_name:
+        member.first_name = first_name
+    if last_name:
+        member.last_name = last_name
+    if phone:
+        member.phone = phone
+    if gender:
+        member.gender = gender
+    if date_of_birth:
+        member.date_of_birth = date_of_birth
+    if password:
+        member.password_hash = password
+    session.flush()
+    return member
+
+
+def record_health_metric(session, email, weight=None, heart_rate=None, body_fat_pct=None,
+                         notes=None, recorded_at=None):
+    member = require_member(session, email)
+    metric = HealthMetric(
+        member_id=member.member_id,
+        weight=weight,
+        heart_rate=heart_rate,
+        body_fat_pct=body_fat_pct,
+        notes=notes or None,
+        recorded_at=recorded_at or datetime.utcnow(),
+    )
+    session.add(metric)
+    session.flush()
+    return metric
+
+
+def book_pt_slot(session, email, room_id: int, trainer_id: int, start_time, minutes: int = 60):
+    # Book a PT session inside the trainer's availability; the
+    # booking-interval constraint rejects overlaps
+    member = require_member(session, email)
+    if minutes <= 0:
+        raise ServiceError("Minutes must be positive.")
+    room = session.get(Room, room_id)
+    if room is None or not room.is_active:
+        raise NotFound("Room not found.")
+    if session.get(Trainer, trainer_id) is None:
+        raise NotFound("Trainer not found.")
+    end_time = start_time + timedelta(minutes=minutes)
+    if start_time < datetime.utcnow():
+        raise ServiceError("PT sessions can't be booked in the past.")
+    if not within_availability(session, trainer_id, start_time, end_time):
+        raise ServiceError("The trainer is not available at that time.")
+
+    pt_session = PersonalTrainingSession(
+        member_id=member.member_id,
+        trainer_id=trainer_id,
+        room_id=room_id,
+        start_time=start_time,
+        end_time=end_time,
+        status="scheduled",
+    )
+    session.add(pt_session)
+    try:
+        session.flush()
+    except IntegrityError as e:
+        conflict = overlap_conflict(e)
+        if conflict is None:
+            raise
+        raise BookingConflict(
+            conflict, "Sorry, that slot was just booked by someone else. Please search again."
+        )
+    return pt_session
+
+
+def join_class(session, email, class_id: int):
+    # Returns (outcome, registration) as register_for_class does
+    member = require_member(session, email)
+    try:
+        outcome, registration = register_for_class(session, member.member_id, class_id)
+    except IntegrityError:
+        # same member registering twice at the same moment
+        raise ServiceError("You already have a registration for that class.")
+    if outcome == "unavailable":
+        raise ServiceError("That class is not open for registration.")
+    return outcome, registration
+
+
+def leave_class(session, email, class_id: int):
+    # Returns the member promoted from the waitlist, or None
+    member = require_member(session, email)
+    cancelled, promoted = cancel_registration(session, member.member_id, class_id)
+    if cancelled is None:
+        raise NotFound("No active registration found for that class.")
+    return promoted
+
+
+def free_pt_slots(session, room_id: int, days: int = 7, minutes: int = 60, limit: int = 20):
+    # Earliest free PT slots in an active room over the next `days` days
+    if days <= 0 or minutes <= 0:
+        raise ServiceError("Days and minutes must be positive.")
+    room = session.get(Room, room_id)
+    if room is None or not room.is_active:
+        raise NotFound("Room not found.")
+    today = datetime.utcnow().date()
+    slots = find_free_slots(
+        session, today, today + timedelta(days=days - 1), timedelta(minutes=minutes), room_id=room_id
+    )
+    return slots[:limit]
+
+
+def booking_history(session, email, full_history: bool = False, limit: int = 50):
+    # Classes and PT sessions newest first; archived ones only with full_history
+    member = require_member(session, email)
+    if limit <= 0:
+        raise ServiceError("Limit must be positive.")
+    return member_history(session, member.member_id, full_history, limit)
+
 
 def register_member():
     # Create a new member 
@@ -51,10 +235,6 @@ def register_member():
     gender = input("Gender (optional): ").strip()
     phone = input("Phone (optional): ").strip()
 
-    if not first_name or not last_name or not email or not password:
-        print("First name, last name, email, and password are required.")
-        return
-
     date_of_birth = None
     if dob_str:
         try:
@@ -64,35 +244,25 @@ def register_member():
 
     session = get_session()
     try:
-        # Check if email already exists
-        existing = session.query(Member).filter_by(email=email).first()
-        if existing:
-            print("A member with that email already exists.")
-            return
-
-        member = Member(
-            first_name=first_name,
-            last_name=last_name,
-            email=email,
-            password_hash=password,  
-            date_of_birth=date_of_birth,
-            gender=gender or None,
-            phone=phone or None,
+        member = create_member(
+            session, first_name, last_name, email, password, date_of_birth, gender, phone
         )
-
-        session.add(member)
         session.commit()
+        invalidate_member(email)
         print(f"Member registered with ID: {member.member_id}")
+    except ServiceError as e:
+        session.rollback()
+        print(e)
     except Exception as e:
         session.rollback()
-        print("Error while registering member:", e)
+        print("Error while registering member:", describe(e))
     finally:
         session.close()
 
 
 def find_member_by_email(session, email: str):
-    # Helper to fetch a member by email
-    return session.query(Member).filter_by(email=email).first()
+    # Helper to resolve a member's email to a MemberRef (id + name), cached
+    return lookup_member(session, email)
 
 
 def update_profile():
@@ -105,10 +275,8 @@ def update_profile():
 
     session = get_session()
     try:
-        member = find_member_by_email(session, email)
-        if not member:
-            print("Member not found.")
-            return
+        ref = require_member(session, email)
+        member = session.get(Member, ref.member_id)
 
         print(f"\nUpdating profile for {member.first_name} {member.last_name} ({member.email})")
         print("Leave any field blank to keep the current value.\n")
@@ -123,27 +291,26 @@ def update_profile():
         ).strip()
         new_password = input("New password (blank to keep current): ").strip()
 
-        if new_first:
-            member.first_name = new_first
-        if new_last:
-            member.last_name = new_last
-        if new_phone:
-            member.phone = new_phone
-        if new_gender:
-            member.gender = new_gender
+        date_of_birth = None
         if new_dob:
             try:
-                member.date_of_birth = datetime.strptime(new_dob, "%Y-%m-%d").date()
+                date_of_birth = datetime.strptime(new_dob, "%Y-%m-%d").date()
             except ValueError:
                 print("Invalid date format. Skipping DOB update.")
-        if new_password:
-            member.password_hash = new_password  
 
+        update_member_profile(
+            session, email, first_name=new_first, last_name=new_last, phone=new_phone,
+            gender=new_gender, date_of_birth=date_of_birth, password=new_password,
+        )
         session.commit()
+        invalidate_member(member.email)
         print("\nProfile updated successfully.")
+    except ServiceError as e:
+        session.rollback()
+        print(e)
     except Exception as e:
         session.rollback()
-        print("Error while updating profile:", e)
+        print("Error while updating profile:", describe(e))
     finally:
         session.close()
 
@@ -158,11 +325,6 @@ def add_health_metric():
 
     session = get_session()
     try:
-        member = find_member_by_email(session, email)
-        if not member:
-            print("Member not found.")
-            return
-
         weight_str = input("Weight (kg, optional): ").strip()
         hr_str = input("Heart rate (bpm, optional): ").strip()
         bf_str = input("Body fat % (optional): ").strip()
@@ -172,23 +334,18 @@ def add_health_metric():
         heart_rate = int(hr_str) if hr_str else None
         body_fat = float(bf_str) if bf_str else None
 
-        metric = HealthMetric(
-            member_id=member.member_id,
-            weight=weight,
-            heart_rate=heart_rate,
-            body_fat_pct=body_fat,
-            notes=notes or None,
-        )
-
-        session.add(metric)
+        record_health_metric(session, email, weight, heart_rate, body_fat, notes)
         session.commit()
         print("Health metric added successfully.")
+    except ServiceError as e:
+        session.rollback()
+        print(e)
     except ValueError:
         session.rollback()
         print("Invalid numeric value for weight / heart rate / body fat.")
     except Exception as e:
         session.rollback()
-        print("Error while adding health metric:", e)
+        print("Error while adding health metric:", describe(e))
     finally:
         session.close()
 
@@ -202,21 +359,15 @@ def show_dashboard():
 
     session = get_session()
     try:
-        member = find_member_by_email(session, email)
-        if not member:
+        # one round trip for the whole screen
+        data = fetch_dashboard(session, email)
+        if data is None:
             print("Member not found.")
             return
 
-        print(f"\nDashboard for {member.first_name} {member.last_name} ({member.email})")
-
-        # Latest health metric
-        latest_metric = (
-            session.query(HealthMetric)
-            .filter_by(member_id=member.member_id)
-            .order_by(HealthMetric.recorded_at.desc())
-            .first()
-        )
+        print(f"\nDashboard for {data.first_name} {data.last_name} ({data.email})")
 
+        latest_metric = data.latest_metric
         if latest_metric:
             print("\nLatest Health Metric:")
             print(f"  Recorded at: {latest_metric.recorded_at}")
@@ -226,52 +377,24 @@ def show_dashboard():
         else:
             print("\nNo health metrics recorded yet.")
 
-        # Active goals
-        active_goals = (
-            session.query(FitnessGoal)
-            .filter_by(member_id=member.member_id, status="active")
-            .all()
-        )
-
-        if active_goals:
+        if data.active_goals:
             print("\nActive Fitness Goals:")
-            for g in active_goals:
+            for g in data.active_goals:
                 print(f"  - {g.goal_type}: target {g.target_value} {g.unit} by {g.target_date or 'N/A'}")
         else:
             print("\nNo active fitness goals.")
 
-        # Past classes count
-        past_classes_count = (
-            session.query(ClassRegistration)
-            .filter(
-                ClassRegistration.member_id == member.member_id,
-                ClassRegistration.attendance_status == "attended",
-            )
-            .count()
-        )
-        print(f"\nTotal classes attended: {past_classes_count}")
-
-        # Upcoming PT sessions
-        now = datetime.utcnow()
-        upcoming_sessions = (
-            session.query(PersonalTrainingSession)
-            .filter(
-                PersonalTrainingSession.member_id == member.member_id,
-                PersonalTrainingSession.start_time >= now,
-            )
-            .order_by(PersonalTrainingSession.start_time.asc())
-            .all()
-        )
+        print(f"\nTotal classes attended: {data.classes_attended}")
 
-        if upcoming_sessions:
+        if data.upcoming_sessions:
             print("\nUpcoming Personal Training Sessions:")
-            for s in upcoming_sessions:
+            for s in data.upcoming_sessions:
                 print(f"  - {s.start_time} to {s.end_time} (status: {s.status}) in room {s.room_id}")
         else:
             print("\nNo upcoming personal training sessions.")
 
     except Exception as e:
-        print("Error while showing dashboard:", e)
+        print("Error while showing dashboard:", describe(e))
     finally:
         session.close()
 
@@ -289,28 +412,199 @@ def view_health_history():
             print("Member not found.")
             return
 
-        metrics = (
-            session.query(HealthMetric)
-            .filter_by(member_id=member.member_id)
-            .order_by(HealthMetric.recorded_at.desc())
-            .all()
-        )
-
+        # one page at a time, newest first
+        metrics, cursor = fetch_health_page(session, member.member_id)
         if not metrics:
             print("\nNo health metrics recorded yet.")
             return
 
         print(f"\nHealth History for {member.first_name} {member.last_name}:")
         print("---------------------------------------------------------")
-        for m in metrics:
-            print(f"{m.recorded_at} | Weight: {m.weight or 'N/A'} kg | "
-                  f"HR: {m.heart_rate or 'N/A'} bpm | "
-                  f"Body fat: {m.body_fat_pct or 'N/A'} | "
-                  f"Notes: {m.notes or ''}")
+        while True:
+            for m in metrics:
+                print(f"{m.recorded_at} | Weight: {m.weight or 'N/A'} kg | "
+                      f"HR: {m.heart_rate or 'N/A'} bpm | "
+                      f"Body fat: {m.body_fat_pct or 'N/A'} | "
+                      f"Notes: {m.notes or ''}")
+            if cursor is None:
+                break
+            more = input("-- Press Enter for older entries, or q to stop: ").strip().lower()
+            if more == "q":
+                break
+            metrics, cursor = fetch_health_page(session, member.member_id, cursor)
         print("---------------------------------------------------------")
 
     except Exception as e:
-        print("Error while viewing health history:", e)
+        print("Error while viewing health history:", describe(e))
     finally:
         session.close()
 
+
+def export_health_history():
+    print("\n--- Export Health History ---")
+    email = input("Enter your email: ").strip()
+    if not email:
+        print("Email is required.")
+        return
+
+    session = get_session()
+    try:
+        member = find_member_by_email(session, email)
+        if not member:
+            print("Member not found.")
+            return
+
+        path = input("CSV file to write [health_history.csv]: ").strip() or "health_history.csv"
+        with open(path, "w", newline="", encoding="utf-8") as out:
+            count = export_health_csv(session, member.member_id, out)
+        print(f"Exported {count} health metrics to {path}.")
+    except OSError as e:
+        print("Could not write file:", e)
+    except Exception as e:
+        print("Error while exporting health history:", describe(e))
+    finally:
+        session.close()
+
+
+def book_personal_training():
+    # Search free trainer slots and book a PT session in one of them
+    print("\n--- Book Personal Training Session ---")
+    email = input("Enter your email: ").strip()
+    if not email:
+        print("Email is required.")
+        return
+
+    session = get_session()
+    try:
+        rooms = session.query(Room).filter_by(is_active=True).order_by(Room.room_id).all()
+        if not rooms:
+            print("No active rooms available.")
+            return
+        print("\nRooms:")
+        for r in rooms:
+            print(f"  ID {r.room_id}: {r.room_name}")
+        try:
+            room_id = int(input("Enter room ID: ").strip())
+            days = int(input("Search how many days ahead? [7]: ").strip() or "7")
+            minutes = int(input("Session length in minutes [60]: ").strip() or "60")
+        except ValueError:
+            print("Room ID, days and minutes must be integers.")
+            return
+
+        slots = free_pt_slots(session, room_id, days, minutes)
+        if not slots:
+            print("\nNo free slots found in that period.")
+            return
+
+        print("\nAvailable slots (earliest first):")
+        for n, slot in enumerate(slots, start=1):
+            print(f"  {n}. {slot.start_time} - {slot.end_time} with {slot.trainer_name}")
+
+        try:
+            pick = int(input("Pick a slot number: ").strip())
+            if pick < 1:
+                raise IndexError
+            slot = slots[pick - 1]
+        except (ValueError, IndexError):
+            print("Invalid slot number.")
+            return
+
+        pt_session = book_pt_slot(session, email, room_id, slot.trainer_id, slot.start_time, minutes)
+        session.commit()
+        print(
+            f"\nBooked PT session {pt_session.session_id} with {slot.trainer_name} "
+            f"on {pt_session.start_time} - {pt_session.end_time}."
+        )
+    except ServiceError as e:
+        session.rollback()
+        print(f"\n{e}")
+    except Exception as e:
+        session.rollback()
+        print("Error while booking personal training:", describe(e))
+    finally:
+        session.close()
+
+
+def register_for_group_class():
+    print("\n--- Register for a Group Class ---")
+    email = input("Enter your email: ").strip()
+    if not email:
+        print("Email is required.")
+        return
+
+    session = get_session()
+    try:
+        classes = upcoming_classes(session)
+        if not classes:
+            print("\nNo upcoming classes.")
+            return
+
+        print("\nUpcoming classes:")
+        for c in classes:
+            seats = "FULL (waitlist)" if c.registered_count >= c.capacity else \
+                f"{c.capacity - c.registered_count} seats left"
+            print(f"  ID {c.class_id}: {c.class_name} | {c.start_time} - {c.end_time} | {seats}")
+
+        try:
+            class_id = int(input("Enter class ID: ").strip())
+        except ValueError:
+            print("Class ID must be an integer.")
+            return
+
+        outcome, registration = join_class(session, email, class_id)
+        if outcome == "already_registered":
+            print("You are already registered for that class.")
+            return
+        if outcome == "already_waitlisted":
+            print(
+                "You are already on the waitlist (position "
+                f"{waitlist_position(session, registration)})."
+            )
+            return
+
+        session.commit()
+        if outcome == "registered":
+            print("You are registered. See you in class!")
+        else:
+            print(
+                "The class is full. You have been added to the waitlist "
+                f"(position {waitlist_position(session, registration)})."
+            )
+    except ServiceError as e:
+        session.rollback()
+        print(e)
+    except Exception as e:
+        session.rollback()
+        print("Error while registering for class:", describe(e))
+    finally:
+        session.close()
+
+
+def cancel_class_registration():
+    print("\n--- Cancel Class Registration ---")
+    email = input("Enter your email: ").strip()
+    if not email:
+        print("Email is required.")
+        return
+
+    session = get_session()
+    try:
+        try:
+            class_id = int(input("Enter class ID: ").strip())
+        except ValueError:
+            print("Class ID must be an integer.")
+            return
+
+        promoted = leave_class(session, email, class_id)
+        session.commit()
+        print("Your registration has been cancelled.")
+        if promoted is not None:
+            print(f"The next member on the waitlist (ID {promoted.member_id}) now has your seat.")
+    except ServiceError as e:
+        session.rollback()
+        print(e)
+    except Exception as e:
+        session.rollback()
+        print("Error while cancelling registration:", describe(e))
+    finally:
+        session.close()
@@ -0,0 +1,209 @@
+# app/metric_import.py
+"""
+Bulk import of health metrics from body-composition scanner exports
+
+Accepts CSV (with a header row) or JSONL, one reading per row/line, with
+the fields: email, recorded_at, weight, heart_rate, body_fat_pct, notes.
+recorded_at with a UTC offset is converted to UTC; without one it is taken
+as UTC already.
+The file is streamed in batches, member emails are resolved with one query
+per batch, and rows are loaded with PostgreSQL COPY (batched executemany on
+other databases). Bad rows are reported by line number and skipped. Daily /
+weekly rollups are updated in the same transaction as each batch.
+
+    python3 -m app.metric_import readings.csv
+    python3 -m app.metric_import readings.jsonl --batch-size 10000
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import datetime, timezone
+
+from sqlalchemy import func, insert, select
+
+from models import engine, Member, HealthMetric
+from models.health_metric_rollup import apply_metric_rows
+
+FIELDS = ("email", "recorded_at", "weight", "heart_rate", "body_fat_pct", "notes")
+COPY_COLUMNS = ("member_id", "recorded_at", "weight", "heart_rate", "body_fat_pct", "notes")
+
+# resolved (lowercased) email -> member_id; cleared when it grows past this many entries
+EMAIL_CACHE_LIMIT = 100_000
+
+
+class RowError(ValueError):
+    pass
+
+
+def read_records(path: str):
+    # Yields (line number, dict) without loading the file into memory
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".jsonl") or path.endswith(".json"):
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_no, RowError(f"invalid JSON ({e})")
+                    continue
+                if not isinstance(record, dict):
+                    yield line_no, RowError("expected a JSON object")
+                    continue
+                yield line_no, record
+        else:
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+
+
+def _optional_number(record, key, cast, low, high):
+    value = record.get(key)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        number = cast(value)
+    except (TypeError, ValueError):
+        raise RowError(f"{key} is not a number: {value!r}")
+    if not low <= number <= high:
+        raise RowError(f"{key} out of range ({low}-{high}): {number}")
+    return number
+
+
+def parse_record(record):
+    # Validate one reading; returns (email, row dict without member_id)
+    # emails match case-insensitively, as everywhere else in the app
+    email = (record.get("email") or "").strip().lower()
+    if not email:
+        raise RowError("email is required")
+
+    recorded_at = record.get("recorded_at")
+    if not recorded_at:
+        raise RowError("recorded_at is required")
+    try:
+        recorded_at = datetime.fromisoformat(str(recorded_at).strip())
+    except ValueError:
+        raise RowError(f"recorded_at is not an ISO datetime: {recorded_at!r}")
+    if recorded_at.tzinfo is not None:
+        # stored naive in UTC, like every other timestamp
+        recorded_at = recorded_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+    row = dict(
+        recorded_at=recorded_at,
+        weight=_optional_number(record, "weight", float, 1, 500),
+        heart_rate=_optional_number(record, "heart_rate", lambda v: int(float(v)), 20, 250),
+        body_fat_pct=_optional_number(record, "body_fat_pct", float, 0, 100),
+        notes=(record.get("notes") or "").strip() or None,
+    )
+    if row["weight"] is None and row["heart_rate"] is None and row["body_fat_pct"] is None:
+        raise RowError("no weight, heart_rate or body_fat_pct given")
+    return email, row
+
+
+def resolve_emails(connection, emails, cache):
+    # emails are already lowercased (parse_record); stored ones may not be
+    missing = [e for e in emails if e not in cache]
+    if not missing:
+        return
+    if len(cache) + len(missing) > EMAIL_CACHE_LIMIT:
+        cache.clear()
+    result = connection.execute(
+        select(func.lower(Member.email), Member.member_id).where(func.lower(Member.email).in_(missing))
+    )
+    for email, member_id in result:
+        cache[email] = member_id
+    for email in missing:
+        cache.setdefault(email, None)
+
+
+def copy_rows(connection, rows, table: str = "health_metrics", columns=COPY_COLUMNS):
+    # PostgreSQL COPY FROM STDIN of one batch (empty fields load as NULL)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row[c] is None else row[c] for c in columns])
+    buffer.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def insert_rows(connection, rows):
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+        copy_rows(connection, rows)
+    else:
+        connection.execute(insert(HealthMetric.__table__), rows)
+
+
+def load_batch(batch, cache, report):
+    # batch: [(line number, email, row)]; one transaction per batch
+    with engine.begin() as connection:
+        resolve_emails(connection, {email for _, email, _ in batch}, cache)
+        rows = []
+        for line_no, email, row in batch:
+            member_id = cache.get(email)
+            if member_id is None:
+                report(line_no, f"unknown member email {email!r}")
+                continue
+            row["member_id"] = member_id
+            rows.append(row)
+        if rows:
+            insert_rows(connection, rows)
+            # COPY / executemany skip the ORM insert hook; fold into rollups here
+            apply_metric_rows(connection, rows)
+    return rows
+
+
+def import_metrics(path: str, batch_size: int = 5000, report=None):
+    # Returns (rows imported, rows rejected)
+    rejected = 0
+
+    def _report(line_no, message):
+        nonlocal rejected
+        rejected += 1
+        if report:
+            report(line_no, message)
+
+    imported = 0
+    cache = {}
+    batch = []
+    for line_no, record in read_records(path):
+        try:
+            if isinstance(record, RowError):
+                raise record
+            email, row = parse_record(record)
+        except RowError as e:
+            _report(line_no, str(e))
+            continue
+        batch.append((line_no, email, row))
+        if len(batch) >= batch_size:
+            imported += len(load_batch(batch, cache, _report))
+            batch = []
+    if batch:
+        imported += len(load_batch(batch, cache, _report))
+    return imported, rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import health metrics from CSV / JSONL")
+    parser.add_argument("path", help="CSV file with a header row, or .jsonl")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    def report(line_no, message):
+        print(f"line {line_no}: {message}", file=sys.stderr)
+
+    imported, rejected = import_metrics(args.path, args.batch_size, report)
+    print(f"Imported {imported} health metrics ({rejected} rows rejected).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# app/occupancy.py
+"""
+Room occupancy heatmaps from the hourly buckets
+
+Heatmaps are read straight from room_occupancy_hourly (kept up to date on
+every booking change, see models/room_occupancy.py): one row per room and
+day, 24 hourly cells each. `booked` is the share of the hour the room is
+booked, `seats` the seats taken versus Room.capacity over that hour.
+`rebuild` recomputes the buckets from the live bookings, archived ones
+included (first install, after bulk loads or data fixes). Run from project root:
+
+    python3 -m app.occupancy week 2025-03-03              # week containing that day
+    python3 -m app.occupancy month 2025-03 --room-id 2
+    python3 -m app.occupancy month 2025-03 --json
+    python3 -m app.occupancy rebuild
+"""
+
+import argparse
+import calendar
+import json
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import List, NamedTuple
+
+from sqlalchemy import delete, select
+
+from app.db import session_scope
+from models import engine, Room, RoomOccupancyHourly
+from models.archive import booking_rows
+from models.room_occupancy import apply_bookings
+
+OPEN_HOURS = range(6, 22)   # hours counted when looking for idle time
+BUSY_PCT = 90               # a cell at or above this is "full"
+REBUILD_BATCH = 5000
+
+
+class RoomHeatmap(NamedTuple):
+    room_id: int
+    room_name: str
+    capacity: int
+    first_day: date
+    booked: List[List[float]]   # [day][hour] % of the hour booked
+    seats: List[List[float]]    # [day][hour] % of room capacity taken
+    booked_hours: float
+    utilization_pct: float      # booked share of the open hours
+    idle_hours: int             # open hours with no booking
+    full_hours: int             # hours booked at least BUSY_PCT %
+
+
+def heatmap(session, first_day: date, days: int, room_id: int = None) -> List[RoomHeatmap]:
+    # One bucket range scan plus the room list; rooms without bookings
+    # get an all-zero map
+    start = datetime.combine(first_day, datetime.min.time())
+    end = start + timedelta(days=days)
+    rooms = select(Room.room_id, Room.room_name, Room.capacity).order_by(Room.room_id)
+    buckets = select(
+        RoomOccupancyHourly.room_id,
+        RoomOccupancyHourly.hour_start,
+        RoomOccupancyHourly.booked_minutes,
+        RoomOccupancyHourly.seat_minutes,
+    ).where(RoomOccupancyHourly.hour_start >= start, RoomOccupancyHourly.hour_start < end)
+    if room_id is not None:
+        rooms = rooms.where(Room.room_id == room_id)
+        buckets = buckets.where(RoomOccupancyHourly.room_id == room_id)
+
+    cells = defaultdict(dict)
+    for r_id, hour_start, booked_minutes, seat_minutes in session.execute(buckets):
+        cells[r_id][hour_start] = (booked_minutes, seat_minutes)
+
+    maps = []
+    open_hours = days * len(OPEN_HOURS)
+    for r_id, room_name, capacity in session.execute(rooms):
+        booked = [[0.0] * 24 for _ in range(days)]
+        seats = [[0.0] * 24 for _ in range(days)]
+        total = open_booked = 0.0
+        idle = full = 0
+        for day in range(days):
+            for hour in range(24):
+                minutes, seat_minutes = cells[r_id].get(
+                    start + timedelta(days=day, hours=hour), (0.0, 0.0)
+                )
+                booked[day][hour] = round(100 * minutes / 60, 1)
+                seats[day][hour] = round(100 * seat_minutes / (60 * capacity), 1) if capacity else 0.0
+                total += minutes
+                if hour in OPEN_HOURS:
+                    open_booked += minutes
+                    idle += minutes == 0
+                full += booked[day][hour] >= BUSY_PCT
+        maps.append(RoomHeatmap(
+            room_id=r_id, room_name=room_name, capacity=capacity, first_day=first_day,
+            booked=booked, seats=seats, booked_hours=round(total / 60, 2),
+            utilization_pct=round(100 * open_booked / (open_hours * 60), 1) if open_hours else 0.0,
+            idle_hours=idle, full_hours=full,
+        ))
+    return maps
+
+
+def week_heatmap(session, day: date, room_id: int = None):
+    # Monday to Sunday of the week containing `day`
+    return heatmap(session, day - timedelta(days=day.weekday()), 7, room_id)
+
+
+def month_heatmap(session, year: int, month: int, room_id: int = None):
+    return heatmap(session, date(year, month, 1), calendar.monthrange(year, month)[1], room_id)
+
+
+def rebuild_occupancy(connection, include_archive: bool = True):
+    # Recompute every bucket from the live bookings, archived ones included
+    # unless include_archive=False (migration m007 runs before m010 creates
+    # the archive tables); a class takes a seat per registered member, a PT
+    # session one
+    connection.execute(delete(RoomOccupancyHourly))
+    bookings = booking_rows(include_archive=include_archive).subquery()
+    # streaming is set on the statement: Connection.execution_options()
+    # would keep it for the upserts below, which psycopg2 can't run on a
+    # server-side cursor
+    rows = connection.execute(
+        select(bookings.c.room_id, bookings.c.start_time, bookings.c.end_time, bookings.c.seats)
+        .order_by(bookings.c.room_id, bookings.c.start_time)
+        .execution_options(yield_per=REBUILD_BATCH)
+    )
+    # bookings are sorted, so a batch only shares its edge hours with the
+    # next one; the additive upsert merges those
+    for batch in rows.partitions():
+        apply_bookings(connection, [row._asdict() for row in batch])
+
+
+# Text rendering
+
+SHADES = " .:-=+*#%@"
+
+
+def _shade(pct: float) -> str:
+    return SHADES[min(int(pct / 100 * (len(SHADES) - 1) + 0.5), len(SHADES) - 1)] if pct > 0 else SHADES[0]
+
+
+def render(m: RoomHeatmap) -> str:
+    lines = [
+        f"{m.room_name} (room {m.room_id}, capacity {m.capacity}): {m.booked_hours} h booked, "
+        f"{m.utilization_pct}% of open hours, {m.idle_hours} idle open hours, {m.full_hours} full hours",
+        "            " + "".join(f"{h:<3}" for h in range(0, 24, 3)).rstrip(),
+    ]
+    for n, row in enumerate(m.booked):
+        day = m.first_day + timedelta(days=n)
+        lines.append(f"{day:%a %Y-%m-%d} " + "".join(_shade(pct) for pct in row))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Room occupancy heatmaps")
+    sub = parser.add_subparsers(dest="command", required=True)
+    week = sub.add_parser("week", help="week containing DAY (YYYY-MM-DD)")
+    week.add_argument("day", type=date.fromisoformat)
+    month = sub.add_parser("month", help="calendar month (YYYY-MM)")
+    month.add_argument("month", type=lambda v: datetime.strptime(v, "%Y-%m").date())
+    for p in (week, month):
+        p.add_argument("--room-id", type=int)
+        p.add_argument("--json", action="store_true", help="print the cells as JSON")
+    sub.add_parser("rebuild", help="recompute all buckets from the live bookings")
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        with engine.begin() as connection:
+            rebuild_occupancy(connection)
+        print("Room occupancy rebuilt.")
+        return
+
+    with session_scope() as session:
+        if args.command == "week":
+            maps = week_heatmap(session, args.day, args.room_id)
+        else:
+            maps = month_heatmap(session, args.month.year, args.month.month, args.room_id)
+
+    if args.json:
+        print(json.dumps([dict(m._asdict(), first_day=m.first_day.isoformat()) for m in maps], indent=2))
+    else:
+        print(f"Booked share of each hour: '{SHADES[1]}' light ... '{SHADES[-1]}' fully booked\n")
+        print("\n\n".join(render(m) for m in maps))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# app/operations.py
+# Registry of the service operations that can be run without a terminal
+# (batch runner, API server). Each entry names a service function called as
+# run(session, **args), how to turn its return value into JSON-able data and
+# which arguments arrive as ISO date / time strings.
+from datetime import date, datetime
+from datetime import time as clock
+from decimal import Decimal
+import inspect
+from typing import Callable, NamedTuple
+
+from app.errors import NotFound
+from app.dashboard import fetch_dashboard
+from app.health_history import fetch_health_page
+from app.registration_service import upcoming_classes
+from app.occupancy import heatmap
+from app.workload import current_workload
+from app.member_service import (
+    require_member,
+    create_member,
+    update_member_profile,
+    record_health_metric,
+    book_pt_slot,
+    join_class,
+    leave_class,
+    booking_history,
+    free_pt_slots,
+)
+from app.trainer_service import add_availability, trainer_schedule
+from app.admin_service import (
+    create_class,
+    schedule_class_series,
+    report_equipment_issue,
+    recent_maintenance,
+    set_maintenance_status,
+    maintenance_queue,
+    claim_next_issue,
+)
+
+
+class Operation(NamedTuple):
+    run: Callable                 # service function, called as run(session, **args)
+    result: Callable              # return value -> JSON-able result
+    parse: dict = {}              # argument name -> converter for ISO strings
+    member_changed: bool = False  # drop the member's identity cache entry after commit
+    read_only: bool = False
+
+
+def plain(value):
+    # NamedTuples / dates / Decimals -> JSON-able values
+    if hasattr(value, "_asdict"):
+        return {k: plain(v) for k, v in value._asdict().items()}
+    if isinstance(value, (list, tuple)):
+        return [plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: plain(v) for k, v in value.items()}
+    if isinstance(value, (date, datetime, clock)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+# Read-only adapters over the query helpers
+
+def _dashboard(session, email):
+    data = fetch_dashboard(session, email)
+    if data is None:
+        raise NotFound("Member not found.")
+    return data
+
+
+def _health_history(session, email, cursor=None, page_size: int = 20):
+    member = require_member(session, email)
+    metrics, next_cursor = fetch_health_page(session, member.member_id, cursor, page_size)
+    return metrics, next_cursor
+
+
+def _metric(m):
+    return dict(
+        metric_id=m.metric_id, recorded_at=plain(m.recorded_at), weight=plain(m.weight),
+        heart_rate=m.heart_rate, body_fat_pct=plain(m.body_fat_pct), notes=m.notes,
+    )
+
+
+def _booking(b):
+    # PT session or class, with its (eagerly loaded) room
+    return dict(
+        start_time=plain(b.start_time), end_time=plain(b.end_time), status=b.status,
+        room_id=b.room_id, room_name=b.room.room_name if b.room else None,
+    )
+
+
+def _schedule(r):
+    trainer, pt_sessions, classes = r
+    return dict(
+        trainer=plain(trainer),
+        sessions=[dict(_booking(s), session_id=s.session_id, member_id=s.member_id) for s in pt_sessions],
+        classes=[dict(_booking(c), class_id=c.class_id, class_name=c.class_name) for c in classes],
+    )
+
+
+OPERATIONS = {
+    # member
+    "register_member": Operation(
+        create_member,
+        lambda m: dict(member_id=m.member_id),
+        parse=dict(date_of_birth=date.fromisoformat),
+        member_changed=True,
+    ),
+    "update_profile": Operation(
+        update_member_profile,
+        lambda m: dict(member_id=m.member_id),
+        parse=dict(date_of_birth=date.fromisoformat),
+        member_changed=True,
+    ),
+    "add_health_metric": Operation(
+        record_health_metric,
+        lambda m: dict(metric_id=m.metric_id),
+        parse=dict(recorded_at=datetime.fromisoformat),
+    ),
+    "book_pt_session": Operation(
+        book_pt_slot,
+        lambda s: dict(session_id=s.session_id),
+        parse=dict(start_time=datetime.fromisoformat),
+    ),
+    "register_for_class": Operation(
+        join_class,
+        lambda r: dict(outcome=r[0]),
+    ),
+    "cancel_registration": Operation(
+        leave_class,
+        lambda promoted: dict(promoted_member_id=promoted.member_id if promoted else None),
+    ),
+    "dashboard": Operation(_dashboard, plain, read_only=True),
+    "health_history": Operation(
+        _health_history,
+        lambda r: dict(metrics=[_metric(m) for m in r[0]], next_cursor=r[1]),
+        read_only=True,
+    ),
+    "free_pt_slots": Operation(free_pt_slots, plain, read_only=True),
+    "booking_history": Operation(booking_history, plain, read_only=True),
+    "upcoming_classes": Operation(
+        upcoming_classes,
+        lambda classes: [
+            dict(class_id=c.class_id, class_name=c.class_name, start_time=plain(c.start_time),
+                 end_time=plain(c.end_time), capacity=c.capacity, registered_count=c.registered_count)
+            for c in classes
+        ],
+        read_only=True,
+    ),
+    # trainer
+    "set_availability": Operation(
+        add_availability,
+        lambda a: dict(availability_id=a.availability_id),
+        parse=dict(start_time=clock.fromisoformat, end_time=clock.fromisoformat,
+                   available_on=date.fromisoformat),
+    ),
+    "trainer_schedule": Operation(
+        trainer_schedule, _schedule, parse=dict(now=datetime.fromisoformat), read_only=True
+    ),
+    # admin
+    "create_class": Operation(
+        create_class,
+        lambda c: dict(class_id=c.class_id),
+        parse=dict(start_time=datetime.fromisoformat, end_time=datetime.fromisoformat),
+    ),
+    "create_class_series": Operation(
+        schedule_class_series,
+        lambda r: dict(class_ids=r[0], skipped=len(r[1])),
+        parse=dict(
+            start_clock=clock.fromisoformat,
+            first_date=date.fromisoformat,
+            last_date=date.fromisoformat,
+        ),
+    ),
+    "log_equipment_issue": Operation(
+        report_equipment_issue,
+        lambda m: dict(maintenance_id=m.maintenance_id),
+    ),
+    "room_heatmap": Operation(
+        heatmap, plain, parse=dict(first_day=date.fromisoformat), read_only=True
+    ),
+    # refreshes the requested weeks' stale summary rows before reading them
+    "trainer_workload": Operation(current_workload, plain, parse=dict(week_start=date.fromisoformat)),
+    "maintenance_records": Operation(
+        recent_maintenance,
+        lambda records: [
+            dict(maintenance_id=m.maintenance_id, equipment_id=m.equipment_id,
+                 equipment_name=m.equipment.equipment_name if m.equipment else None,
+                 status=m.status, reported_at=plain(m.reported_at))
+            for m in records
+        ],
+        read_only=True,
+    ),
+    "maintenance_queue": Operation(
+        maintenance_queue,
+        lambda records: [
+            dict(maintenance_id=m.maintenance_id, equipment_id=m.equipment_id,
+                 equipment_name=m.equipment.equipment_name if m.equipment else None,
+                 priority=m.priority, status=m.status, reported_at=plain(m.reported_at))
+            for m in records
+        ],
+        read_only=True,
+    ),
+    "claim_maintenance": Operation(
+        claim_next_issue,
+        lambda m: dict(maintenance_id=m.maintenance_id, equipment_id=m.equipment_id,
+                       priority=m.priority, issue_description=m.issue_description),
+    ),
+    "update_maintenance": Operation(
+        set_maintenance_status,
+        lambda m: dict(maintenance_id=m.maintenance_id, status=m.status),
+    ),
+}
+
+
+def prepare(name, args):
+    # (Operation, converted arguments); ValueError describes a bad request
+    spec = OPERATIONS.get(name)
+    if spec is None:
+        raise ValueError(f"unknown operation: {name!r}")
+    if args is None:
+        args = {}
+    if not isinstance(args, dict):
+        raise ValueError("args must be a JSON object")
+    args = dict(args)
+    for key, convert in spec.parse.items():
+        if args.get(key) is None:
+            continue
+        if not isinstance(args[key], str):
+            raise ValueError(f"{key}: expected an ISO date/time string, got {args[key]!r}")
+        try:
+            args[key] = convert(args[key])
+        except ValueError:
+            raise ValueError(f"{key}: not an ISO date/time: {args[key]!r}")
+    signature = inspect.signature(spec.run)
+    try:
+        signature.bind(None, **args)
+    except TypeError as e:
+        raise ValueError(f"bad arguments for {name}: {e}")
+    for key, value in args.items():
+        if key not in spec.parse:
+            args[key] = _coerce(key, value, signature.parameters[key].annotation)
+    return spec, args
+
+
+def _coerce(key, value, annotation):
+    # JSON numbers / numeric strings for int and float parameters; anything
+    # else annotated as a number is rejected here rather than in the service
+    if value is None or annotation not in (int, float):
+        return value
+    if isinstance(value, bool):
+        raise ValueError(f"{key}: expected a number, got {value!r}")
+    if annotation is int and isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, annotation) or (annotation is float and isinstance(value, int)):
+        return value
+    if isinstance(value, str):
+        try:
+            return annotation(value.strip())
+        except ValueError:
+            pass
+    kind = "an integer" if annotation is int else "a number"
+    raise ValueError(f"{key}: expected {kind}, got {value!r}")
@@ -0,0 +1,76 @@
+# app/partitions.py
+"""
+Monthly health_metrics partitions on PostgreSQL
+
+health_metrics is range-partitioned by recorded_at (see
+models/partitioning.py), so member history queries only touch the months
+they ask for. `ensure` creates partitions up to a few months ahead; nothing
+on the write path does, so run it daily from cron (docs/README.md). Rows
+with no partition yet land in the DEFAULT partition and are moved out, with
+writes into DEFAULT held, when theirs is created. `retain` detaches
+months older than the retention window; a detached month stays a plain
+table (or moves to the archive schema with --archive) and the daily / weekly
+rollups keep its summaries. Run from project root:
+
+    python3 -m app.partitions list
+    python3 -m app.partitions ensure --ahead 3
+    python3 -m app.partitions ensure --from 2023-01        # backfill older months
+    python3 -m app.partitions retain --keep-months 24 --archive
+"""
+
+import argparse
+from datetime import datetime
+
+from models import engine, HealthMetric
+from models.partitioning import (
+    create_partition,
+    detach_partitions,
+    is_partitioned,
+    list_partitions,
+    partition_months,
+    partition_name,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monthly health_metrics partitions (PostgreSQL)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="show the partitions and their bounds")
+    ensure = sub.add_parser("ensure", help="create missing monthly partitions")
+    ensure.add_argument("--from", dest="first", type=lambda v: datetime.strptime(v, "%Y-%m").date(),
+                        help="first month YYYY-MM (default: this month)")
+    ensure.add_argument("--ahead", type=int, default=3, help="months past the current one (default 3)")
+    retain = sub.add_parser("retain", help="detach months older than the retention window")
+    retain.add_argument("--keep-months", type=int, required=True, help="months kept, this one included")
+    retain.add_argument("--archive", action="store_true", help="move detached months to the archive schema")
+    args = parser.parse_args()
+
+    if args.command == "ensure" and args.ahead < 0:
+        parser.error("--ahead must not be negative")
+    if args.command == "retain" and args.keep_months <= 0:
+        parser.error("--keep-months must be positive")
+
+    table = HealthMetric.__table__
+    with engine.begin() as connection:
+        if connection.dialect.name != "postgresql" or not is_partitioned(connection, table):
+            raise SystemExit("health_metrics is not partitioned (PostgreSQL only; run python3 migrate_db.py).")
+
+        if args.command == "list":
+            for name, bound in list_partitions(connection, table):
+                print(f"{name:<32} {bound}")
+        elif args.command == "retain":
+            detached = detach_partitions(connection, table, args.keep_months, args.archive)
+            print(f"{len(detached)} partitions detached" + (": " + ", ".join(detached) if detached else "."))
+
+    if args.command == "ensure":
+        # one short transaction per month: creating a partition holds up
+        # writes into DEFAULT until it commits
+        created = []
+        for month in partition_months(args.first, args.ahead):
+            with engine.begin() as connection:
+                if create_partition(connection, table, month):
+                    created.append(partition_name(table, month))
+        print(f"{len(created)} partitions created" + (": " + ", ".join(created) if created else "."))
+
+if __name__ == "__main__":
+    main()
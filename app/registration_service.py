@@ -0,0 +1,173 @@
+# app/registration_service.py
+# Class sign-up with capacity enforcement and a waitlist.
+#
+# Seats are claimed with one conditional UPDATE on classes.registered_count
+# (no count(*) per request), so concurrent sign-ups for a popular class only
+# hold the class row for the length of their own short transaction and can
+# never push the count past capacity. When a class is full the member joins
+# an ordered waitlist; cancelling a seat promotes the earliest waitlisted
+# member, or frees the seat if nobody is waiting.
+from datetime import datetime
+
+from sqlalchemy import update, func
+
+from models.fitness_class import FitnessClass
+from models.class_registration import ClassRegistration
+from models.room_occupancy import apply_seats
+
+# Registration states that hold a seat / a waitlist place
+SEATED = ("registered", "attended")
+ACTIVE = ("registered", "waitlisted", "attended")
+
+
+def _claim_seat(session, class_id, now) -> bool:
+    result = session.execute(
+        update(FitnessClass)
+        .where(
+            FitnessClass.class_id == class_id,
+            FitnessClass.status == "scheduled",
+            FitnessClass.start_time > now,
+            FitnessClass.registered_count < FitnessClass.capacity,
+        )
+        .values(registered_count=FitnessClass.registered_count + 1)
+        .returning(FitnessClass.room_id, FitnessClass.start_time, FitnessClass.end_time, FitnessClass.status)
+        .execution_options(synchronize_session=False)
+    )
+    claimed = result.first()
+    if claimed is None:
+        return False
+    apply_seats(session.connection(), claimed, 1)
+    return True
+
+
+def _lock_class(session, class_id):
+    return (
+        session.query(FitnessClass)
+        .filter(FitnessClass.class_id == class_id)
+        .with_for_update()
+        .first()
+    )
+
+
+def register_for_class(session, member_id: int, class_id: int):
+    # Returns (outcome, registration). outcome is one of "registered",
+    # "waitlisted", "already_registered", "already_waitlisted", "unavailable".
+    # The caller commits.
+    now = datetime.utcnow()
+    existing = (
+        session.query(ClassRegistration)
+        .filter_by(class_id=class_id, member_id=member_id)
+        .first()
+    )
+    if existing is not None and existing.attendance_status in ACTIVE:
+        if existing.attendance_status == "waitlisted":
+            return "already_waitlisted", existing
+        return "already_registered", existing
+
+    if _claim_seat(session, class_id, now):
+        outcome = "registered"
+    else:
+        # Full (or not open). Re-check under the class row lock so a seat
+        # freed by a concurrent cancellation can't be missed while we join
+        # the waitlist.
+        fitness_class = _lock_class(session, class_id)
+        if (
+            fitness_class is None
+            or fitness_class.status != "scheduled"
+            or fitness_class.start_time <= now
+        ):
+            return "unavailable", None
+        outcome = "registered" if _claim_seat(session, class_id, now) else "waitlisted"
+
+    if existing is not None:
+        # re-joining after a cancellation reuses the (class, member) row
+        existing.attendance_status = outcome
+        existing.registered_at = now
+        registration = existing
+    else:
+        registration = ClassRegistration(
+            class_id=class_id,
+            member_id=member_id,
+            registered_at=now,
+            attendance_status=outcome,
+        )
+        session.add(registration)
+    session.flush()
+    return outcome, registration
+
+
+def cancel_registration(session, member_id: int, class_id: int):
+    # Returns (cancelled registration or None, promoted registration or None).
+    # The caller commits.
+    fitness_class = _lock_class(session, class_id)
+    if fitness_class is None:
+        return None, None
+
+    registration = (
+        session.query(ClassRegistration)
+        .filter(
+            ClassRegistration.class_id == class_id,
+            ClassRegistration.member_id == member_id,
+            ClassRegistration.attendance_status.in_(("registered", "waitlisted")),
+        )
+        .first()
+    )
+    if registration is None:
+        return None, None
+
+    held_seat = registration.attendance_status == "registered"
+    registration.attendance_status = "cancelled"
+    if not held_seat:
+        session.flush()
+        return registration, None
+
+    promoted = (
+        session.query(ClassRegistration)
+        .filter(
+            ClassRegistration.class_id == class_id,
+            ClassRegistration.attendance_status == "waitlisted",
+        )
+        .order_by(ClassRegistration.registered_at, ClassRegistration.registration_id)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if promoted is not None:
+        # seat passes straight to the next member; count is unchanged
+        promoted.attendance_status = "registered"
+    else:
+        fitness_class.registered_count = FitnessClass.registered_count - 1
+        apply_seats(session.connection(), fitness_class, -1)
+    session.flush()
+    return registration, promoted
+
+
+def waitlist_position(session, registration) -> int:
+    # 1-based place in the class waitlist
+    ahead = (
+        session.query(func.count(ClassRegistration.registration_id))
+        .filter(
+            ClassRegistration.class_id == registration.class_id,
+            ClassRegistration.attendance_status == "waitlisted",
+            (ClassRegistration.registered_at < registration.registered_at)
+            | (
+                (ClassRegistration.registered_at == registration.registered_at)
+                & (ClassRegistration.registration_id < registration.registration_id)
+            ),
+        )
+        .scalar()
+    )
+    return ahead + 1
+
+
+def upcoming_classes(session, limit: int = 20):
+    # Scheduled classes that haven't started, soonest first
+    return (
+        session.query(FitnessClass)
+        .filter(
+            FitnessClass.status == "scheduled",
+            FitnessClass.start_time > datetime.utcnow(),
+        )
+        .order_by(FitnessClass.start_time)
+        .limit(limit)
+        .all()
+    )
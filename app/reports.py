@@ -0,0 +1,313 @@
+# app/reports.py
+"""
+Admin reports over a date range: room utilization, trainer hours, class
+fill rate and maintenance downtime
+
+The range is cut into date partitions and each partition is aggregated by a
+worker process (or thread) on its own database connection. Workers return
+small partial sums keyed by room / trainer / class name / equipment, which
+are merged and turned into rates here. A booking or issue belongs to the
+partition its start (reported_at) falls in, so nothing is counted twice;
+bookings are the live (non-cancelled) classes and PT sessions, from
+booking_intervals and the archive tables. Run from project root:
+
+    python3 -m app.reports --from 2025-01-01 --to 2026-01-01
+    python3 -m app.reports --from 2025-01-01 --to 2026-01-01 --format csv --output reports/
+    python3 -m app.reports --threads --workers 4       # last 365 days, thread pool
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Float, DateTime, case, func, literal, select, union_all
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+from models import (
+    engine,
+    BookingInterval,
+    ClassRegistration,
+    Equipment,
+    EquipmentMaintenance,
+    FitnessClass,
+    Room,
+    Trainer,
+)
+from models.archive import ArchivedClass, ArchivedClassRegistration, booking_rows
+
+OPEN_HOURS = 16   # bookable hours per room per day, for utilization
+
+SECTIONS = ("room_utilization", "trainer_hours", "class_fill_rate", "maintenance_downtime")
+
+
+# Portable duration in minutes (PostgreSQL / SQLite)
+
+class minutes_between(FunctionElement):
+    # minutes_between(start, end)
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(minutes_between)
+def _minutes_between_default(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return "((julianday(%s) - julianday(%s)) * 1440.0)" % (
+        compiler.process(end, **kw), compiler.process(start, **kw)
+    )
+
+
+@compiles(minutes_between, "postgresql")
+def _minutes_between_pg(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return "(EXTRACT(EPOCH FROM (%s - %s)) / 60.0)" % (
+        compiler.process(end, **kw), compiler.process(start, **kw)
+    )
+
+
+def split_period(start: datetime, end: datetime, parts: int):
+    # [(start, end), ...] of roughly equal width, whole days, covering the range
+    days = max((end - start).days, 1)
+    parts = max(1, min(parts, days))
+    bounds = [start + timedelta(days=days * n // parts) for n in range(parts)] + [end]
+    return list(zip(bounds, bounds[1:]))
+
+
+# Partition worker
+
+def _in_range(column, start, end):
+    return (column >= start) & (column < end)
+
+
+def partition_aggregates(start: datetime, end: datetime, period_end: datetime):
+    # Partial sums for one partition, as plain dicts so they pickle cheaply
+    # the range filter is applied inside each (hot / archive) branch
+    bi = booking_rows(start, end).subquery()
+    minutes = minutes_between(bi.c.start_time, bi.c.end_time)
+    kind = case((bi.c.class_id.is_(None), "pt"), else_="class")
+
+    def class_rows(c, r):
+        attended = (
+            select(func.count())
+            .where(r.class_id == c.class_id, r.attendance_status == "attended")
+            .scalar_subquery()
+        )
+        return select(c.class_name, c.capacity, c.registered_count, attended.label("attended"))
+
+    # live hot classes are the ones with a booking interval
+    hot = (
+        class_rows(FitnessClass, ClassRegistration)
+        .join(BookingInterval, BookingInterval.class_id == FitnessClass.class_id)
+        .where(_in_range(BookingInterval.start_time, start, end))
+    )
+    archived = class_rows(ArchivedClass, ArchivedClassRegistration).where(
+        ArchivedClass.status != "cancelled", _in_range(ArchivedClass.start_time, start, end)
+    )
+    classes = union_all(hot, archived).subquery()
+
+    # open issues are down until the end of the report (or now)
+    down_until = case(
+        (
+            (EquipmentMaintenance.resolved_at.is_(None))
+            | (EquipmentMaintenance.resolved_at > period_end),
+            literal(period_end, DateTime),
+        ),
+        else_=EquipmentMaintenance.resolved_at,
+    )
+
+    result = {}
+    with engine.connect() as connection:
+        result["room_utilization"] = {
+            room_id: [bookings, float(total or 0)]
+            for room_id, bookings, total in connection.execute(
+                select(bi.c.room_id, func.count(), func.sum(minutes)).group_by(bi.c.room_id)
+            )
+        }
+
+        trainers = defaultdict(lambda: [0, 0.0, 0, 0.0])
+        for trainer_id, booking_kind, count, total in connection.execute(
+            select(bi.c.trainer_id, kind, func.count(), func.sum(minutes)).group_by(bi.c.trainer_id, kind)
+        ):
+            offset = 0 if booking_kind == "class" else 2
+            trainers[trainer_id][offset] += count
+            trainers[trainer_id][offset + 1] += float(total or 0)
+        result["trainer_hours"] = dict(trainers)
+
+        result["class_fill_rate"] = {
+            name: [count, capacity or 0, seats or 0, attended_count or 0]
+            for name, count, capacity, seats, attended_count in connection.execute(
+                select(
+                    classes.c.class_name,
+                    func.count(),
+                    func.sum(classes.c.capacity),
+                    func.sum(classes.c.registered_count),
+                    func.sum(classes.c.attended),
+                ).group_by(classes.c.class_name)
+            )
+        }
+
+        result["maintenance_downtime"] = {
+            equipment_id: [issues, unresolved or 0, float(total or 0)]
+            for equipment_id, issues, unresolved, total in connection.execute(
+                select(
+                    EquipmentMaintenance.equipment_id,
+                    func.count(),
+                    func.sum(case((EquipmentMaintenance.status != "resolved", 1), else_=0)),
+                    func.sum(minutes_between(EquipmentMaintenance.reported_at, down_until)),
+                )
+                .where(_in_range(EquipmentMaintenance.reported_at, start, end))
+                .group_by(EquipmentMaintenance.equipment_id)
+            )
+        }
+    return result
+
+
+def _init_worker():
+    # A forked worker must not reuse the parent's pooled connections
+    engine.dispose(close=False)
+
+
+def merge(partials):
+    # Element-wise sum of the per-key lists from every partition
+    merged = {section: {} for section in SECTIONS}
+    for partial in partials:
+        for section, rows in partial.items():
+            target = merged[section]
+            for key, values in rows.items():
+                if key in target:
+                    target[key] = [a + b for a, b in zip(target[key], values)]
+                else:
+                    target[key] = list(values)
+    return merged
+
+
+# Final rows
+
+def _pct(part, whole):
+    return round(100.0 * part / whole, 1) if whole else None
+
+
+def build_report(merged, start: datetime, end: datetime, open_hours: float = OPEN_HOURS):
+    with engine.connect() as connection:
+        rooms = dict(connection.execute(select(Room.room_id, Room.room_name)).all())
+        trainers = {
+            t.trainer_id: f"{t.first_name} {t.last_name}"
+            for t in connection.execute(select(Trainer.trainer_id, Trainer.first_name, Trainer.last_name))
+        }
+        equipment = dict(connection.execute(select(Equipment.equipment_id, Equipment.equipment_name)).all())
+
+    open_minutes = (end - start).total_seconds() / 60 * open_hours / 24
+    report = {}
+    report["room_utilization"] = [
+        dict(room_id=room_id, room_name=room_name, bookings=bookings,
+             booked_hours=round(minutes / 60, 2), utilization_pct=_pct(minutes, open_minutes))
+        for room_id, room_name in sorted(rooms.items())
+        for bookings, minutes in [merged["room_utilization"].get(room_id, (0, 0.0))]
+    ]
+    report["trainer_hours"] = [
+        dict(trainer_id=trainer_id, trainer_name=name, classes=c[0],
+             class_hours=round(c[1] / 60, 2), pt_sessions=c[2], pt_hours=round(c[3] / 60, 2),
+             total_hours=round((c[1] + c[3]) / 60, 2))
+        for trainer_id, name in sorted(trainers.items())
+        for c in [merged["trainer_hours"].get(trainer_id, (0, 0.0, 0, 0.0))]
+    ]
+    report["class_fill_rate"] = [
+        dict(class_name=name, classes=count, capacity=capacity, seats_taken=seats,
+             attended=attended, fill_rate_pct=_pct(seats, capacity),
+             attendance_pct=_pct(attended, capacity))
+        for name, (count, capacity, seats, attended) in sorted(merged["class_fill_rate"].items())
+    ]
+    report["maintenance_downtime"] = [
+        dict(equipment_id=equipment_id, equipment_name=equipment.get(equipment_id),
+             issues=issues, unresolved=unresolved, downtime_hours=round(minutes / 60, 2),
+             avg_hours_per_issue=round(minutes / 60 / issues, 2))
+        for equipment_id, (issues, unresolved, minutes) in sorted(merged["maintenance_downtime"].items())
+    ]
+    return report
+
+
+def run_reports(start: datetime, end: datetime, workers: int = None, threads: bool = False,
+                partitions: int = None, open_hours: float = OPEN_HOURS):
+    workers = workers or os.cpu_count() or 1
+    # a few partitions per worker keeps every worker busy to the end
+    ranges = split_period(start, end, partitions or workers * 4)
+    period_end = min(end, datetime.utcnow())
+    if threads:
+        pool = ThreadPoolExecutor(max_workers=workers)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    with pool:
+        partials = pool.map(
+            partition_aggregates,
+            [s for s, _ in ranges],
+            [e for _, e in ranges],
+            [period_end] * len(ranges),
+        )
+        merged = merge(partials)
+    return build_report(merged, start, end, open_hours), len(ranges)
+
+
+def write_csv(report, directory: str):
+    os.makedirs(directory, exist_ok=True)
+    for section in SECTIONS:
+        rows = report[section]
+        path = os.path.join(directory, f"{section}.csv")
+        with open(path, "w", newline="", encoding="utf-8") as out:
+            if not rows:
+                continue
+            writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def _day(value: str) -> datetime:
+    return datetime.combine(date.fromisoformat(value), datetime.min.time())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Room, trainer, class and maintenance reports")
+    parser.add_argument("--from", dest="start", type=_day, help="first day (default: a year ago)")
+    parser.add_argument("--to", dest="end", type=_day, help="day after the last one (default: today)")
+    parser.add_argument("--workers", type=int, help="parallel workers (default: CPU count)")
+    parser.add_argument("--threads", action="store_true", help="use threads instead of processes")
+    parser.add_argument("--partitions", type=int, help="date partitions (default: 4 per worker)")
+    parser.add_argument("--open-hours", type=float, default=OPEN_HOURS,
+                        help=f"bookable hours per room per day (default {OPEN_HOURS})")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--output", help="JSON file, or directory for the CSV files")
+    args = parser.parse_args()
+
+    end = args.end or _day(date.today().isoformat())
+    start = args.start or end - timedelta(days=365)
+    if end <= start:
+        parser.error("--to must be after --from")
+    if args.format == "csv" and not args.output:
+        parser.error("--format csv needs --output DIRECTORY")
+
+    started = time.perf_counter()
+    report, partitions = run_reports(
+        start, end, args.workers, args.threads, args.partitions, args.open_hours
+    )
+    elapsed = time.perf_counter() - started
+
+    if args.format == "csv":
+        write_csv(report, args.output)
+    else:
+        document = dict(period=dict(start=start.date().isoformat(), end=end.date().isoformat()), **report)
+        text = json.dumps(document, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as out:
+                out.write(text + "\n")
+        else:
+            print(text)
+    print(f"{partitions} partitions aggregated in {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
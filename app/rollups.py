@@ -0,0 +1,111 @@
+# app/rollups.py
+"""
+Health-metric trend queries over the daily / weekly rollup tables
+
+The rollups are kept up to date on every insert (see
+models/health_metric_rollup.py); this module reads them and can rebuild
+them from raw health_metrics (first install, or after data fixes):
+
+    python3 -m app.rollups rebuild              # every member
+    python3 -m app.rollups rebuild --member-id 7
+"""
+
+import argparse
+from datetime import date
+from typing import NamedTuple, Optional
+
+from sqlalchemy import delete, func, select, literal_column, insert
+
+from models import engine, HealthMetric, HealthMetricDaily, HealthMetricWeekly
+from models.health_metric_rollup import MEASURES
+
+ROLLUPS = {"day": HealthMetricDaily, "week": HealthMetricWeekly}
+
+
+class TrendPoint(NamedTuple):
+    period_start: date
+    readings: int
+    weight_avg: Optional[float]
+    weight_min: Optional[float]
+    weight_max: Optional[float]
+    body_fat_pct_avg: Optional[float]
+    body_fat_pct_min: Optional[float]
+    body_fat_pct_max: Optional[float]
+    heart_rate_avg: Optional[float]
+    heart_rate_min: Optional[float]
+    heart_rate_max: Optional[float]
+
+
+def metric_trend(session, member_id: int, grain: str = "week",
+                 start: date = None, end: date = None):
+    # Trend points oldest first; grain is "day" or "week". A multi-year
+    # weekly trend is a few hundred rows regardless of raw reading volume.
+    model = ROLLUPS[grain]
+    query = session.query(model).filter(model.member_id == member_id)
+    if start is not None:
+        query = query.filter(model.period_start >= start)
+    if end is not None:
+        query = query.filter(model.period_start <= end)
+
+    points = []
+    for r in query.order_by(model.period_start):
+        values = []
+        for m in MEASURES:
+            values += [r.average(m), getattr(r, f"{m}_min"), getattr(r, f"{m}_max")]
+        # TrendPoint lists weight, body fat, heart rate in MEASURES order
+        points.append(TrendPoint(r.period_start, r.reading_count, *values))
+    return points
+
+
+def _period_expr(dialect_name: str, grain: str):
+    if dialect_name == "postgresql":
+        if grain == "day":
+            return literal_column("CAST(health_metrics.recorded_at AS DATE)")
+        return literal_column("CAST(date_trunc('week', health_metrics.recorded_at) AS DATE)")
+    if grain == "day":
+        return func.date(HealthMetric.recorded_at)
+    # Monday of the ISO week
+    return func.date(HealthMetric.recorded_at, "weekday 0", "-6 days")
+
+
+def rebuild_rollups(connection, member_id: int = None):
+    # Recompute both rollups from raw health_metrics with INSERT ... SELECT
+    for grain, model in ROLLUPS.items():
+        table = model.__table__
+        clear = delete(table)
+        if member_id is not None:
+            clear = clear.where(table.c.member_id == member_id)
+        connection.execute(clear)
+
+        period = _period_expr(connection.dialect.name, grain).label("period_start")
+        columns = [HealthMetric.member_id, period, func.count().label("reading_count")]
+        for m in MEASURES:
+            col = getattr(HealthMetric, m)
+            columns += [
+                func.count(col).label(f"{m}_count"),
+                func.coalesce(func.sum(col), 0).label(f"{m}_sum"),
+                func.min(col).label(f"{m}_min"),
+                func.max(col).label(f"{m}_max"),
+            ]
+        source = select(*columns).group_by(HealthMetric.member_id, period)
+        if member_id is not None:
+            source = source.where(HealthMetric.member_id == member_id)
+
+        connection.execute(
+            insert(table).from_select([c.name for c in source.selected_columns], source)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Health-metric rollup maintenance")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--member-id", type=int, default=None)
+    args = parser.parse_args()
+
+    with engine.begin() as connection:
+        rebuild_rollups(connection, args.member_id)
+    print("Health-metric rollups rebuilt.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# app/scheduling.py
+# In-memory interval index over existing room / trainer bookings.
+#
+# Used to check a whole batch of proposed bookings (e.g. a season timetable)
+# with a single read of booking_intervals instead of one overlap query per
+# proposal. The database exclusion constraints remain the final guard.
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_
+
+from models.booking_interval import BookingInterval
+
+# A booking to check; any object with these attributes works
+ProposedBooking = namedtuple("ProposedBooking", "room_id trainer_id start_time end_time")
+
+# kind is "room" or "trainer"; other is an existing BookingInterval or,
+# for clashes inside the batch, the index of the other proposal
+Conflict = namedtuple("Conflict", "kind other")
+
+
+class IntervalIndex:
+    # Sorted-array index for the intervals of one room or trainer.
+    # Intervals are kept sorted by start with a running max of end times, so an
+    # overlap query is a bisect plus a backwards walk over real candidates.
+
+    def __init__(self, intervals=()):
+        items = sorted(intervals, key=lambda i: (i[0], i[1]))
+        self._starts = [i[0] for i in items]
+        self._ends = [i[1] for i in items]
+        self._payloads = [i[2] for i in items]
+        self._max_end = []
+        running = None
+        for end in self._ends:
+            running = end if running is None or end > running else running
+            self._max_end.append(running)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def overlapping(self, start, end):
+        # Payloads of intervals overlapping [start, end)
+        found = []
+        i = bisect_left(self._starts, end) - 1
+        while i >= 0 and self._max_end[i] > start:
+            if self._ends[i] > start:
+                found.append(self._payloads[i])
+            i -= 1
+        found.reverse()
+        return found
+
+    def conflicts(self, start, end) -> bool:
+        i = bisect_left(self._starts, end) - 1
+        while i >= 0 and self._max_end[i] > start:
+            if self._ends[i] > start:
+                return True
+            i -= 1
+        return False
+
+
+class BookingIndex:
+    # Interval indexes for every room and trainer touched by a batch
+
+    def __init__(self, bookings=()):
+        by_room = defaultdict(list)
+        by_trainer = defaultdict(list)
+        for b in bookings:
+            by_room[b.room_id].append((b.start_time, b.end_time, b))
+            by_trainer[b.trainer_id].append((b.start_time, b.end_time, b))
+        self.rooms = {k: IntervalIndex(v) for k, v in by_room.items()}
+        self.trainers = {k: IntervalIndex(v) for k, v in by_trainer.items()}
+
+    @classmethod
+    def load(cls, session, start_time, end_time, room_ids=None, trainer_ids=None):
+        # One query: live bookings in the window for the given rooms/trainers
+        query = session.query(BookingInterval).filter(
+            BookingInterval.start_time < end_time,
+            BookingInterval.end_time > start_time,
+        )
+        filters = []
+        if room_ids:
+            filters.append(BookingInterval.room_id.in_(sorted(set(room_ids))))
+        if trainer_ids:
+            filters.append(BookingInterval.trainer_id.in_(sorted(set(trainer_ids))))
+        if filters:
+            query = query.filter(or_(*filters))
+        return cls(query.all())
+
+    @classmethod
+    def for_proposals(cls, session, proposals):
+        if not proposals:
+            return cls()
+        return cls.load(
+            session,
+            min(p.start_time for p in proposals),
+            max(p.end_time for p in proposals),
+            room_ids=[p.room_id for p in proposals],
+            trainer_ids=[p.trainer_id for p in proposals],
+        )
+
+    def conflicts_for(self, proposal):
+        # Existing bookings clashing with one proposal
+        found = []
+        room = self.rooms.get(proposal.room_id)
+        if room is not None:
+            found += [Conflict("room", b) for b in room.overlapping(proposal.start_time, proposal.end_time)]
+        trainer = self.trainers.get(proposal.trainer_id)
+        if trainer is not None:
+            found += [
+                Conflict("trainer", b)
+                for b in trainer.overlapping(proposal.start_time, proposal.end_time)
+            ]
+        return found
+
+    def has_conflict(self, proposal) -> bool:
+        room = self.rooms.get(proposal.room_id)
+        if room is not None and room.conflicts(proposal.start_time, proposal.end_time):
+            return True
+        trainer = self.trainers.get(proposal.trainer_id)
+        return trainer is not None and trainer.conflicts(proposal.start_time, proposal.end_time)
+
+    def check_batch(self, proposals):
+        # {proposal index: [Conflict, ...]} against existing bookings and
+        # against the other proposals in the batch; clean proposals are absent
+        result = defaultdict(list)
+        for n, p in enumerate(proposals):
+            found = self.conflicts_for(p)
+            if found:
+                result[n].extend(found)
+
+        for kind, key in (("room", "room_id"), ("trainer", "trainer_id")):
+            for n, other in _batch_overlaps(proposals, key):
+                result[n].append(Conflict(kind, other))
+                result[other].append(Conflict(kind, n))
+        return dict(result)
+
+
+def _batch_overlaps(proposals, key):
+    # Sort-and-sweep per room/trainer; yields (later, earlier) index pairs
+    groups = defaultdict(list)
+    for n, p in enumerate(proposals):
+        groups[getattr(p, key)].append(n)
+
+    for members in groups.values():
+        members.sort(key=lambda n: proposals[n].start_time)
+        active = []
+        for n in members:
+            start = proposals[n].start_time
+            active = [m for m in active if proposals[m].end_time > start]
+            for m in active:
+                yield n, m
+            active.append(n)
+
+
+def find_timetable_conflicts(session, proposals):
+    # Check a batch of proposed bookings before committing them
+    return BookingIndex.for_proposals(session, proposals).check_batch(proposals)
+
+
+def weekly_occurrences(weekdays, start_clock, duration: timedelta, first_date, last_date):
+    # (start, end) datetimes for every date in [first_date, last_date] whose
+    # ISO weekday (1 = Monday .. 7 = Sunday) is in weekdays
+    weekdays = set(weekdays)
+    occurrences = []
+    day = first_date
+    while day <= last_date:
+        if day.isoweekday() in weekdays:
+            start = datetime.combine(day, start_clock)
+            occurrences.append((start, start + duration))
+        day += timedelta(days=1)
+    return occurrences
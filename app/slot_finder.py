@@ -0,0 +1,144 @@
+# app/slot_finder.py
+# Free personal-training slots across all trainers.
+#
+# Weekly TrainerAvailability is expanded over the date range, then each
+# trainer's existing bookings (PT sessions and classes, via booking_intervals)
+# and the chosen room's bookings are subtracted with a sort-and-sweep.
+# Cost is one query per entity type, independent of the number of trainers.
+from collections import defaultdict, namedtuple
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_
+
+from models.trainer import Trainer
+from models.trainer_availability import TrainerAvailability
+from models.booking_interval import BookingInterval
+
+FreeSlot = namedtuple("FreeSlot", "trainer_id trainer_name start_time end_time")
+
+
+def merge_intervals(intervals):
+    # Sort and coalesce overlapping / touching (start, end) pairs
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(windows, busy):
+    # windows minus busy; both must be merged (sorted, non-overlapping)
+    free = []
+    j = 0
+    for w_start, w_end in windows:
+        while j < len(busy) and busy[j][1] <= w_start:
+            j += 1
+        cursor = w_start
+        k = j
+        while k < len(busy) and busy[k][0] < w_end:
+            b_start, b_end = busy[k]
+            if b_start > cursor:
+                free.append((cursor, b_start))
+            cursor = max(cursor, b_end)
+            if cursor >= w_end:
+                break
+            k += 1
+        if cursor < w_end:
+            free.append((cursor, w_end))
+    return free
+
+
+def expand_availability(slots, first_date, last_date):
+    # Concrete (start, end) windows per trainer. Recurring slots repeat every
+    # week; one-time slots apply on their available_on date only (none when
+    # it is missing).
+    windows = defaultdict(list)
+    for slot in slots:
+        if slot.is_recurring:
+            day = first_date + timedelta(days=(slot.day_of_week - first_date.isoweekday()) % 7)
+            days = []
+            while day <= last_date:
+                days.append(day)
+                day += timedelta(days=7)
+        elif slot.available_on is not None and first_date <= slot.available_on <= last_date:
+            days = [slot.available_on]
+        else:
+            continue
+        for day in days:
+            windows[slot.trainer_id].append(
+                (datetime.combine(day, slot.start_time), datetime.combine(day, slot.end_time))
+            )
+    return windows
+
+
+def find_free_slots(session, first_date, last_date, duration: timedelta,
+                    room_id=None, trainer_ids=None, not_before=None):
+    # Every free window of at least `duration`, for all (or the given)
+    # trainers, sorted by start time
+    if not_before is None:
+        # start no earlier than the next quarter hour
+        now = datetime.utcnow().replace(second=0, microsecond=0)
+        not_before = now + timedelta(minutes=15 - now.minute % 15)
+    range_start = datetime.combine(first_date, datetime.min.time())
+    range_end = datetime.combine(last_date + timedelta(days=1), datetime.min.time())
+
+    trainer_query = session.query(Trainer.trainer_id, Trainer.first_name, Trainer.last_name)
+    availability_query = session.query(TrainerAvailability)
+    if trainer_ids is not None:
+        trainer_query = trainer_query.filter(Trainer.trainer_id.in_(trainer_ids))
+        availability_query = availability_query.filter(
+            TrainerAvailability.trainer_id.in_(trainer_ids)
+        )
+    names = {t.trainer_id: f"{t.first_name} {t.last_name}" for t in trainer_query}
+    windows = expand_availability(availability_query.all(), first_date, last_date)
+    if not windows:
+        return []
+
+    owner_filter = [BookingInterval.trainer_id.in_(sorted(windows))]
+    if room_id is not None:
+        owner_filter.append(BookingInterval.room_id == room_id)
+    bookings = (
+        session.query(
+            BookingInterval.trainer_id,
+            BookingInterval.room_id,
+            BookingInterval.start_time,
+            BookingInterval.end_time,
+        )
+        .filter(
+            or_(*owner_filter),
+            BookingInterval.start_time < range_end,
+            BookingInterval.end_time > range_start,
+        )
+        .all()
+    )
+
+    trainer_busy = defaultdict(list)
+    room_busy = []
+    for b in bookings:
+        trainer_busy[b.trainer_id].append((b.start_time, b.end_time))
+        if b.room_id == room_id:
+            room_busy.append((b.start_time, b.end_time))
+    room_busy = merge_intervals(room_busy)
+
+    free_slots = []
+    for trainer_id, trainer_windows in windows.items():
+        free = subtract_intervals(merge_intervals(trainer_windows), merge_intervals(trainer_busy[trainer_id]))
+        free = subtract_intervals(free, room_busy)
+        for start, end in free:
+            start = max(start, not_before)
+            if end - start >= duration:
+                free_slots.append(FreeSlot(trainer_id, names.get(trainer_id, f"Trainer {trainer_id}"), start, end))
+
+    free_slots.sort(key=lambda s: (s.start_time, s.trainer_id))
+    return free_slots
+
+
+def within_availability(session, trainer_id: int, start_time, end_time) -> bool:
+    # True when [start_time, end_time) lies inside one of the trainer's
+    # (merged) availability windows, as find_free_slots would offer it
+    slots = session.query(TrainerAvailability).filter(TrainerAvailability.trainer_id == trainer_id).all()
+    windows = expand_availability(slots, start_time.date(), end_time.date())[trainer_id]
+    return any(start <= start_time and end_time <= end for start, end in merge_intervals(windows))
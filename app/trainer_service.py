@@ -1,8 +1,10 @@
 # app/trainer_service.py
 
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 from app.db import get_session
-from models.trainer import Trainer
+from app.errors import ServiceError, NotFound, describe
+from app.identity_cache import lookup_trainer
 from models.trainer_availability import TrainerAvailability
 from models.personal_training_session import PersonalTrainingSession
 from models.fitness_class import FitnessClass
@@ -34,7 +36,7 @@ def trainer_menu():
 
 def find_trainer_by_email(session, email: str):
     # Helper to fetch a trainer by email
-    return session.query(Trainer).filter_by(email=email).first()
+    return lookup_trainer(session, email)
 
 
 def parse_day_of_week():
@@ -60,7 +62,110 @@ def parse_time(label: str):
         return None
 
 
+def parse_date(label: str):
+    d_str = input(f"{label} (YYYY-MM-DD): ").strip()
+    try:
+        return datetime.strptime(d_str, "%Y-%m-%d").date()
+    except ValueError:
+        print("Invalid date format. Please use YYYY-MM-DD.")
+        return None
+
+
 # Trainer operations
+#
+# add_availability / trainer_schedule take a session and plain values, raise
+# ServiceError with a message for the user and leave the commit to the
+# caller; the menu functions only prompt, commit and print.
+
+def require_trainer(session, email: str):
+    # TrainerRef for the email, or ServiceError
+    if not email:
+        raise ServiceError("Email is required.")
+    trainer = find_trainer_by_email(session, email)
+    if not trainer:
+        raise NotFound("Trainer not found.")
+    return trainer
+
+
+def check_availability_overlap(session, trainer_id: int, day: int, start_time, end_time, available_on=None):
+    # Check for overlapping availability on the same day; two one-time slots
+    # only clash on the same date
+    existing_slots = (
+        session.query(TrainerAvailability)
+        .filter_by(trainer_id=trainer_id, day_of_week=day)
+        .all()
+    )
+    for slot in existing_slots:
+        if available_on and slot.available_on and slot.available_on != available_on:
+            continue
+        # overlapping if new_start < existing_end AND new_end > existing_start
+        if start_time < slot.end_time and end_time > slot.start_time:
+            raise ServiceError(
+                "\nError: This availability overlaps with an existing slot:\n"
+                f"  Day {slot.day_of_week}, {slot.start_time}-{slot.end_time}"
+            )
+
+
+def add_availability(session, email, day_of_week: int, start_time, end_time, is_recurring=True,
+                     available_on=None):
+    # One-time availability applies on available_on only, which must fall
+    # on day_of_week
+    trainer = require_trainer(session, email)
+    if day_of_week < 1 or day_of_week > 7:
+        raise ServiceError("Invalid day. Please enter a number between 1 and 7.")
+    if end_time <= start_time:
+        raise ServiceError("End time must be after start time.")
+    if is_recurring:
+        available_on = None
+    elif available_on is None:
+        raise ServiceError("One-time availability needs a date.")
+    elif available_on.isoweekday() != day_of_week:
+        raise ServiceError(f"{available_on} is not on day {day_of_week}.")
+    check_availability_overlap(session, trainer.trainer_id, day_of_week, start_time, end_time, available_on)
+
+    availability = TrainerAvailability(
+        trainer_id=trainer.trainer_id,
+        day_of_week=day_of_week,
+        start_time=start_time,
+        end_time=end_time,
+        is_recurring=is_recurring,
+        available_on=available_on,
+    )
+    session.add(availability)
+    session.flush()
+    return availability
+
+
+def trainer_schedule(session, email, now=None):
+    # (trainer, upcoming PT sessions, upcoming classes), rooms loaded
+    trainer = require_trainer(session, email)
+    now = now or datetime.utcnow()
+
+    # Upcoming PT sessions
+    pt_sessions = (
+        session.query(PersonalTrainingSession)
+        .filter(
+            PersonalTrainingSession.trainer_id == trainer.trainer_id,
+            PersonalTrainingSession.start_time >= now,
+        )
+        .options(joinedload(PersonalTrainingSession.room))
+        .order_by(PersonalTrainingSession.start_time.asc())
+        .all()
+    )
+
+    # Upcoming classes
+    classes = (
+        session.query(FitnessClass)
+        .filter(
+            FitnessClass.trainer_id == trainer.trainer_id,
+            FitnessClass.start_time >= now,
+        )
+        .options(joinedload(FitnessClass.room))
+        .order_by(FitnessClass.start_time.asc())
+        .all()
+    )
+    return trainer, pt_sessions, classes
+
 
 def set_availability():
     print("\nSet Trainer Availability")
@@ -71,11 +176,6 @@ def set_availability():
 
     session = get_session()
     try:
-        trainer = find_trainer_by_email(session, email)
-        if not trainer:
-            print("Trainer not found.")
-            return
-
         day = parse_day_of_week()
         if day is None:
             return
@@ -87,47 +187,28 @@ def set_availability():
         if end_time is None:
             return
 
-        if end_time <= start_time:
-            print("End time must be after start time.")
-            return
-
-        # Check for overlapping availability on the same day
-        existing_slots = (
-            session.query(TrainerAvailability)
-            .filter_by(trainer_id=trainer.trainer_id, day_of_week=day)
-            .all()
-        )
-
-        for slot in existing_slots:
-            # overlapping if new_start < existing_end AND new_end > existing_start
-            if start_time < slot.end_time and end_time > slot.start_time:
-                print(
-                    "\nError: This availability overlaps with an existing slot:\n"
-                    f"  Day {slot.day_of_week}, {slot.start_time}-{slot.end_time}"
-                )
-                return
-
         is_recurring_str = input("Is this recurring weekly? (y/n): ").strip().lower()
         is_recurring = is_recurring_str == "y"
+        available_on = None
+        if not is_recurring:
+            available_on = parse_date("Date")
+            if available_on is None:
+                return
 
-        availability = TrainerAvailability(
-            trainer_id=trainer.trainer_id,
-            day_of_week=day,
-            start_time=start_time,
-            end_time=end_time,
-            is_recurring=is_recurring,
-        )
-
-        session.add(availability)
+        add_availability(session, email, day, start_time, end_time, is_recurring, available_on)
         session.commit()
+        trainer = find_trainer_by_email(session, email)
         print(
             f"\nAvailability added for {trainer.first_name} {trainer.last_name}: "
             f"day {day}, {start_time}-{end_time}, "
-            f"{'recurring' if is_recurring else 'one-time'}."
+            f"{'recurring' if is_recurring else f'one-time on {available_on}'}."
         )
+    except ServiceError as e:
+        session.rollback()
+        print(e)
     except Exception as e:
         session.rollback()
-        print("Error while setting availability:", e)
+        print("Error while setting availability:", describe(e))
     finally:
         session.close()
 
@@ -142,34 +223,7 @@ def view_schedule():
 
     session = get_session()
     try:
-        trainer = find_trainer_by_email(session, email)
-        if not trainer:
-            print("Trainer not found.")
-            return
-
-        now = datetime.utcnow()
-
-        # Upcoming PT sessions
-        pt_sessions = (
-            session.query(PersonalTrainingSession)
-            .filter(
-                PersonalTrainingSession.trainer_id == trainer.trainer_id,
-                PersonalTrainingSession.start_time >= now,
-            )
-            .order_by(PersonalTrainingSession.start_time.asc())
-            .all()
-        )
-
-        # Upcoming classes
-        classes = (
-            session.query(FitnessClass)
-            .filter(
-                FitnessClass.trainer_id == trainer.trainer_id,
-                FitnessClass.start_time >= now,
-            )
-            .order_by(FitnessClass.start_time.asc())
-            .all()
-        )
+        trainer, pt_sessions, classes = trainer_schedule(session, email)
 
         print(f"\nSchedule for {trainer.first_name} {trainer.last_name} ({trainer.email}):")
 
@@ -203,7 +257,9 @@ def view_schedule():
         else:
             print("\nNo upcoming classes.")
 
+    except ServiceError as e:
+        print(e)
     except Exception as e:
-        print("Error while viewing schedule:", e)
+        print("Error while viewing schedule:", describe(e))
     finally:
         session.close()
@@ -0,0 +1,284 @@
+# app/workload.py
+"""
+Weekly trainer workload: classes, PT sessions, booked hours and availability
+utilization per trainer per week
+
+Read from the trainer_workload_weekly summary, one row per trainer and week.
+Booking and availability changes mark the (trainer, week) pairs they touch
+as stale (see models/trainer_workload.py) and `refresh` recomputes only
+those, in small committed batches. `show` (and the trainer_workload API
+operation, via current_workload) refreshes first and fills in weeks not
+summarised yet; `rebuild` recomputes everything (first install,
+after bulk loads). Run from project root:
+
+    python3 -m app.workload show 2025-03-03               # week containing that day
+    python3 -m app.workload show 2025-03-03 --weeks 4 --json
+    python3 -m app.workload refresh
+    python3 -m app.workload rebuild
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import NamedTuple, Optional
+
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.db import session_scope
+from app.slot_finder import expand_availability, merge_intervals
+from models import (
+    engine,
+    Trainer,
+    TrainerAvailability,
+    TrainerWorkloadDirty,
+    TrainerWorkloadWeekly,
+)
+from models.archive import booking_rows
+from models.trainer_workload import week_of
+
+REFRESH_BATCH = 500   # dirty marks (and at most as many pairs) per transaction
+WEEK = timedelta(days=7)
+
+
+class TrainerWeek(NamedTuple):
+    trainer_id: int
+    trainer_name: str
+    week_start: date
+    classes: int
+    class_hours: float
+    pt_sessions: int
+    pt_hours: float
+    booked_hours: float
+    available_hours: float
+    utilization_pct: Optional[float]   # booked / available, None without availability
+
+
+def weekly_workload(session, week_start: date, weeks: int = 1, trainer_id: int = None):
+    # All trainers' summary rows for the weeks starting at the Monday of
+    # week_start, in one indexed range read
+    first = week_of(week_start)
+    w = TrainerWorkloadWeekly
+    query = (
+        select(w, Trainer.first_name, Trainer.last_name)
+        .join(Trainer, Trainer.trainer_id == w.trainer_id)
+        .where(w.week_start >= first, w.week_start < first + weeks * WEEK)
+        .order_by(w.week_start, w.trainer_id)
+    )
+    if trainer_id is not None:
+        query = query.where(w.trainer_id == trainer_id)
+
+    rows = []
+    for r, first_name, last_name in session.execute(query):
+        booked = r.class_minutes + r.pt_minutes
+        rows.append(TrainerWeek(
+            trainer_id=r.trainer_id, trainer_name=f"{first_name} {last_name}", week_start=r.week_start,
+            classes=r.class_count, class_hours=round(r.class_minutes / 60, 2),
+            pt_sessions=r.pt_count, pt_hours=round(r.pt_minutes / 60, 2),
+            booked_hours=round(booked / 60, 2), available_hours=round(r.available_minutes / 60, 2),
+            utilization_pct=round(100 * booked / r.available_minutes, 1) if r.available_minutes else None,
+        ))
+    return rows
+
+
+# Refresh
+
+def _summarise_pairs(connection, pairs, include_archive: bool = True):
+    # Summary rows for the given (trainer_id, week_start) pairs, computed
+    # from the live bookings (archived ones included) and the trainers'
+    # availability
+    bi = booking_rows(include_archive=include_archive).subquery().c
+    counts = {pair: [0, 0.0, 0, 0.0] for pair in pairs}
+    ranges = [
+        and_(bi.trainer_id == trainer_id, bi.start_time >= datetime.combine(week, datetime.min.time()),
+             bi.start_time < datetime.combine(week + WEEK, datetime.min.time()))
+        for trainer_id, week in pairs
+    ]
+    for trainer_id, class_id, start, end in connection.execute(
+        select(bi.trainer_id, bi.class_id, bi.start_time, bi.end_time).where(or_(*ranges))
+    ):
+        c = counts[(trainer_id, week_of(start))]
+        offset = 2 if class_id is None else 0
+        c[offset] += 1
+        c[offset + 1] += (end - start).total_seconds() / 60
+
+    trainer_ids = sorted({t for t, _ in pairs})
+    slots = defaultdict(list)
+    for slot in connection.execute(
+        select(TrainerAvailability).where(TrainerAvailability.trainer_id.in_(trainer_ids))
+    ):
+        slots[slot.trainer_id].append(slot)
+
+    now = datetime.utcnow()
+    rows = []
+    for (trainer_id, week), (classes, class_minutes, sessions, pt_minutes) in sorted(counts.items()):
+        windows = expand_availability(slots[trainer_id], week, week + timedelta(days=6))[trainer_id]
+        available = sum((end - start).total_seconds() / 60 for start, end in merge_intervals(windows))
+        rows.append(dict(
+            trainer_id=trainer_id, week_start=week, class_count=classes, class_minutes=class_minutes,
+            pt_count=sessions, pt_minutes=pt_minutes, available_minutes=available, refreshed_at=now,
+        ))
+    return rows
+
+
+def _store(connection, rows):
+    table = TrainerWorkloadWeekly.__table__
+    insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["trainer_id", "week_start"],
+        set_={c.name: stmt.excluded[c.name] for c in table.c if not c.primary_key},
+    )
+    connection.execute(stmt, rows)
+
+
+def refresh_batch(connection, batch_size: int = REFRESH_BATCH) -> int:
+    # Recompute the pairs behind the oldest dirty marks and clear exactly
+    # those marks; marks added meanwhile stay for the next batch. Concurrent
+    # refreshers skip each other's locked marks (PostgreSQL).
+    d = TrainerWorkloadDirty
+    marks = connection.execute(
+        select(d.dirty_id, d.trainer_id, d.week_start)
+        .order_by(d.dirty_id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    return _refresh_marks(connection, marks)
+
+
+def _refresh_marks(connection, marks) -> int:
+    if not marks:
+        return 0
+    d = TrainerWorkloadDirty
+    pairs = sorted({(m.trainer_id, m.week_start) for m in marks})
+    _store(connection, _summarise_pairs(connection, pairs))
+    connection.execute(delete(d).where(d.dirty_id.in_([m.dirty_id for m in marks])))
+    return len(pairs)
+
+
+def refresh_workload(batch_size: int = REFRESH_BATCH) -> int:
+    # Drain the dirty marks, one transaction per batch; returns pairs refreshed
+    total = 0
+    while True:
+        with engine.begin() as connection:
+            refreshed = refresh_batch(connection, batch_size)
+        if not refreshed:
+            return total
+        total += refreshed
+
+
+def mark_missing(connection, week_start: date, weeks: int = 1, trainer_id: int = None):
+    # Queue the trainer weeks in range that have no summary row yet
+    first = week_of(week_start)
+    w = TrainerWorkloadWeekly
+    have = set(connection.execute(
+        select(w.trainer_id, w.week_start).where(w.week_start >= first, w.week_start < first + weeks * WEEK)
+    ).all())
+    trainers = select(Trainer.trainer_id)
+    if trainer_id is not None:
+        trainers = trainers.where(Trainer.trainer_id == trainer_id)
+    trainer_ids = connection.execute(trainers).scalars().all()
+    missing = [
+        dict(trainer_id=t, week_start=first + n * WEEK)
+        for t in trainer_ids
+        for n in range(weeks)
+        if (t, first + n * WEEK) not in have
+    ]
+    if missing:
+        connection.execute(TrainerWorkloadDirty.__table__.insert(), missing)
+
+
+def refresh_weeks(connection, week_start: date, weeks: int = 1, trainer_id: int = None) -> int:
+    # Bring just the requested weeks up to date in the caller's transaction:
+    # queue the ones with no summary row, then recompute every marked pair in
+    # range. Waits for a concurrent refresher holding the same marks rather
+    # than reading around it.
+    mark_missing(connection, week_start, weeks, trainer_id)
+    first = week_of(week_start)
+    d = TrainerWorkloadDirty
+    query = select(d.dirty_id, d.trainer_id, d.week_start).where(
+        d.week_start >= first, d.week_start < first + weeks * WEEK
+    )
+    if trainer_id is not None:
+        query = query.where(d.trainer_id == trainer_id)
+    return _refresh_marks(connection, connection.execute(query.with_for_update()).all())
+
+
+def current_workload(session, week_start: date, weeks: int = 1, trainer_id: int = None):
+    # weekly_workload with the requested weeks refreshed first
+    refresh_weeks(session.connection(), week_start, weeks, trainer_id)
+    return weekly_workload(session, week_start, weeks, trainer_id)
+
+
+def rebuild_workload(connection, batch_size: int = REFRESH_BATCH, include_archive: bool = True):
+    # Recompute every trainer week that has bookings, in the caller's
+    # transaction. include_archive=False for databases without the archive
+    # tables yet (migration m008 runs before m010 creates them).
+    connection.execute(delete(TrainerWorkloadWeekly))
+    connection.execute(delete(TrainerWorkloadDirty))
+    pairs = set()
+    bookings = booking_rows(include_archive=include_archive).subquery()
+    # per statement: on the connection it would stick to the upserts below
+    rows = connection.execute(
+        select(bookings.c.trainer_id, bookings.c.start_time).execution_options(yield_per=5000)
+    )
+    for trainer_id, start in rows:
+        pairs.add((trainer_id, week_of(start)))
+    pairs = sorted(pairs)
+    for n in range(0, len(pairs), batch_size):
+        _store(connection, _summarise_pairs(connection, pairs[n:n + batch_size], include_archive))
+
+
+# Text rendering
+
+def render(rows) -> str:
+    lines = [f"{'Week':<10}  {'Trainer':<24} {'Classes':>7} {'PT':>4} {'Booked h':>8} {'Avail h':>8} {'Util %':>7}"]
+    for r in rows:
+        util = "-" if r.utilization_pct is None else f"{r.utilization_pct:.1f}"
+        lines.append(
+            f"{r.week_start.isoformat():<10}  {r.trainer_name[:24]:<24} {r.classes:>7} {r.pt_sessions:>4} "
+            f"{r.booked_hours:>8.2f} {r.available_hours:>8.2f} {util:>7}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Weekly trainer workload")
+    sub = parser.add_subparsers(dest="command", required=True)
+    show = sub.add_parser("show", help="weeks starting with the one containing DAY (YYYY-MM-DD)")
+    show.add_argument("day", type=date.fromisoformat)
+    show.add_argument("--weeks", type=int, default=1)
+    show.add_argument("--trainer-id", type=int)
+    show.add_argument("--json", action="store_true")
+    refresh = sub.add_parser("refresh", help="recompute the weeks marked stale")
+    sub.add_parser("rebuild", help="recompute every trainer week from the bookings")
+    for p in (show, refresh):
+        p.add_argument("--batch-size", type=int, default=REFRESH_BATCH)
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        with engine.begin() as connection:
+            rebuild_workload(connection)
+        print("Trainer workload rebuilt.")
+        return
+    if args.command == "refresh":
+        print(f"{refresh_workload(args.batch_size)} trainer weeks refreshed.")
+        return
+
+    if args.weeks <= 0:
+        parser.error("--weeks must be positive")
+    with engine.begin() as connection:
+        mark_missing(connection, args.day, args.weeks, args.trainer_id)
+    refresh_workload(args.batch_size)
+    with session_scope() as session:
+        rows = weekly_workload(session, args.day, args.weeks, args.trainer_id)
+    if args.json:
+        print(json.dumps([dict(r._asdict(), week_start=r.week_start.isoformat()) for r in rows], indent=2))
+    else:
+        print(render(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# benchmarks/bench_dashboard.py
+"""
+Member dashboard latency: the old five-query path vs fetch_dashboard()
+
+Creates (once) a benchmark member with a long history, then times both
+implementations and prints p50 / p99 in milliseconds. Run from project root:
+
+    python3 -m benchmarks.bench_dashboard --runs 500 --metrics 20000
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from models import (
+    Base,
+    engine,
+    Member,
+    HealthMetric,
+    FitnessGoal,
+    ClassRegistration,
+    PersonalTrainingSession,
+)
+from app.db import session_scope
+from app.dashboard import fetch_dashboard
+
+BENCH_EMAIL = "bench.dashboard@club.com"
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def ensure_member(metrics: int):
+    # Member with `metrics` health rows and a few goals; reused between runs
+    with session_scope() as session:
+        member = session.query(Member).filter_by(email=BENCH_EMAIL).first()
+        if member:
+            return
+        member = Member(
+            first_name="Bench",
+            last_name="Member",
+            email=BENCH_EMAIL,
+            password_hash="bench",
+        )
+        session.add(member)
+        session.flush()
+
+        start = datetime.utcnow() - timedelta(hours=metrics)
+        rows = [
+            dict(
+                member_id=member.member_id,
+                recorded_at=start + timedelta(hours=i),
+                weight=80 - i * 0.0001,
+                heart_rate=60 + i % 20,
+                body_fat_pct=25,
+            )
+            for i in range(metrics)
+        ]
+        for i in range(0, len(rows), 5000):
+            session.execute(insert(HealthMetric), rows[i:i + 5000])
+
+        session.execute(
+            insert(FitnessGoal),
+            [
+                dict(
+                    member_id=member.member_id,
+                    goal_type=goal_type,
+                    target_value=5,
+                    unit=unit,
+                    start_date=start.date(),
+                    status="active",
+                )
+                for goal_type, unit in (("weight_loss", "kg"), ("body_fat", "%"))
+            ],
+        )
+
+
+def legacy_dashboard(session, email: str):
+    # The pre-fetch_dashboard show_dashboard queries, minus the printing
+    member = session.query(Member).filter_by(email=email).first()
+    latest = (
+        session.query(HealthMetric)
+        .filter_by(member_id=member.member_id)
+        .order_by(HealthMetric.recorded_at.desc())
+        .first()
+    )
+    goals = (
+        session.query(FitnessGoal)
+        .filter_by(member_id=member.member_id, status="active")
+        .all()
+    )
+    attended = (
+        session.query(ClassRegistration)
+        .filter(
+            ClassRegistration.member_id == member.member_id,
+            ClassRegistration.attendance_status == "attended",
+        )
+        .count()
+    )
+    sessions = (
+        session.query(PersonalTrainingSession)
+        .filter(
+            PersonalTrainingSession.member_id == member.member_id,
+            PersonalTrainingSession.start_time >= datetime.utcnow(),
+        )
+        .order_by(PersonalTrainingSession.start_time.asc())
+        .all()
+    )
+    return member, latest, goals, attended, sessions
+
+
+def time_it(fn, runs: int):
+    samples = []
+    for _ in range(runs):
+        with session_scope() as session:
+            started = time.perf_counter()
+            fn(session, BENCH_EMAIL)
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the member dashboard queries")
+    parser.add_argument("--runs", type=int, default=300)
+    parser.add_argument("--metrics", type=int, default=10000, help="health rows for the bench member")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    ensure_member(args.metrics)
+
+    # warm up connections and statement caches
+    time_it(legacy_dashboard, 10)
+    time_it(fetch_dashboard, 10)
+
+    results = {}
+    for name, fn in (("legacy_5_queries", legacy_dashboard), ("single_statement", fetch_dashboard)):
+        samples = time_it(fn, args.runs)
+        results[name] = dict(
+            p50_ms=round(percentile(samples, 50), 3),
+            p99_ms=round(percentile(samples, 99), 3),
+        )
+    results["backend"] = engine.dialect.name
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# benchmarks/bench_services.py
+"""
+Service benchmarks: drive the interactive service functions with scripted
+answers against a synthetic dataset and report, per operation, latency
+percentiles, SQL statements per call and peak Python memory as JSON
+
+The dataset (benchmarks/dataset.py) is grown to each scale in turn and kept
+between runs. Point FITNESS_DATABASE_URL at a scratch PostgreSQL database,
+or at a SQLite file as a stand-in. Run from project root:
+
+    python3 -m benchmarks.bench_services --scales 1k,10k --runs 200
+    python3 -m benchmarks.bench_services --scales 1M --only show_dashboard --output bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import resource
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from sqlalchemy import event, func, select
+
+from models import Base, engine, EquipmentMaintenance, Equipment, FitnessClass, Room
+from app.member_service import register_member, show_dashboard, view_health_history
+from app.trainer_service import view_schedule
+from app.admin_service import create_class_booking, log_equipment_issue, update_maintenance_issue
+from benchmarks.bench_dashboard import percentile
+from benchmarks.dataset import (
+    ADMIN_EMAIL,
+    BOOKINGS_START,
+    ensure_dataset,
+    member_email,
+    trainer_email,
+)
+
+# Output lines that mean the call failed rather than did its job
+FAILURE_MARKERS = ("Error", "not found", "must be", "is required", "Invalid", "conflict")
+
+
+def parse_scale(value: str) -> int:
+    value = value.strip().lower()
+    for suffix, factor in (("k", 1_000), ("m", 1_000_000)):
+        if value.endswith(suffix):
+            return int(float(value[:-1]) * factor)
+    return int(value)
+
+
+class QueryCounter:
+    # Counts statements sent to the database; reset .count between calls
+
+    def __init__(self, bound_engine):
+        self.count = 0
+        event.listen(bound_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+class Scenario:
+    # Builds the scripted input() answers for call number i of each operation
+
+    def __init__(self, size, seed: int):
+        self.size = size
+        self.rng = random.Random(seed)
+        self.token = uuid.uuid4().hex[:8]
+        with engine.connect() as connection:
+            self.room_ids = connection.execute(
+                select(Room.room_id).where(Room.room_name.like("Bench Room %")).order_by(Room.room_id)
+            ).scalars().all()
+            self.equipment_ids = connection.execute(
+                select(Equipment.equipment_id).where(Equipment.serial_number.like("BENCH-%"))
+            ).scalars().all()
+            self.maintenance_ids = connection.execute(
+                select(EquipmentMaintenance.maintenance_id).limit(10_000)
+            ).scalars().all()
+            latest = connection.execute(
+                select(func.max(FitnessClass.start_time)).where(FitnessClass.start_time >= BOOKINGS_START)
+            ).scalar()
+        self.next_booking = (latest or BOOKINGS_START) + timedelta(hours=1)
+
+    def _member(self):
+        return member_email(self.rng.randrange(self.size["members"]))
+
+    def register_member(self, i):
+        return ["Bench", "Signup", f"bench.signup.{self.token}.{i}@club.com", "pw", "1990-01-01", "", ""]
+
+    def show_dashboard(self, i):
+        return [self._member()]
+
+    def view_health_history(self, i):
+        return [self._member(), "q"]
+
+    def view_schedule(self, i):
+        return [trainer_email(self.rng.randrange(self.size["trainers"]))]
+
+    def create_class_booking(self, i):
+        # a fresh hour per call so every booking succeeds
+        start = self.next_booking
+        self.next_booking += timedelta(hours=1)
+        return [
+            ADMIN_EMAIL,
+            trainer_email(self.rng.randrange(self.size["trainers"])),
+            str(self.rng.choice(self.room_ids)),
+            f"Bench Booking {self.token}.{i}",
+            "",
+            start.strftime("%Y-%m-%d %H:%M"),
+            (start + timedelta(minutes=50)).strftime("%Y-%m-%d %H:%M"),
+            "10",
+        ]
+
+    def log_equipment_issue(self, i):
+        return [ADMIN_EMAIL, str(self.rng.choice(self.equipment_ids)), f"Bench issue {self.token}.{i}", "0"]
+
+    def update_maintenance_issue(self, i):
+        return [str(self.rng.choice(self.maintenance_ids)), "in_progress"]
+
+
+OPERATIONS = {
+    "register_member": register_member,
+    "show_dashboard": show_dashboard,
+    "view_health_history": view_health_history,
+    "view_schedule": view_schedule,
+    "create_class_booking": create_class_booking,
+    "log_equipment_issue": log_equipment_issue,
+    "update_maintenance_issue": update_maintenance_issue,
+}
+
+
+def call(fn, answers):
+    # Run one service call with scripted input(); returns its printed output
+    out = io.StringIO()
+    with mock.patch("builtins.input", side_effect=list(answers)), contextlib.redirect_stdout(out):
+        fn()
+    return out.getvalue()
+
+
+def failed(output: str) -> bool:
+    return any(marker in output for marker in FAILURE_MARKERS)
+
+
+def bench_operation(name, scenario, counter, runs: int, warmup: int, memory_runs: int):
+    fn = OPERATIONS[name]
+    answers_for = getattr(scenario, name)
+
+    for i in range(warmup):
+        call(fn, answers_for(-1 - i))
+
+    samples = []
+    queries = []
+    failures = 0
+    for i in range(runs):
+        answers = answers_for(i)
+        counter.count = 0
+        started = time.perf_counter()
+        output = call(fn, answers)
+        samples.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count)
+        failures += failed(output)
+
+    # tracemalloc slows every allocation, so memory gets its own few calls
+    peak = 0
+    for i in range(memory_runs):
+        answers = answers_for(runs + i)
+        tracemalloc.start()
+        call(fn, answers)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return dict(
+        runs=runs,
+        failures=failures,
+        p50_ms=round(percentile(samples, 50), 3),
+        p95_ms=round(percentile(samples, 95), 3),
+        p99_ms=round(percentile(samples, 99), 3),
+        max_ms=round(max(samples), 3),
+        queries_per_call=round(sum(queries) / len(queries), 2),
+        max_queries=max(queries),
+        peak_memory_kb=round(peak / 1024, 1),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the service operations")
+    parser.add_argument("--scales", default="1k", help="member counts, e.g. 1k,10k,100k,1M")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--memory-runs", type=int, default=5)
+    parser.add_argument("--metrics-per-member", type=int, default=10)
+    parser.add_argument("--only", help="comma-separated operation names")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here as well")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(OPERATIONS)
+    unknown = set(names) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+
+    Base.metadata.create_all(bind=engine)
+    counter = QueryCounter(engine)
+
+    report = dict(backend=engine.dialect.name, runs=args.runs, results=[])
+    for scale in (parse_scale(s) for s in args.scales.split(",")):
+        started = time.perf_counter()
+        size = ensure_dataset(
+            engine, scale, args.metrics_per_member, log=lambda m: print(m, file=sys.stderr)
+        )
+        build_s = time.perf_counter() - started
+
+        scenario = Scenario(size, args.seed)
+        operations = {
+            name: bench_operation(name, scenario, counter, args.runs, args.warmup, args.memory_runs)
+            for name in names
+        }
+        report["results"].append(
+            dict(scale=scale, dataset=size, dataset_build_s=round(build_s, 2), operations=operations)
+        )
+
+    # ru_maxrss is KiB on Linux
+    report["process_max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
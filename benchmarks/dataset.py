@@ -0,0 +1,277 @@
+# benchmarks/dataset.py
+# Synthetic benchmark dataset that scales with the member count.
+#
+# Every row is derived from its index (no randomness), so two runs at the
+# same scale see identical data, and growing 1k -> 10k members only inserts
+# the rows that are missing. Rows go in with multi-row Core inserts; the
+# booking-interval, rollup and room-occupancy tables and the trainer-workload
+# stale marks those inserts skip are filled in the same transaction.
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import func, insert, select
+
+from models import (
+    AdminStaff,
+    BookingInterval,
+    Equipment,
+    EquipmentMaintenance,
+    FitnessClass,
+    FitnessGoal,
+    HealthMetric,
+    Member,
+    PersonalTrainingSession,
+    Room,
+    Trainer,
+    TrainerAvailability,
+)
+from models.booking_interval import bulk_insert_class_intervals
+from models.health_metric_rollup import apply_metric_rows
+from models.room_occupancy import apply_bookings, class_booking
+from models.trainer_workload import mark_weeks, week_of
+
+ADMIN_EMAIL = "bench.admin@club.com"
+BATCH = 5000
+
+HISTORY_START = datetime(2024, 1, 1)
+CLASSES_START = datetime(2030, 1, 1, 6)    # one class per hour from here
+SESSIONS_START = datetime(2040, 1, 1, 6)   # one PT session per hour from here
+BOOKINGS_START = datetime(2050, 1, 1, 6)   # classes created by the benchmarks
+
+
+def member_email(i: int) -> str:
+    return f"bench.member.{i}@club.com"
+
+
+def trainer_email(i: int) -> str:
+    return f"bench.trainer.{i}@club.com"
+
+
+def sizes(members: int):
+    # Row counts for everything else at a given member count
+    return dict(
+        rooms=max(4, members // 2500),
+        trainers=max(5, members // 200),
+        equipment_per_room=5,
+        maintenance=max(50, members // 20),
+        classes=max(20, members // 50),
+        sessions=max(20, members // 20),
+    )
+
+
+def _count(connection, stmt) -> int:
+    return connection.execute(select(func.count()).select_from(stmt.subquery())).scalar()
+
+
+def _chunks(start: int, stop: int):
+    for lo in range(start, stop, BATCH):
+        yield lo, min(stop, lo + BATCH)
+
+
+def _ids(connection, column, where):
+    return connection.execute(select(column).where(where).order_by(column)).scalars().all()
+
+
+def ensure_dataset(engine, members: int, metrics_per_member: int = 10, log=print):
+    # Grow the benchmark dataset to `members` members; returns its sizes
+    target = sizes(members)
+
+    with engine.begin() as connection:
+        if connection.execute(select(AdminStaff.admin_id).where(AdminStaff.email == ADMIN_EMAIL)).first() is None:
+            connection.execute(
+                insert(AdminStaff).values(
+                    first_name="Bench", last_name="Admin", email=ADMIN_EMAIL,
+                    password_hash="bench", role="manager",
+                )
+            )
+        admin_id = connection.execute(
+            select(AdminStaff.admin_id).where(AdminStaff.email == ADMIN_EMAIL)
+        ).scalar()
+
+        room_ids = _ids(connection, Room.room_id, Room.room_name.like("Bench Room %"))
+        if len(room_ids) < target["rooms"]:
+            connection.execute(
+                insert(Room),
+                [
+                    dict(room_name=f"Bench Room {i}", location="Bench", capacity=30, is_active=True)
+                    for i in range(len(room_ids), target["rooms"])
+                ],
+            )
+            connection.execute(
+                insert(Equipment),
+                [
+                    dict(
+                        room_id=room_id,
+                        equipment_name=f"Bench Machine {room_id}.{k}",
+                        equipment_type="cardio" if k % 2 else "strength",
+                        serial_number=f"BENCH-{room_id}-{k}",
+                        is_operational=True,
+                    )
+                    for room_id in _ids(connection, Room.room_id, Room.room_name.like("Bench Room %"))[len(room_ids):]
+                    for k in range(target["equipment_per_room"])
+                ],
+            )
+            room_ids = _ids(connection, Room.room_id, Room.room_name.like("Bench Room %"))
+
+        trainer_ids = _ids(connection, Trainer.trainer_id, Trainer.email.like("bench.trainer.%"))
+        if len(trainer_ids) < target["trainers"]:
+            connection.execute(
+                insert(Trainer),
+                [
+                    dict(
+                        first_name="Bench", last_name=f"Trainer{i}", email=trainer_email(i),
+                        specialization=("yoga", "strength", "cardio")[i % 3],
+                    )
+                    for i in range(len(trainer_ids), target["trainers"])
+                ],
+            )
+            new_ids = _ids(connection, Trainer.trainer_id, Trainer.email.like("bench.trainer.%"))[len(trainer_ids):]
+            connection.execute(
+                insert(TrainerAvailability),
+                [
+                    dict(trainer_id=t, day_of_week=day, start_time=time(6), end_time=time(22), is_recurring=True)
+                    for t in new_ids
+                    for day in range(1, 8)
+                ],
+            )
+            mark_weeks(connection, [(t, week_of(datetime.utcnow())) for t in new_ids])
+            trainer_ids = _ids(connection, Trainer.trainer_id, Trainer.email.like("bench.trainer.%"))
+
+    have = _count_members(engine)
+    if have < members:
+        log(f"  members {have} -> {members}")
+    for lo, hi in _chunks(have, members):
+        with engine.begin() as connection:
+            returned = connection.execute(
+                insert(Member).returning(Member.member_id, Member.email),
+                [
+                    dict(
+                        first_name="Bench", last_name=f"Member{i}", email=member_email(i),
+                        password_hash="bench", gender=("F", "M")[i % 2],
+                    )
+                    for i in range(lo, hi)
+                ],
+            ).all()
+            ids = sorted(member_id for member_id, _ in returned)
+            rows = [
+                dict(
+                    member_id=member_id,
+                    recorded_at=HISTORY_START + timedelta(days=7 * k, minutes=member_id % 1440),
+                    weight=round(60 + member_id % 40 - 0.1 * k, 2),
+                    heart_rate=55 + (member_id + k) % 30,
+                    body_fat_pct=round(15 + member_id % 15 - 0.05 * k, 2),
+                )
+                for member_id in ids
+                for k in range(metrics_per_member)
+            ]
+            if rows:
+                connection.execute(insert(HealthMetric), rows)
+                apply_metric_rows(connection, rows)
+            connection.execute(
+                insert(FitnessGoal),
+                [
+                    dict(
+                        member_id=member_id,
+                        goal_type=("weight_loss", "body_fat")[member_id % 2],
+                        target_value=5,
+                        unit=("kg", "%")[member_id % 2],
+                        start_date=HISTORY_START.date(),
+                        status="active",
+                    )
+                    for member_id in ids
+                ],
+            )
+
+    with engine.begin() as connection:
+        # classes and sessions are one per hour, so nothing overlaps
+        bench_classes = FitnessClass.start_time >= CLASSES_START
+        have_classes = _count(connection, select(FitnessClass.class_id).where(
+            bench_classes, FitnessClass.start_time < SESSIONS_START))
+        for lo, hi in _chunks(have_classes, target["classes"]):
+            rows = [
+                dict(
+                    trainer_id=trainer_ids[j % len(trainer_ids)],
+                    room_id=room_ids[j % len(room_ids)],
+                    created_by_admin_id=admin_id,
+                    class_name=f"Bench Class {j}",
+                    start_time=CLASSES_START + timedelta(hours=j),
+                    end_time=CLASSES_START + timedelta(hours=j, minutes=50),
+                    capacity=20,
+                    status="scheduled",
+                )
+                for j in range(lo, hi)
+            ]
+            returned = connection.execute(
+                insert(FitnessClass).returning(FitnessClass.class_id, FitnessClass.start_time), rows
+            ).all()
+            ids_by_start = {start: class_id for class_id, start in returned}
+            for row in rows:
+                row["class_id"] = ids_by_start[row["start_time"]]
+            bulk_insert_class_intervals(connection, rows)
+            apply_bookings(connection, [class_booking(row) for row in rows])
+            mark_weeks(connection, [(row["trainer_id"], week_of(row["start_time"])) for row in rows])
+
+        have_sessions = _count(connection, select(PersonalTrainingSession.session_id).where(
+            PersonalTrainingSession.start_time >= SESSIONS_START))
+        first_member = connection.execute(
+            select(func.min(Member.member_id)).where(Member.email.like("bench.member.%"))
+        ).scalar()
+        for lo, hi in _chunks(have_sessions, target["sessions"]):
+            rows = [
+                dict(
+                    member_id=first_member + j % members,
+                    trainer_id=trainer_ids[j % len(trainer_ids)],
+                    room_id=room_ids[j % len(room_ids)],
+                    start_time=SESSIONS_START + timedelta(hours=j),
+                    end_time=SESSIONS_START + timedelta(hours=j, minutes=55),
+                    status="scheduled",
+                )
+                for j in range(lo, hi)
+            ]
+            returned = connection.execute(
+                insert(PersonalTrainingSession).returning(
+                    PersonalTrainingSession.session_id, PersonalTrainingSession.start_time
+                ),
+                rows,
+            ).all()
+            ids_by_start = {start: session_id for session_id, start in returned}
+            connection.execute(
+                insert(BookingInterval),
+                [
+                    dict(
+                        session_id=ids_by_start[row["start_time"]],
+                        room_id=row["room_id"],
+                        trainer_id=row["trainer_id"],
+                        start_time=row["start_time"],
+                        end_time=row["end_time"],
+                    )
+                    for row in rows
+                ],
+            )
+            apply_bookings(connection, [dict(row, seats=1) for row in rows])
+            mark_weeks(connection, [(row["trainer_id"], week_of(row["start_time"])) for row in rows])
+
+        equipment_ids = _ids(connection, Equipment.equipment_id, Equipment.serial_number.like("BENCH-%"))
+        have_issues = _count(connection, select(EquipmentMaintenance.maintenance_id).where(
+            EquipmentMaintenance.admin_id == admin_id))
+        for lo, hi in _chunks(have_issues, target["maintenance"]):
+            connection.execute(
+                insert(EquipmentMaintenance),
+                [
+                    dict(
+                        equipment_id=equipment_ids[j % len(equipment_ids)],
+                        admin_id=admin_id,
+                        reported_at=HISTORY_START + timedelta(hours=j),
+                        resolved_at=HISTORY_START + timedelta(hours=j + 48) if j % 3 == 2 else None,
+                        status=("open", "in_progress", "resolved")[j % 3],
+                        issue_description=f"Bench issue {j}",
+                    )
+                    for j in range(lo, hi)
+                ],
+            )
+
+    return dict(target, members=members, metrics_per_member=metrics_per_member)
+
+
+def _count_members(engine) -> int:
+    with engine.connect() as connection:
+        return _count(connection, select(Member.member_id).where(Member.email.like("bench.member.%")))
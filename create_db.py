@@ -1,8 +1,11 @@
 # create_db.py
 from models import Base, engine 
+from migrate_db import stamp
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        Base.metadata.create_all(bind=conn)
+        stamp(conn)
 
 if __name__ == "__main__":
     init_db()
@@ -0,0 +1,529 @@
+# generate_data.py
+"""
+Generate a large, realistic dataset for load testing
+
+Creates members with years of health metrics and goals, trainers with weekly
+availability, rooms with equipment and maintenance history, a season of
+classes with registrations / waitlists / attendance, and PT sessions. Rows
+are written in batches with COPY on PostgreSQL (multi-row INSERT elsewhere),
+primary keys are assigned up front so nothing is read back, and the
+booking-interval, rollup, room-occupancy and trainer-workload tables are
+filled in at the end.
+
+The same --seed and --as-of always produce the same data. Meant for an
+empty database (python3 create_db.py first); each batch is committed as it
+is written. Run from project root:
+
+    python3 generate_data.py --members 10000                  # ~1.4M rows
+    python3 generate_data.py --members 50000 --years 3        # ~10M rows
+    python3 generate_data.py --members 500 --seed 7 --as-of 2025-06-30
+"""
+
+import argparse
+import random
+import time as timer
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import func, insert, select, text
+
+from app.goal_progress import GOAL_RULES
+from app.metric_import import copy_rows
+from app.rollups import rebuild_rollups
+from app.occupancy import rebuild_occupancy
+from app.workload import rebuild_workload
+from models.partitioning import ensure_partitions
+from models import (
+    Base,
+    engine,
+    AdminStaff,
+    BookingInterval,
+    ClassRegistration,
+    Equipment,
+    EquipmentMaintenance,
+    FitnessClass,
+    FitnessGoal,
+    HealthMetric,
+    Member,
+    PersonalTrainingSession,
+    Room,
+    Trainer,
+    TrainerAvailability,
+)
+
+FIRST_NAMES = (
+    "Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn",
+    "Maria", "Wei", "Aisha", "Luca", "Noah", "Emma", "Olivia", "Liam", "Priya", "Mateo",
+    "Sofia", "Yuki", "Omar", "Chloe", "Ethan", "Zara", "Daniel", "Hana", "Leo", "Ines",
+)
+LAST_NAMES = (
+    "Smith", "Nguyen", "Garcia", "Khan", "Rossi", "Muller", "Tanaka", "Brown", "Silva", "Kowalski",
+    "Martin", "Lee", "Patel", "Dubois", "Jensen", "Cohen", "Okafor", "Novak", "Haddad", "Walsh",
+)
+SPECIALIZATIONS = ("strength", "yoga", "pilates", "cardio", "boxing", "mobility", "crossfit")
+CLASS_TYPES = ("Spin", "Yoga Flow", "HIIT", "Pilates", "Boxfit", "Body Pump", "Zumba", "Stretch")
+EQUIPMENT_TYPES = {
+    "cardio": ("Treadmill", "Rower", "Bike", "Elliptical"),
+    "strength": ("Squat Rack", "Cable Machine", "Bench Press", "Leg Press"),
+    "accessory": ("Kettlebell Set", "Dumbbell Rack", "Mat Rack"),
+}
+ISSUES = (
+    "Belt slipping", "Display not turning on", "Cable frayed", "Loud grinding noise",
+    "Seat adjustment stuck", "Resistance not changing", "Loose bolts", "Upholstery torn",
+)
+ROOM_NAMES = ("Studio", "Gym Floor", "Spin Room", "Mat Room", "Boxing Ring", "Functional Zone")
+
+CLASS_HOURS = (7, 9, 12, 17, 19)
+PT_HOURS = (8, 10, 11, 13, 14, 15, 16, 18, 20)   # never collide with classes
+SHIFTS = ((6, 14), (12, 20), (14, 22))
+
+# goal_type -> (unit, low, high) for target_value
+GOAL_TARGETS = {
+    "weight_loss": ("kg", 2, 12),
+    "weight_gain": ("kg", 2, 6),
+    "body_fat": ("%", 12, 25),
+    "body_fat_loss": ("%", 2, 8),
+    "resting_heart_rate": ("bpm", 50, 65),
+}
+
+
+class TableWriter:
+    # Buffers rows for one table and writes them in batches. Tables listed
+    # in `after` are flushed first so foreign keys always resolve.
+
+    def __init__(self, connection, model, batch_size: int, after=()):
+        self.connection = connection
+        self.table = model.__table__
+        self.columns = [c.name for c in self.table.columns]
+        self.batch_size = batch_size
+        self.after = after
+        self.rows = []
+        self.written = 0
+        self.use_copy = (
+            connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2"
+        )
+
+    def add(self, **row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for writer in self.after:
+            writer.flush()
+        if not self.rows:
+            return
+        if self.use_copy:
+            copy_rows(self.connection, self.rows, self.table.name, self.columns)
+        else:
+            self.connection.execute(insert(self.table), self.rows)
+        self.connection.commit()
+        self.written += len(self.rows)
+        self.rows = []
+
+
+def next_id(connection, column) -> int:
+    return (connection.execute(select(func.max(column))).scalar() or 0) + 1
+
+
+def reset_sequences(connection, columns):
+    # Explicit ids leave PostgreSQL serial sequences behind; move them past max
+    if connection.dialect.name != "postgresql":
+        return
+    for column in columns:
+        table = column.table.name
+        connection.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', '{column.name}'), "
+                f"COALESCE((SELECT max({column.name}) FROM {table}), 0) + 1, false)"
+            )
+        )
+    connection.commit()
+
+
+def _at(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(day, time(hour, minute))
+
+
+def generate_people(connection, w, ids, members, history_start, as_of, seed):
+    rng = random.Random(f"{seed}:members")
+    domain = f"gen{seed}.example.com"
+    history_days = (as_of - history_start).days
+
+    for i in range(members):
+        member_id = ids["member"] + i
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        joined = history_start + timedelta(days=rng.randrange(history_days))
+        w["members"].add(
+            member_id=member_id,
+            first_name=first,
+            last_name=last,
+            email=f"{first.lower()}.{last.lower()}.{i}@{domain}",
+            password_hash="generated",
+            date_of_birth=date(1950, 1, 1) + timedelta(days=rng.randrange(20_000)),
+            gender=rng.choice(("F", "M", "F", "M", "X", None)),
+            phone=f"555-{rng.randrange(10_000_000):07d}" if rng.random() < 0.8 else None,
+            created_at=_at(joined, rng.randrange(6, 22), rng.randrange(60)),
+        )
+
+        # readings every few days from joining, drifting towards a trend
+        interval = rng.choice((1, 2, 3, 7, 7, 14))
+        weight = rng.gauss(78, 14)
+        body_fat = min(45.0, max(8.0, rng.gauss(26, 6)))
+        heart_rate = rng.gauss(70, 8)
+        trend = rng.uniform(-0.02, 0.01)
+        day = joined
+        while day <= as_of:
+            weight = max(40.0, weight + trend * interval + rng.gauss(0, 0.3))
+            body_fat = min(45.0, max(5.0, body_fat + trend * interval * 0.3 + rng.gauss(0, 0.2)))
+            heart_rate = min(110.0, max(40.0, heart_rate + trend * interval + rng.gauss(0, 1.5)))
+            w["metrics"].add(
+                metric_id=ids["metric"] + w["metrics"].written + len(w["metrics"].rows),
+                member_id=member_id,
+                recorded_at=_at(day, rng.randrange(6, 22), rng.randrange(60)),
+                weight=round(weight, 1),
+                heart_rate=round(heart_rate) if rng.random() < 0.9 else None,
+                body_fat_pct=round(body_fat, 1) if rng.random() < 0.35 else None,
+                notes="post-workout" if rng.random() < 0.02 else None,
+            )
+            day += timedelta(days=interval)
+
+        for _ in range(rng.choice((0, 1, 1, 1, 2, 3))):
+            goal_type = rng.choice(tuple(GOAL_RULES))
+            unit, low, high = GOAL_TARGETS[goal_type]
+            start = joined + timedelta(days=rng.randrange(max(1, (as_of - joined).days)))
+            target_date = start + timedelta(days=rng.randrange(60, 240))
+            done = target_date < as_of and rng.random() < 0.45
+            w["goals"].add(
+                goal_id=ids["goal"] + w["goals"].written + len(w["goals"].rows),
+                member_id=member_id,
+                goal_type=goal_type,
+                target_value=rng.randint(low, high),
+                unit=unit,
+                start_date=start,
+                target_date=target_date,
+                status="completed" if done else "active",
+            )
+
+
+def generate_staff(connection, w, ids, trainers, rooms, history_start, as_of, seed):
+    # Returns (availability: (weekday, hour) -> trainer ids, room ids, admin ids)
+    rng = random.Random(f"{seed}:staff")
+    domain = f"gen{seed}.example.com"
+
+    admin_ids = []
+    for i in range(3):
+        admin_ids.append(ids["admin"] + i)
+        w["admins"].add(
+            admin_id=ids["admin"] + i,
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            email=f"admin.{i}@{domain}",
+            password_hash="generated",
+            role=("manager", "front_desk", "operations")[i],
+        )
+
+    available = {}
+    for i in range(trainers):
+        trainer_id = ids["trainer"] + i
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        w["trainers"].add(
+            trainer_id=trainer_id,
+            first_name=first,
+            last_name=last,
+            email=f"{first.lower()}.{last.lower()}.trainer{i}@{domain}",
+            phone=f"555-{rng.randrange(10_000_000):07d}",
+            specialization=rng.choice(SPECIALIZATIONS),
+            hired_at=history_start - timedelta(days=rng.randrange(2000)),
+        )
+        for weekday in sorted(rng.sample(range(1, 8), rng.randint(3, 6))):
+            start, end = rng.choice(SHIFTS)
+            w["availability"].add(
+                availability_id=ids["availability"] + w["availability"].written + len(w["availability"].rows),
+                trainer_id=trainer_id,
+                day_of_week=weekday,
+                start_time=time(start),
+                end_time=time(end),
+                is_recurring=True,
+            )
+            for hour in range(start, end):
+                available.setdefault((weekday, hour), []).append(trainer_id)
+
+    room_ids = []
+    equipment_id = ids["equipment"]
+    for i in range(rooms):
+        room_id = ids["room"] + i
+        room_ids.append(room_id)
+        w["rooms"].add(
+            room_id=room_id,
+            room_name=f"{ROOM_NAMES[i % len(ROOM_NAMES)]} {i // len(ROOM_NAMES) + 1}",
+            location=f"Floor {i % 3 + 1}",
+            capacity=rng.choice((15, 20, 25, 30, 40)),
+            is_active=True,
+        )
+        for _ in range(rng.randint(5, 15)):
+            kind = rng.choice(tuple(EQUIPMENT_TYPES))
+            # issues arrive every few months; recent ones may still be open
+            operational = True
+            issues = []
+            reported = _at(history_start, 9) + timedelta(days=rng.expovariate(1 / 120))
+            while reported.date() < as_of:
+                fixed = reported + timedelta(days=rng.uniform(0.5, 14))
+                if fixed.date() < as_of:
+                    status, resolved_at = "resolved", fixed
+                else:
+                    status, resolved_at = rng.choice(("open", "in_progress")), None
+                    operational = False
+                issues.append(dict(
+                    equipment_id=equipment_id,
+                    admin_id=rng.choice(admin_ids),
+                    reported_at=reported,
+                    resolved_at=resolved_at,
+                    status=status,
+                    issue_description=rng.choice(ISSUES),
+                    resolution_notes="Serviced" if resolved_at else None,
+                ))
+                reported = fixed + timedelta(days=rng.expovariate(1 / 120))
+            w["equipment"].add(
+                equipment_id=equipment_id,
+                room_id=room_id,
+                equipment_name=rng.choice(EQUIPMENT_TYPES[kind]),
+                equipment_type=kind,
+                serial_number=f"SN-{seed}-{equipment_id}",
+                is_operational=operational,
+            )
+            for issue in issues:
+                w["maintenance"].add(
+                    maintenance_id=ids["maintenance"] + w["maintenance"].written + len(w["maintenance"].rows),
+                    **issue,
+                )
+            equipment_id += 1
+
+    return available, room_ids, admin_ids
+
+
+def _registrations(rng, class_row, members, first_member, now):
+    # Sign-ups in arrival order; a seat freed by a cancellation goes to the
+    # next member, later arrivals wait. Returns (rows, seats taken)
+    capacity = class_row["capacity"]
+    start = class_row["start_time"]
+    demand = min(members, rng.randint(capacity * 3 // 10, capacity * 6 // 5))
+    member_ids = [first_member + m for m in rng.sample(range(members), demand)]
+    times = sorted(start - timedelta(minutes=rng.randrange(60, 20_000)) for _ in member_ids)
+
+    rows = []
+    seated = 0
+    for member_id, registered_at in zip(member_ids, times):
+        if class_row["status"] == "cancelled":
+            status = "cancelled"
+        elif seated >= capacity:
+            status = "waitlisted"
+        elif start < now:
+            status = rng.choices(("attended", "registered", "cancelled"), (85, 10, 5))[0]
+        else:
+            status = "registered" if rng.random() < 0.95 else "cancelled"
+        seated += status in ("registered", "attended")
+        rows.append(dict(
+            class_id=class_row["class_id"],
+            member_id=member_id,
+            registered_at=registered_at,
+            attendance_status=status,
+        ))
+    return rows, seated
+
+
+def generate_season(connection, w, ids, members, available, room_ids, admin_ids,
+                    season_start, season_weeks, as_of, seed):
+    # Classes on the class hours, PT sessions on the others; within one hour
+    # each room and trainer is used at most once, so nothing overlaps
+    rng = random.Random(f"{seed}:season")
+    now = _at(as_of, 12)
+    class_id, session_id = ids["fitness_class"], ids["session"]
+    interval_id = ids["interval"]
+
+    for offset in range(season_weeks * 7):
+        day = season_start + timedelta(days=offset)
+        weekday = day.isoweekday()
+
+        for hour in CLASS_HOURS:
+            free = list(available.get((weekday, hour), ()))
+            rng.shuffle(free)
+            for room_id in room_ids:
+                if not free or rng.random() > 0.6:
+                    continue
+                trainer_id = free.pop()
+                start = _at(day, hour)
+                row = dict(
+                    class_id=class_id,
+                    trainer_id=trainer_id,
+                    room_id=room_id,
+                    created_by_admin_id=rng.choice(admin_ids),
+                    class_name=rng.choice(CLASS_TYPES),
+                    description=None,
+                    start_time=start,
+                    end_time=start + timedelta(minutes=rng.choice((45, 50, 55))),
+                    capacity=rng.choice((10, 12, 15, 20)),
+                    registered_count=0,
+                    status="cancelled" if rng.random() < 0.03 else "scheduled",
+                )
+                registrations, row["registered_count"] = _registrations(
+                    rng, row, members, ids["member"], now
+                )
+                w["classes"].add(**row)
+                for registration in registrations:
+                    w["registrations"].add(
+                        registration_id=ids["registration"] + w["registrations"].written
+                        + len(w["registrations"].rows),
+                        **registration,
+                    )
+                if row["status"] != "cancelled":
+                    w["intervals"].add(
+                        interval_id=interval_id, room_id=room_id, trainer_id=trainer_id,
+                        class_id=class_id, session_id=None,
+                        start_time=row["start_time"], end_time=row["end_time"],
+                    )
+                    interval_id += 1
+                class_id += 1
+
+        for hour in PT_HOURS:
+            rooms_free = list(room_ids)
+            rng.shuffle(rooms_free)
+            for trainer_id in available.get((weekday, hour), ()):
+                if not rooms_free or rng.random() > 0.25:
+                    continue
+                start = _at(day, hour)
+                if start < now:
+                    status = "completed" if rng.random() < 0.9 else "cancelled"
+                else:
+                    status = "scheduled" if rng.random() < 0.95 else "cancelled"
+                room_id = rooms_free.pop()
+                row = dict(
+                    session_id=session_id,
+                    member_id=ids["member"] + rng.randrange(members),
+                    trainer_id=trainer_id,
+                    room_id=room_id,
+                    start_time=start,
+                    end_time=start + timedelta(minutes=55),
+                    status=status,
+                )
+                w["sessions"].add(**row)
+                if status != "cancelled":
+                    w["intervals"].add(
+                        interval_id=interval_id, room_id=room_id, trainer_id=trainer_id,
+                        class_id=None, session_id=session_id,
+                        start_time=row["start_time"], end_time=row["end_time"],
+                    )
+                    interval_id += 1
+                session_id += 1
+
+
+def generate(members=10_000, years=2, season_weeks=12, seed=42, as_of=None,
+             batch_size=20_000, log=print):
+    # Returns {table name: rows written}
+    as_of = as_of or date.today()
+    history_start = as_of - timedelta(days=round(365.25 * years))
+    # season centred on as_of, starting on a Monday
+    season_start = as_of - timedelta(days=season_weeks * 7 // 2)
+    season_start -= timedelta(days=season_start.weekday())
+    trainers = max(5, members // 100)
+    rooms = max(4, members // 1000)
+
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        taken = connection.execute(
+            select(Member.member_id).where(Member.email.like(f"%@gen{seed}.example.com")).limit(1)
+        ).first()
+        if taken:
+            raise SystemExit(f"Data for seed {seed} already exists; use another --seed or a fresh database.")
+
+        key_columns = dict(
+            member=Member.member_id, metric=HealthMetric.metric_id, goal=FitnessGoal.goal_id,
+            admin=AdminStaff.admin_id, trainer=Trainer.trainer_id,
+            availability=TrainerAvailability.availability_id, room=Room.room_id,
+            equipment=Equipment.equipment_id, maintenance=EquipmentMaintenance.maintenance_id,
+            registration=ClassRegistration.registration_id, interval=BookingInterval.interval_id,
+            fitness_class=FitnessClass.class_id, session=PersonalTrainingSession.session_id,
+        )
+        ids = {key: next_id(connection, column) for key, column in key_columns.items()}
+        # monthly health_metrics partitions for the whole history (PostgreSQL)
+        ensure_partitions(connection, HealthMetric.__table__, first=history_start)
+        connection.commit()
+
+        w = {}
+        w["members"] = TableWriter(connection, Member, batch_size)
+        w["metrics"] = TableWriter(connection, HealthMetric, batch_size, after=[w["members"]])
+        w["goals"] = TableWriter(connection, FitnessGoal, batch_size, after=[w["members"]])
+        w["admins"] = TableWriter(connection, AdminStaff, batch_size)
+        w["trainers"] = TableWriter(connection, Trainer, batch_size)
+        w["availability"] = TableWriter(connection, TrainerAvailability, batch_size, after=[w["trainers"]])
+        w["rooms"] = TableWriter(connection, Room, batch_size)
+        w["equipment"] = TableWriter(connection, Equipment, batch_size, after=[w["rooms"]])
+        w["maintenance"] = TableWriter(
+            connection, EquipmentMaintenance, batch_size, after=[w["equipment"], w["admins"]]
+        )
+        w["classes"] = TableWriter(
+            connection, FitnessClass, batch_size, after=[w["trainers"], w["rooms"], w["admins"]]
+        )
+        w["registrations"] = TableWriter(
+            connection, ClassRegistration, batch_size, after=[w["classes"], w["members"]]
+        )
+        w["sessions"] = TableWriter(
+            connection, PersonalTrainingSession, batch_size,
+            after=[w["members"], w["trainers"], w["rooms"]],
+        )
+        w["intervals"] = TableWriter(
+            connection, BookingInterval, batch_size, after=[w["classes"], w["sessions"]]
+        )
+
+        started = timer.perf_counter()
+        log(f"Generating {members} members, {trainers} trainers, {rooms} rooms (seed {seed}, as of {as_of})")
+        generate_people(connection, w, ids, members, history_start, as_of, seed)
+        available, room_ids, admin_ids = generate_staff(
+            connection, w, ids, trainers, rooms, history_start, as_of, seed
+        )
+        generate_season(
+            connection, w, ids, members, available, room_ids, admin_ids,
+            season_start, season_weeks, as_of, seed,
+        )
+        for writer in w.values():
+            writer.flush()
+        log(f"  rows written in {timer.perf_counter() - started:.1f}s")
+
+        reset_sequences(connection, key_columns.values())
+
+        # bulk writes skip the rollup / occupancy / workload hooks; derive them from the raw rows
+        started = timer.perf_counter()
+        rebuild_rollups(connection)
+        rebuild_occupancy(connection)
+        rebuild_workload(connection)
+        connection.commit()
+        log(f"  rollups, room occupancy and trainer workload rebuilt in {timer.perf_counter() - started:.1f}s")
+
+    return {writer.table.name: writer.written for writer in w.values()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a large deterministic dataset")
+    parser.add_argument("--members", type=int, default=10_000)
+    parser.add_argument("--years", type=float, default=2, help="length of the metric history")
+    parser.add_argument("--season-weeks", type=int, default=12, help="weeks of classes / PT sessions")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, help="'today' for the data (YYYY-MM-DD)")
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    args = parser.parse_args()
+
+    started = timer.perf_counter()
+    counts = generate(
+        members=args.members,
+        years=args.years,
+        season_weeks=args.season_weeks,
+        seed=args.seed,
+        as_of=args.as_of,
+        batch_size=args.batch_size,
+    )
+    for table, count in counts.items():
+        print(f"  {table:<28} {count:>12,}")
+    print(f"Generated {sum(counts.values()):,} rows in {timer.perf_counter() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
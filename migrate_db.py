@@ -0,0 +1,99 @@
+# migrate_db.py
+"""
+Bring an existing database up to date with the ORM models
+
+Fresh databases get everything from create_db.py; this is for databases that
+were created before a model change. Run from project root:
+
+    python3 migrate_db.py            # apply pending migrations
+    python3 migrate_db.py --verify   # also EXPLAIN the hot queries
+"""
+
+import argparse
+from datetime import datetime
+
+from sqlalchemy import text
+
+from models import engine
+from migrations import MIGRATIONS
+
+
+def ensure_migrations_table(connection):
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " name VARCHAR PRIMARY KEY,"
+            " applied_at TIMESTAMP NOT NULL)"
+        )
+    )
+
+
+def applied_migrations(connection):
+    rows = connection.execute(text("SELECT name FROM schema_migrations")).fetchall()
+    return {r[0] for r in rows}
+
+
+def record_migration(connection, name):
+    connection.execute(
+        text("INSERT INTO schema_migrations (name, applied_at) VALUES (:n, :t)"),
+        {"n": name, "t": datetime.utcnow()},
+    )
+
+
+def stamp(connection):
+    # A database built by create_db.py already has the current schema; mark
+    # every migration applied so migrate() doesn't replay them on top of it
+    ensure_migrations_table(connection)
+    done = applied_migrations(connection)
+    for migration in MIGRATIONS:
+        if migration.NAME not in done:
+            record_migration(connection, migration.NAME)
+
+
+def run_migration(migration):
+    if getattr(migration, "AUTOCOMMIT", False):
+        # no transaction to share; a crash before the record is written
+        # re-runs the upgrade next time, which must be safe
+        with engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            migration.upgrade(conn)
+        with engine.begin() as conn:
+            record_migration(conn, migration.NAME)
+    else:
+        # recorded in the upgrade's own transaction: both happen or neither
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            record_migration(conn, migration.NAME)
+
+
+def migrate(verify: bool = False):
+    with engine.begin() as conn:
+        ensure_migrations_table(conn)
+        done = applied_migrations(conn)
+
+    for migration in MIGRATIONS:
+        if migration.NAME in done:
+            continue
+        print(f"Applying {migration.NAME} ...")
+        run_migration(migration)
+
+    if not verify:
+        return True
+
+    ok = True
+    with engine.connect() as conn:
+        for migration in MIGRATIONS:
+            if hasattr(migration, "verify"):
+                print(f"\nVerifying {migration.NAME}")
+                ok = migration.verify(conn) and ok
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply schema migrations")
+    parser.add_argument("--verify", action="store_true", help="check query plans after migrating")
+    args = parser.parse_args()
+
+    ok = migrate(verify=args.verify)
+    print("Database is up to date." if ok else "\nSome hot queries are not using their index.")
+    raise SystemExit(0 if ok else 1)
@@ -0,0 +1,36 @@
+# migrations/__init__.py
+# Ordered schema migrations for databases created before a model change.
+# Each module exposes NAME and upgrade(connection); upgrades must be safe to
+# re-run. Modules that set AUTOCOMMIT = True get a connection outside of a
+# transaction (needed for CREATE INDEX CONCURRENTLY on PostgreSQL).
+from . import m001_hot_query_indexes
+from . import m002_booking_intervals
+from . import m003_class_capacity
+from . import m004_health_metric_rollups
+from . import m005_email_lower_indexes
+from . import m006_report_indexes
+from . import m007_room_occupancy
+from . import m008_trainer_workload
+from . import m009_health_metric_partitions
+from . import m010_archive_tables
+from . import m011_maintenance_queue
+from . import m012_sqlite_booking_overlap
+from . import m013_one_time_availability
+from . import m014_occupancy_seats_from_registrations
+
+MIGRATIONS = [
+    m001_hot_query_indexes,
+    m002_booking_intervals,
+    m003_class_capacity,
+    m004_health_metric_rollups,
+    m005_email_lower_indexes,
+    m006_report_indexes,
+    m007_room_occupancy,
+    m008_trainer_workload,
+    m009_health_metric_partitions,
+    m010_archive_tables,
+    m011_maintenance_queue,
+    m012_sqlite_booking_overlap,
+    m013_one_time_availability,
+    m014_occupancy_seats_from_registrations,
+]
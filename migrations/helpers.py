@@ -0,0 +1,10 @@
+# migrations/helpers.py
+from sqlalchemy import inspect
+
+
+def has_column(connection, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(connection).get_columns(table))
+
+
+def has_check_constraint(connection, table: str, name: str) -> bool:
+    return any(c["name"] == name for c in inspect(connection).get_check_constraints(table))
@@ -0,0 +1,121 @@
+# migrations/m001_hot_query_indexes.py
+# Composite / partial indexes for the service-layer hot queries
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+
+NAME = "001_hot_query_indexes"
+AUTOCOMMIT = True
+
+# The indexes as they were when this migration shipped. Later index changes
+# get their own migration, so this list is not read from the models.
+# (name, table, columns, partial-index predicate)
+INDEXES = [
+    ("ix_class_registrations_member_attendance", "class_registrations", "member_id, attendance_status", None),
+    ("ix_equipment_maintenance_reported", "equipment_maintenance", "reported_at", None),
+    ("ix_equipment_maintenance_equipment", "equipment_maintenance", "equipment_id", None),
+    ("ix_classes_trainer_start", "classes", "trainer_id, start_time", None),
+    ("ix_classes_room_start_live", "classes", "room_id, start_time, end_time", "status <> 'cancelled'"),
+    ("ix_fitness_goals_member_status", "fitness_goals", "member_id, status", None),
+    ("ix_health_metrics_member_recorded", "health_metrics", "member_id, recorded_at DESC", None),
+    ("ix_pt_sessions_member_start", "personal_training_sessions", "member_id, start_time", None),
+    ("ix_pt_sessions_trainer_start", "personal_training_sessions", "trainer_id, start_time", None),
+    ("ix_pt_sessions_room_start_live", "personal_training_sessions", "room_id, start_time", "status <> 'cancelled'"),
+    ("ix_trainer_availabilities_trainer_day", "trainer_availabilities", "trainer_id, day_of_week", None),
+]
+
+# (description, query, index the planner should pick)
+HOT_QUERIES = [
+    (
+        "dashboard latest metric",
+        "SELECT * FROM health_metrics WHERE member_id = 1 "
+        "ORDER BY recorded_at DESC LIMIT 1",
+        "ix_health_metrics_member_recorded",
+    ),
+    (
+        "dashboard active goals",
+        "SELECT * FROM fitness_goals WHERE member_id = 1 AND status = 'active'",
+        "ix_fitness_goals_member_status",
+    ),
+    (
+        "dashboard classes attended",
+        "SELECT count(*) FROM class_registrations "
+        "WHERE member_id = 1 AND attendance_status = 'attended'",
+        "ix_class_registrations_member_attendance",
+    ),
+    (
+        "dashboard upcoming PT sessions",
+        "SELECT * FROM personal_training_sessions "
+        "WHERE member_id = 1 AND start_time >= CURRENT_TIMESTAMP ORDER BY start_time",
+        "ix_pt_sessions_member_start",
+    ),
+    (
+        "trainer schedule PT sessions",
+        "SELECT * FROM personal_training_sessions "
+        "WHERE trainer_id = 1 AND start_time >= CURRENT_TIMESTAMP ORDER BY start_time",
+        "ix_pt_sessions_trainer_start",
+    ),
+    (
+        "trainer schedule classes",
+        "SELECT * FROM classes "
+        "WHERE trainer_id = 1 AND start_time >= CURRENT_TIMESTAMP ORDER BY start_time",
+        "ix_classes_trainer_start",
+    ),
+    (
+        "availability overlap check",
+        "SELECT * FROM trainer_availabilities WHERE trainer_id = 1 AND day_of_week = 1",
+        "ix_trainer_availabilities_trainer_day",
+    ),
+    (
+        "recent maintenance records",
+        "SELECT * FROM equipment_maintenance ORDER BY reported_at DESC LIMIT 20",
+        "ix_equipment_maintenance_reported",
+    ),
+]
+
+
+def _concurrently(ddl, dialect):
+    # build without blocking writes on live tables
+    if dialect.name == "postgresql":
+        ddl = ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+    return ddl
+
+
+def create_index_sql(index, dialect):
+    return _concurrently(str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect)), dialect)
+
+
+def upgrade(connection):
+    for name, table, columns, where in INDEXES:
+        ddl = f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"
+        if where:
+            ddl += f" WHERE {where}"
+        connection.execute(text(_concurrently(ddl, connection.dialect)))
+
+
+def explain(connection, query: str) -> str:
+    if connection.dialect.name == "postgresql":
+        rows = connection.execute(text("EXPLAIN " + query)).fetchall()
+        return "\n".join(r[0] for r in rows)
+    rows = connection.execute(text("EXPLAIN QUERY PLAN " + query)).fetchall()
+    return "\n".join(str(r[-1]) for r in rows)
+
+
+def verify(connection):
+    # Check the planner can serve each hot query from its index.
+    # Sequential scans are disabled so a small dev table still shows the plan
+    # that would be used at production volume.
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET enable_seqscan = off"))
+
+    ok = True
+    for label, query, index_name in HOT_QUERIES:
+        plan = explain(connection, query)
+        used = index_name in plan
+        ok = ok and used
+        print(f"[{'OK' if used else 'MISSING'}] {label} -> {index_name}")
+        if not used:
+            print("    " + plan.replace("\n", "\n    "))
+
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("RESET enable_seqscan"))
+    return ok
@@ -0,0 +1,77 @@
+# migrations/m002_booking_intervals.py
+# booking_intervals table + exclusion constraints, backfilled from live
+# classes and PT sessions
+from sqlalchemy import text
+
+from models import BookingInterval
+from models.booking_interval import ROOM_OVERLAP_CONSTRAINT, TRAINER_OVERLAP_CONSTRAINT
+from .m001_hot_query_indexes import explain
+
+NAME = "002_booking_intervals"
+
+
+def upgrade(connection):
+    BookingInterval.__table__.create(bind=connection, checkfirst=True)
+
+    # Existing double bookings can't satisfy the constraints; skip them here
+    # and report how many so they can be fixed by hand.
+    on_conflict = " ON CONFLICT DO NOTHING" if connection.dialect.name == "postgresql" else ""
+    skipped = 0
+    for source, key, table in (
+        ("classes", "class_id", "classes"),
+        ("sessions", "session_id", "personal_training_sessions"),
+    ):
+        result = connection.execute(
+            text(
+                f"INSERT INTO booking_intervals "
+                f"(room_id, trainer_id, {key}, start_time, end_time) "
+                f"SELECT t.room_id, t.trainer_id, t.{key}, t.start_time, t.end_time "
+                f"FROM {table} t "
+                f"WHERE t.status <> 'cancelled' AND t.end_time > t.start_time "
+                f"AND NOT EXISTS (SELECT 1 FROM booking_intervals b WHERE b.{key} = t.{key})"
+                f"{on_conflict}"
+            )
+        )
+        total = connection.execute(
+            text(f"SELECT count(*) FROM {table} WHERE status <> 'cancelled'")
+        ).scalar()
+        indexed = connection.execute(
+            text(f"SELECT count(*) FROM booking_intervals WHERE {key} IS NOT NULL")
+        ).scalar()
+        skipped += total - indexed
+        print(f"  {source}: {result.rowcount} intervals added")
+
+    if skipped:
+        print(f"  WARNING: {skipped} existing bookings overlap another booking and were not indexed")
+
+
+# The overlap checks (app/scheduling.py) read booking_intervals. PostgreSQL
+# serves them from the exclusion constraints' GiST indexes, SQLite from the
+# start_time index.
+OVERLAP_QUERIES = [
+    ("room overlap check", "room_id", ROOM_OVERLAP_CONSTRAINT),
+    ("trainer overlap check", "trainer_id", TRAINER_OVERLAP_CONSTRAINT),
+]
+
+
+def verify(connection):
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET enable_seqscan = off"))
+
+    ok = True
+    for label, column, constraint in OVERLAP_QUERIES:
+        index_name = constraint if connection.dialect.name == "postgresql" else "ix_booking_intervals_start"
+        plan = explain(
+            connection,
+            f"SELECT * FROM booking_intervals WHERE {column} = 1 "
+            "AND start_time < CURRENT_TIMESTAMP AND end_time > CURRENT_TIMESTAMP",
+        )
+        used = index_name in plan
+        ok = ok and used
+        print(f"[{'OK' if used else 'MISSING'}] {label} -> {index_name}")
+        if not used:
+            print("    " + plan.replace("\n", "\n    "))
+
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("RESET enable_seqscan"))
+    return ok
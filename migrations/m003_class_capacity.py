@@ -0,0 +1,39 @@
+# migrations/m003_class_capacity.py
+# classes.registered_count (seats taken) + waitlist index
+from sqlalchemy import Index, text
+
+from models import ClassRegistration
+from .helpers import has_column, has_check_constraint
+
+NAME = "003_class_capacity"
+
+
+def upgrade(connection):
+    if not has_column(connection, "classes", "registered_count"):
+        connection.execute(
+            text("ALTER TABLE classes ADD COLUMN registered_count INTEGER NOT NULL DEFAULT 0")
+        )
+
+    connection.execute(
+        text(
+            "UPDATE classes SET registered_count = ("
+            " SELECT count(*) FROM class_registrations r"
+            " WHERE r.class_id = classes.class_id"
+            " AND r.attendance_status IN ('registered', 'attended'))"
+        )
+    )
+
+    # SQLite can't add constraints to an existing table
+    if connection.dialect.name == "postgresql" and not has_check_constraint(
+        connection, "classes", "ck_classes_registered_count"
+    ):
+        connection.execute(
+            text(
+                "ALTER TABLE classes ADD CONSTRAINT ck_classes_registered_count "
+                "CHECK (registered_count >= 0 AND registered_count <= capacity)"
+            )
+        )
+
+    for index in ClassRegistration.__table_args__:
+        if isinstance(index, Index) and index.name == "ix_class_registrations_waitlist":
+            index.create(bind=connection, checkfirst=True)
@@ -0,0 +1,12 @@
+# migrations/m004_health_metric_rollups.py
+# Daily / weekly health-metric rollup tables, backfilled from raw readings
+from models import HealthMetricDaily, HealthMetricWeekly
+from app.rollups import rebuild_rollups
+
+NAME = "004_health_metric_rollups"
+
+
+def upgrade(connection):
+    HealthMetricDaily.__table__.create(bind=connection, checkfirst=True)
+    HealthMetricWeekly.__table__.create(bind=connection, checkfirst=True)
+    rebuild_rollups(connection)
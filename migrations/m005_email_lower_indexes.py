@@ -0,0 +1,37 @@
+# migrations/m005_email_lower_indexes.py
+# lower(email) functional indexes behind the case-insensitive identity lookups
+from sqlalchemy import text
+
+from models.member import EMAIL_LOWER_INDEX as MEMBER_EMAIL_INDEX
+from models.trainer import EMAIL_LOWER_INDEX as TRAINER_EMAIL_INDEX
+from models.admin_staff import EMAIL_LOWER_INDEX as ADMIN_EMAIL_INDEX
+from .m001_hot_query_indexes import create_index_sql, explain
+
+NAME = "005_email_lower_indexes"
+AUTOCOMMIT = True
+
+INDEXES = [MEMBER_EMAIL_INDEX, TRAINER_EMAIL_INDEX, ADMIN_EMAIL_INDEX]
+
+
+def upgrade(connection):
+    for index in INDEXES:
+        connection.execute(text(create_index_sql(index, connection.dialect)))
+
+
+def verify(connection):
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET enable_seqscan = off"))
+
+    ok = True
+    for index in INDEXES:
+        table = index.table.name
+        plan = explain(connection, f"SELECT * FROM {table} WHERE lower(email) = 'someone@club.com'")
+        used = index.name in plan
+        ok = ok and used
+        print(f"[{'OK' if used else 'MISSING'}] {table} email lookup -> {index.name}")
+        if not used:
+            print("    " + plan.replace("\n", "\n    "))
+
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("RESET enable_seqscan"))
+    return ok
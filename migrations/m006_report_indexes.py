@@ -0,0 +1,38 @@
+# migrations/m006_report_indexes.py
+# start_time index for the date-partitioned booking scans in app/reports.py
+from sqlalchemy import text
+
+from models import BookingInterval
+from .m001_hot_query_indexes import create_index_sql, explain
+
+NAME = "006_report_indexes"
+AUTOCOMMIT = True
+
+INDEXES = [
+    index for index in BookingInterval.__table__.indexes
+    if index.name == "ix_booking_intervals_start"
+]
+
+
+def upgrade(connection):
+    for index in INDEXES:
+        connection.execute(text(create_index_sql(index, connection.dialect)))
+
+
+def verify(connection):
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET enable_seqscan = off"))
+
+    plan = explain(
+        connection,
+        "SELECT room_id, count(*) FROM booking_intervals "
+        "WHERE start_time >= '2025-01-01' AND start_time < '2025-02-01' GROUP BY room_id",
+    )
+    ok = "ix_booking_intervals_start" in plan
+    print(f"[{'OK' if ok else 'MISSING'}] report partition scan -> ix_booking_intervals_start")
+    if not ok:
+        print("    " + plan.replace("\n", "\n    "))
+
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("RESET enable_seqscan"))
+    return ok
@@ -0,0 +1,12 @@
+# migrations/m007_room_occupancy.py
+# Hourly room-occupancy buckets, backfilled from the live bookings
+from models import RoomOccupancyHourly
+from app.occupancy import rebuild_occupancy
+
+NAME = "007_room_occupancy"
+
+
+def upgrade(connection):
+    RoomOccupancyHourly.__table__.create(bind=connection, checkfirst=True)
+    # the archive tables only arrive in m010
+    rebuild_occupancy(connection, include_archive=False)
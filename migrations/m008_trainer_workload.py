@@ -0,0 +1,17 @@
+# migrations/m008_trainer_workload.py
+# Weekly trainer workload summary and its stale-week queue, backfilled from
+# the live bookings
+from models import TrainerWorkloadDirty, TrainerWorkloadWeekly
+from app.workload import rebuild_workload
+from . import m013_one_time_availability
+
+NAME = "008_trainer_workload"
+
+
+def upgrade(connection):
+    TrainerWorkloadWeekly.__table__.create(bind=connection, checkfirst=True)
+    TrainerWorkloadDirty.__table__.create(bind=connection, checkfirst=True)
+    # the rebuild reads trainer_availabilities as the model has it now, with
+    # m013's column; the archive tables only arrive in m010
+    m013_one_time_availability.upgrade(connection)
+    rebuild_workload(connection, include_archive=False)
@@ -0,0 +1,71 @@
+# migrations/m009_health_metric_partitions.py
+# Monthly range partitions for health_metrics on PostgreSQL. The existing
+# table is swapped for a partitioned one and its rows copied into one
+# partition per month; the table is locked while it is copied, so run this in
+# a quiet period. Nothing to do on other databases.
+# Each partition gets its own copy of the table's indexes, named after the
+# parent index (models/partitioning.py), so the m001 hot-query check still
+# finds ix_health_metrics_member_recorded in the plan.
+import re
+from datetime import date
+
+from sqlalchemy import text
+
+from models import HealthMetric
+from models.partitioning import add_months, ensure_partitions, is_partitioned, month_start, partition_name
+from .m001_hot_query_indexes import explain
+
+NAME = "009_health_metric_partitions"
+
+OLD = "health_metrics_unpartitioned"
+
+
+def upgrade(connection):
+    table = HealthMetric.__table__
+    if connection.dialect.name != "postgresql" or is_partitioned(connection, table):
+        return
+    connection.execute(text(f"LOCK TABLE {table.name} IN ACCESS EXCLUSIVE MODE"))
+    first = connection.execute(text(f"SELECT min(recorded_at) FROM {table.name}")).scalar()
+
+    # move the old table, and the index / sequence names it holds, aside
+    connection.execute(text(f"ALTER TABLE {table.name} RENAME TO {OLD}"))
+    connection.execute(text(f"ALTER TABLE {OLD} RENAME CONSTRAINT {table.name}_pkey TO {OLD}_pkey"))
+    for index in table.indexes:
+        connection.execute(text(f"ALTER INDEX IF EXISTS {index.name} RENAME TO {index.name}_unpartitioned"))
+    connection.execute(text(
+        f"ALTER SEQUENCE IF EXISTS {table.name}_metric_id_seq RENAME TO {OLD}_metric_id_seq"
+    ))
+
+    # partitioned parent with DEFAULT and upcoming months (see models/partitioning.py),
+    # then one partition per month of history so no row lands in DEFAULT
+    table.create(bind=connection)
+    ensure_partitions(connection, table, first=first)
+
+    columns = ", ".join(c.name for c in table.c)
+    connection.execute(text(f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {OLD}"))
+    connection.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'metric_id'), "
+        f"COALESCE(max(metric_id), 0) + 1, false) FROM {table.name}"
+    ))
+    connection.execute(text(f"DROP TABLE {OLD}"))
+
+
+def verify(connection):
+    label = "health history month -> one partition"
+    if connection.dialect.name != "postgresql":
+        print(f"[SKIP] {label} (PostgreSQL only)")
+        return True
+    month = month_start(date.today())
+    plan = explain(
+        connection,
+        "SELECT * FROM health_metrics WHERE member_id = 1 "
+        f"AND recorded_at >= '{month}' AND recorded_at < '{add_months(month, 1)}' "
+        "ORDER BY recorded_at DESC",
+    )
+    # relations scanned, e.g. "Index Scan ... on health_metrics_y2025m03 health_metrics_1"
+    scanned = set(re.findall(r" on (health_metrics\w*)", plan))
+    ok = scanned == {partition_name(HealthMetric.__table__, month)}
+    print(f"[{'OK' if ok else 'MISSING'}] {label}")
+    if not ok:
+        print("    " + plan.replace("\n", "\n    "))
+    return ok
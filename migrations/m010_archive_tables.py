@@ -0,0 +1,11 @@
+# migrations/m010_archive_tables.py
+# Archive tables for finished classes, registrations and PT sessions
+# (filled by python3 -m app.archive run)
+from models import ArchivedClass, ArchivedClassRegistration, ArchivedPTSession
+
+NAME = "010_archive_tables"
+
+
+def upgrade(connection):
+    for model in (ArchivedClass, ArchivedClassRegistration, ArchivedPTSession):
+        model.__table__.create(bind=connection, checkfirst=True)
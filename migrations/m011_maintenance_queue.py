@@ -0,0 +1,54 @@
+# migrations/m011_maintenance_queue.py
+# equipment_maintenance priority / claim columns + the partial work-queue index
+from sqlalchemy import text
+
+from models.equipment_maintenance import QUEUE_INDEX
+from .helpers import has_column
+from .m001_hot_query_indexes import create_index_sql, explain
+
+NAME = "011_maintenance_queue"
+AUTOCOMMIT = True
+
+COLUMNS = {
+    "priority": "INTEGER NOT NULL DEFAULT 0",
+    "claimed_by_admin_id": "INTEGER REFERENCES admin_staff (admin_id)",
+    "claimed_at": "TIMESTAMP",
+}
+
+QUEUE_QUERIES = [
+    (
+        "claim next issue",
+        "SELECT * FROM equipment_maintenance WHERE status IN ('open', 'in_progress') AND status = 'open' "
+        "ORDER BY priority DESC, reported_at, maintenance_id LIMIT 1",
+    ),
+    (
+        "maintenance queue listing",
+        "SELECT * FROM equipment_maintenance WHERE status IN ('open', 'in_progress') "
+        "ORDER BY status, priority DESC, reported_at LIMIT 20",
+    ),
+]
+
+
+def upgrade(connection):
+    for column, ddl in COLUMNS.items():
+        if not has_column(connection, "equipment_maintenance", column):
+            connection.execute(text(f"ALTER TABLE equipment_maintenance ADD COLUMN {column} {ddl}"))
+    connection.execute(text(create_index_sql(QUEUE_INDEX, connection.dialect)))
+
+
+def verify(connection):
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET enable_seqscan = off"))
+
+    ok = True
+    for description, query in QUEUE_QUERIES:
+        plan = explain(connection, query)
+        used = QUEUE_INDEX.name in plan
+        ok = ok and used
+        print(f"[{'OK' if used else 'MISSING'}] {description} -> {QUEUE_INDEX.name}")
+        if not used:
+            print("    " + plan.replace("\n", "\n    "))
+
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("RESET enable_seqscan"))
+    return ok
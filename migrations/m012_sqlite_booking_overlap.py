@@ -0,0 +1,15 @@
+# migrations/m012_sqlite_booking_overlap.py
+# SQLite: room / trainer non-overlap triggers on booking_intervals (the
+# PostgreSQL exclusion constraints from 002 have no SQLite equivalent)
+from sqlalchemy import text
+
+from models.booking_interval import SQLITE_OVERLAP_TRIGGERS
+
+NAME = "012_sqlite_booking_overlap"
+
+
+def upgrade(connection):
+    if connection.dialect.name != "sqlite":
+        return
+    for trigger in SQLITE_OVERLAP_TRIGGERS:
+        connection.execute(text(trigger))
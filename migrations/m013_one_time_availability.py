@@ -0,0 +1,14 @@
+# migrations/m013_one_time_availability.py
+# trainer_availabilities.available_on: the date a one-time slot applies to.
+# One-time rows added before this carry no date and are no longer offered;
+# trainers re-enter them with the day they meant.
+from sqlalchemy import text
+
+from .helpers import has_column
+
+NAME = "013_one_time_availability"
+
+
+def upgrade(connection):
+    if not has_column(connection, "trainer_availabilities", "available_on"):
+        connection.execute(text("ALTER TABLE trainer_availabilities ADD COLUMN available_on DATE"))
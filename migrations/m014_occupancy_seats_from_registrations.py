@@ -0,0 +1,10 @@
+# migrations/m014_occupancy_seats_from_registrations.py
+# Class seats in room_occupancy_hourly count registered members, no longer
+# the class capacity: recompute the buckets
+from app.occupancy import rebuild_occupancy
+
+NAME = "014_occupancy_seats_from_registrations"
+
+
+def upgrade(connection):
+    rebuild_occupancy(connection)
@@ -13,3 +13,8 @@ from .class_registration import ClassRegistration
 from .trainer_availability import TrainerAvailability
 from .equipment import Equipment
 from .equipment_maintenance import EquipmentMaintenance
+from .booking_interval import BookingInterval
+from .health_metric_rollup import HealthMetricDaily, HealthMetricWeekly
+from .room_occupancy import RoomOccupancyHourly
+from .trainer_workload import TrainerWorkloadWeekly, TrainerWorkloadDirty
+from .archive import ArchivedClass, ArchivedClassRegistration, ArchivedPTSession
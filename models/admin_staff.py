@@ -1,5 +1,5 @@
 # models/admin_staff.py
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Index, func
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -18,11 +18,18 @@ class AdminStaff(Base):
     classes_created = relationship(
         "FitnessClass",
         back_populates="created_by_admin",
+        lazy="raise_on_sql",
     )
     maintenance_records = relationship(
         "EquipmentMaintenance",
         back_populates="admin",
+        foreign_keys="EquipmentMaintenance.admin_id",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
         return f"<AdminStaff(id={self.admin_id}, email={self.email})>"
+
+
+# case-insensitive email lookups (app/identity_cache.py)
+EMAIL_LOWER_INDEX = Index("ix_admin_staff_email_lower", func.lower(AdminStaff.email))
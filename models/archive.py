@@ -0,0 +1,112 @@
+# models/archive.py
+# Cold copies of finished classes (with their registrations) and PT sessions,
+# moved out of the hot tables by app/archive.py. Same columns and keys as the
+# hot rows plus archived_at; no foreign keys, so members / rooms can change
+# without touching history. Only full-history reads look here.
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime, Index, func, literal, null, select, union_all
+
+from .base import Base
+from .booking_interval import BookingInterval
+from .fitness_class import FitnessClass
+
+
+class ArchivedClass(Base):
+    __tablename__ = "classes_archive"
+    __table_args__ = (
+        Index("ix_classes_archive_start", "start_time"),
+    )
+
+    class_id            = Column(Integer, primary_key=True, autoincrement=False)
+    trainer_id          = Column(Integer, nullable=False)
+    room_id             = Column(Integer, nullable=False)
+    created_by_admin_id = Column(Integer, nullable=False)
+    class_name          = Column(String, nullable=False)
+    description         = Column(String, nullable=True)
+    start_time          = Column(DateTime, nullable=False)
+    end_time            = Column(DateTime, nullable=False)
+    capacity            = Column(Integer, nullable=False)
+    registered_count    = Column(Integer, nullable=False)
+    status              = Column(String, nullable=False)
+    archived_at         = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<ArchivedClass(id={self.class_id}, name={self.class_name})>"
+
+
+class ArchivedClassRegistration(Base):
+    __tablename__ = "class_registrations_archive"
+    __table_args__ = (
+        # dashboard "classes attended" + member history
+        Index("ix_class_registrations_archive_member", "member_id", "attendance_status"),
+        Index("ix_class_registrations_archive_class", "class_id"),
+    )
+
+    registration_id   = Column(Integer, primary_key=True, autoincrement=False)
+    class_id          = Column(Integer, nullable=False)
+    member_id         = Column(Integer, nullable=False)
+    registered_at     = Column(DateTime, nullable=False)
+    attendance_status = Column(String, nullable=False)
+    archived_at       = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<ArchivedClassRegistration(id={self.registration_id}, class_id={self.class_id})>"
+
+
+class ArchivedPTSession(Base):
+    __tablename__ = "personal_training_sessions_archive"
+    __table_args__ = (
+        Index("ix_pt_sessions_archive_member_start", "member_id", "start_time"),
+        Index("ix_pt_sessions_archive_start", "start_time"),
+    )
+
+    session_id  = Column(Integer, primary_key=True, autoincrement=False)
+    member_id   = Column(Integer, nullable=False)
+    trainer_id  = Column(Integer, nullable=False)
+    room_id     = Column(Integer, nullable=False)
+    start_time  = Column(DateTime, nullable=False)
+    end_time    = Column(DateTime, nullable=False)
+    status      = Column(String, nullable=False)
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<ArchivedPTSession(id={self.session_id}, member_id={self.member_id})>"
+
+
+def booking_rows(start=None, end=None, include_archive: bool = True):
+    # Live bookings as (room_id, trainer_id, class_id, session_id, start_time,
+    # end_time, seats): booking_intervals, plus the non-cancelled archived
+    # classes / sessions when include_archive. start / end bound start_time
+    # in every branch so each one can use its start_time index.
+    bi = BookingInterval
+    hot = (
+        select(
+            bi.room_id, bi.trainer_id, bi.class_id, bi.session_id, bi.start_time, bi.end_time,
+            func.coalesce(FitnessClass.registered_count, 1).label("seats"),
+        )
+        .outerjoin(FitnessClass, FitnessClass.class_id == bi.class_id)
+    )
+    branches = [(hot, bi.start_time)]
+    if include_archive:
+        c, s = ArchivedClass, ArchivedPTSession
+        branches.append((
+            select(c.room_id, c.trainer_id, c.class_id, null().label("session_id"),
+                   c.start_time, c.end_time, c.registered_count.label("seats"))
+            .where(c.status != "cancelled"),
+            c.start_time,
+        ))
+        branches.append((
+            select(s.room_id, s.trainer_id, null().label("class_id"), s.session_id,
+                   s.start_time, s.end_time, literal(1).label("seats"))
+            .where(s.status != "cancelled"),
+            s.start_time,
+        ))
+    selects = []
+    for query, start_column in branches:
+        if start is not None:
+            query = query.where(start_column >= start)
+        if end is not None:
+            query = query.where(start_column < end)
+        selects.append(query)
+    return union_all(*selects) if len(selects) > 1 else selects[0]
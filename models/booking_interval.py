@@ -0,0 +1,204 @@
+# models/booking_interval.py
+# One row per live (non-cancelled) class or PT session. PostgreSQL exclusion
+# constraints on this table reject a room or trainer being booked twice for
+# overlapping times, for classes and PT sessions alike; on SQLite, triggers
+# do the same (SQLite runs one writer at a time, so the check can't race).
+from sqlalchemy import (
+    Column,
+    Index,
+    Integer,
+    DateTime,
+    ForeignKey,
+    CheckConstraint,
+    DDL,
+    event,
+    text,
+    insert,
+    delete,
+    inspect,
+    or_,
+)
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
+
+from .base import Base
+from .fitness_class import FitnessClass
+from .personal_training_session import PersonalTrainingSession
+
+ROOM_OVERLAP_CONSTRAINT = "ex_booking_room_overlap"
+TRAINER_OVERLAP_CONSTRAINT = "ex_booking_trainer_overlap"
+
+_PERIOD = "tsrange(start_time, end_time, '[)')"
+
+
+class BookingInterval(Base):
+    __tablename__ = "booking_intervals"
+    __table_args__ = (
+        CheckConstraint("end_time > start_time", name="ck_booking_interval_order"),
+        CheckConstraint(
+            "(class_id IS NULL) <> (session_id IS NULL)",
+            name="ck_booking_interval_source",
+        ),
+        # date-partitioned scans in app/reports.py
+        Index("ix_booking_intervals_start", "start_time"),
+        ExcludeConstraint(
+            ("room_id", "="),
+            (text(_PERIOD), "&&"),
+            name=ROOM_OVERLAP_CONSTRAINT,
+            using="gist",
+        ).ddl_if(dialect="postgresql"),
+        ExcludeConstraint(
+            ("trainer_id", "="),
+            (text(_PERIOD), "&&"),
+            name=TRAINER_OVERLAP_CONSTRAINT,
+            using="gist",
+        ).ddl_if(dialect="postgresql"),
+    )
+
+    interval_id = Column(Integer, primary_key=True, index=True)
+    room_id     = Column(Integer, ForeignKey("rooms.room_id"), nullable=False)
+    trainer_id  = Column(Integer, ForeignKey("trainers.trainer_id"), nullable=False)
+    class_id    = Column(Integer, ForeignKey("classes.class_id", ondelete="CASCADE"), nullable=True, unique=True)
+    session_id  = Column(Integer, ForeignKey("personal_training_sessions.session_id", ondelete="CASCADE"), nullable=True, unique=True)
+    start_time  = Column(DateTime, nullable=False)
+    end_time    = Column(DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<BookingInterval(id={self.interval_id}, room_id={self.room_id}, trainer_id={self.trainer_id})>"
+
+
+# btree_gist lets the exclusion constraints mix "=" on ints with "&&" on ranges
+event.listen(
+    BookingInterval.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+
+
+# SQLite stand-in for the exclusion constraints. The error message carries
+# the constraint name, so overlap_conflict() reads both databases the same.
+def _overlap_trigger(event_clause, exclude_self):
+    name = "insert" if event_clause == "INSERT" else "update"
+    same_row = " AND b.interval_id <> NEW.interval_id" if exclude_self else ""
+    checks = "".join(
+        f" SELECT RAISE(ABORT, '{constraint}') WHERE EXISTS ("
+        f"SELECT 1 FROM booking_intervals b WHERE b.{column} = NEW.{column}"
+        f" AND b.start_time < NEW.end_time AND b.end_time > NEW.start_time{same_row});"
+        for column, constraint in (
+            ("room_id", ROOM_OVERLAP_CONSTRAINT),
+            ("trainer_id", TRAINER_OVERLAP_CONSTRAINT),
+        )
+    )
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS tr_booking_intervals_overlap_{name} "
+        f"BEFORE {event_clause} ON booking_intervals FOR EACH ROW BEGIN{checks} END"
+    )
+
+
+SQLITE_OVERLAP_TRIGGERS = [
+    _overlap_trigger("INSERT", exclude_self=False),
+    _overlap_trigger("UPDATE OF room_id, trainer_id, start_time, end_time", exclude_self=True),
+]
+
+for _trigger in SQLITE_OVERLAP_TRIGGERS:
+    event.listen(
+        BookingInterval.__table__, "after_create", DDL(_trigger).execute_if(dialect="sqlite")
+    )
+
+
+def overlap_conflict(exc):
+    # Map an IntegrityError from a flush/commit to "room", "trainer" or None
+    orig = getattr(exc, "orig", None)
+    diag = getattr(orig, "diag", None)
+    name = getattr(diag, "constraint_name", None) or str(orig or exc)
+    if ROOM_OVERLAP_CONSTRAINT in name:
+        return "room"
+    if TRAINER_OVERLAP_CONSTRAINT in name:
+        return "trainer"
+    return None
+
+
+def find_overlaps(session, start_time, end_time, room_id=None, trainer_id=None):
+    # Live bookings overlapping [start_time, end_time) in a room or for a trainer
+    filters = []
+    if room_id is not None:
+        filters.append(BookingInterval.room_id == room_id)
+    if trainer_id is not None:
+        filters.append(BookingInterval.trainer_id == trainer_id)
+    return (
+        session.query(BookingInterval)
+        .filter(
+            or_(*filters),
+            BookingInterval.start_time < end_time,
+            BookingInterval.end_time > start_time,
+        )
+        .order_by(BookingInterval.start_time)
+        .all()
+    )
+
+
+def bulk_insert_class_intervals(session, classes):
+    # Bulk inserts bypass the mapper events below; callers that insert classes
+    # with insert(FitnessClass) pass the new rows (dicts with class_id, room_id,
+    # trainer_id, start_time, end_time, status) here in the same transaction
+    rows = [
+        dict(
+            class_id=c["class_id"],
+            room_id=c["room_id"],
+            trainer_id=c["trainer_id"],
+            start_time=c["start_time"],
+            end_time=c["end_time"],
+        )
+        for c in classes
+        if _is_live(c["status"])
+    ]
+    if rows:
+        session.execute(insert(BookingInterval), rows)
+
+
+def _is_live(status) -> bool:
+    return status != "cancelled"
+
+
+def _sync_interval(connection, key_column, key_value, booking, replace=False):
+    if replace:
+        connection.execute(delete(BookingInterval).where(key_column == key_value))
+    if _is_live(booking.status):
+        connection.execute(
+            insert(BookingInterval).values(
+                room_id=booking.room_id,
+                trainer_id=booking.trainer_id,
+                start_time=booking.start_time,
+                end_time=booking.end_time,
+                **{key_column.key: key_value},
+            )
+        )
+
+
+_TRACKED = ("room_id", "trainer_id", "start_time", "end_time", "status")
+
+
+def _changed(target) -> bool:
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in _TRACKED)
+
+
+@event.listens_for(FitnessClass, "after_insert")
+def _class_inserted(mapper, connection, target):
+    _sync_interval(connection, BookingInterval.class_id, target.class_id, target)
+
+
+@event.listens_for(FitnessClass, "after_update")
+def _class_updated(mapper, connection, target):
+    if _changed(target):
+        _sync_interval(connection, BookingInterval.class_id, target.class_id, target, replace=True)
+
+
+@event.listens_for(PersonalTrainingSession, "after_insert")
+def _session_inserted(mapper, connection, target):
+    _sync_interval(connection, BookingInterval.session_id, target.session_id, target)
+
+
+@event.listens_for(PersonalTrainingSession, "after_update")
+def _session_updated(mapper, connection, target):
+    if _changed(target):
+        _sync_interval(connection, BookingInterval.session_id, target.session_id, target, replace=True)
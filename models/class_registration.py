@@ -1,5 +1,5 @@
 # models/class_registration.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -10,13 +10,24 @@ class ClassRegistration(Base):
     __tablename__ = "class_registrations"
     __table_args__ = (
         UniqueConstraint("class_id", "member_id", name="uq_class_member"),
+        # dashboard "classes attended" count
+        Index("ix_class_registrations_member_attendance", "member_id", "attendance_status"),
+        # waitlist in arrival order, for promotion on cancellation
+        Index(
+            "ix_class_registrations_waitlist",
+            "class_id",
+            "registered_at",
+            "registration_id",
+            postgresql_where=text("attendance_status = 'waitlisted'"),
+            sqlite_where=text("attendance_status = 'waitlisted'"),
+        ),
     )
 
     registration_id   = Column(Integer, primary_key=True, index=True)
     class_id          = Column(Integer, ForeignKey("classes.class_id", ondelete="CASCADE"), nullable=False)
     member_id         = Column(Integer, ForeignKey("members.member_id", ondelete="CASCADE"), nullable=False)
     registered_at     = Column(DateTime, nullable=False, default=datetime.utcnow)
-    attendance_status = Column(String, nullable=False, default="registered")
+    attendance_status = Column(String, nullable=False, default="registered")  # registered, waitlisted, cancelled, attended
 
     fitness_class = relationship(
         "FitnessClass",
@@ -23,6 +23,7 @@ class Equipment(Base):
         "EquipmentMaintenance",
         back_populates="equipment",
         cascade="all, delete-orphan",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
@@ -1,5 +1,5 @@
 # models/equipment_maintenance.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -8,6 +8,11 @@ from .base import Base
 
 class EquipmentMaintenance(Base):
     __tablename__ = "equipment_maintenance"
+    __table_args__ = (
+        # "recent maintenance records" listing in update_maintenance_issue
+        Index("ix_equipment_maintenance_reported", "reported_at"),
+        Index("ix_equipment_maintenance_equipment", "equipment_id"),
+    )
 
     maintenance_id    = Column(Integer, primary_key=True, index=True)
     equipment_id      = Column(Integer, ForeignKey("equipment.equipment_id"), nullable=False)
@@ -17,6 +22,9 @@ class EquipmentMaintenance(Base):
     status            = Column(String, nullable=False, default="open")  # open, in_progress, resolved
     issue_description = Column(String, nullable=False)
     resolution_notes  = Column(String, nullable=True)
+    priority          = Column(Integer, nullable=False, default=0, server_default="0")  # higher first
+    claimed_by_admin_id = Column(Integer, ForeignKey("admin_staff.admin_id"), nullable=True)
+    claimed_at        = Column(DateTime, nullable=True)
 
     equipment = relationship(
         "Equipment",
@@ -25,7 +33,19 @@ class EquipmentMaintenance(Base):
     admin = relationship(
         "AdminStaff",
         back_populates="maintenance_records",
+        foreign_keys=[admin_id],
     )
 
     def __repr__(self) -> str:
         return f"<EquipmentMaintenance(id={self.maintenance_id}, equipment_id={self.equipment_id}, status={self.status})>"
+
+
+# work queue (claim_next_issue): unresolved issues only, in claim order
+QUEUE_INDEX = Index(
+    "ix_equipment_maintenance_queue",
+    EquipmentMaintenance.status,
+    EquipmentMaintenance.priority.desc(),
+    EquipmentMaintenance.reported_at,
+    postgresql_where=text("status IN ('open', 'in_progress')"),
+    sqlite_where=text("status IN ('open', 'in_progress')"),
+)
@@ -1,5 +1,5 @@
 # models/fitness_class.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, CheckConstraint, text
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -7,6 +7,23 @@ from .base import Base
 
 class FitnessClass(Base):
     __tablename__ = "classes"
+    __table_args__ = (
+        # trainer schedule view
+        Index("ix_classes_trainer_start", "trainer_id", "start_time"),
+        # room overlap check in create_class_booking
+        Index(
+            "ix_classes_room_start_live",
+            "room_id",
+            "start_time",
+            "end_time",
+            postgresql_where=text("status <> 'cancelled'"),
+            sqlite_where=text("status <> 'cancelled'"),
+        ),
+        CheckConstraint(
+            "registered_count >= 0 AND registered_count <= capacity",
+            name="ck_classes_registered_count",
+        ),
+    )
 
     class_id   = Column(Integer, primary_key=True, index=True)
     trainer_id = Column(Integer, ForeignKey("trainers.trainer_id"), nullable=False)
@@ -18,6 +35,8 @@ class FitnessClass(Base):
     start_time  = Column(DateTime, nullable=False)
     end_time    = Column(DateTime, nullable=False)
     capacity    = Column(Integer, nullable=False)
+    # seats taken (registered + attended); maintained by registration_service
+    registered_count = Column(Integer, nullable=False, default=0, server_default="0")
     status      = Column(String, nullable=False)  # scheduled, cancelled
 
     trainer = relationship(
@@ -36,6 +55,8 @@ class FitnessClass(Base):
         "ClassRegistration",
         back_populates="fitness_class",
         cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
@@ -1,5 +1,5 @@
 # models/fitness_goal.py
-from sqlalchemy import Column, Integer, String, Numeric, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -7,6 +7,9 @@ from .base import Base
 
 class FitnessGoal(Base):
     __tablename__ = "fitness_goals"
+    __table_args__ = (
+        Index("ix_fitness_goals_member_status", "member_id", "status"),
+    )
 
     goal_id      = Column(Integer, primary_key=True, index=True)
     member_id    = Column(Integer, ForeignKey("members.member_id", ondelete="CASCADE"), nullable=False)
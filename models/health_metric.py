@@ -1,13 +1,20 @@
 # models/health_metric.py
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 from .base import Base
+from .partitioning import partition_monthly
 
 
 class HealthMetric(Base):
     __tablename__ = "health_metrics"
+    __table_args__ = (
+        # dashboard latest metric + health history, newest first
+        Index("ix_health_metrics_member_recorded", "member_id", text("recorded_at DESC")),
+        # monthly range partitions on PostgreSQL (models/partitioning.py)
+        {"postgresql_partition_by": "RANGE (recorded_at)", "info": {"partition_key": "recorded_at"}},
+    )
 
     metric_id    = Column(Integer, primary_key=True, index=True)
     member_id    = Column(Integer, ForeignKey("members.member_id", ondelete="CASCADE"), nullable=False)
@@ -24,3 +31,6 @@ class HealthMetric(Base):
 
     def __repr__(self) -> str:
         return f"<HealthMetric(id={self.metric_id}, member_id={self.member_id}, recorded_at={self.recorded_at})>"
+
+
+partition_monthly(HealthMetric.__table__)
@@ -0,0 +1,143 @@
+# models/health_metric_rollup.py
+# Per member per day / per ISO week summaries of health_metrics.
+# Sums and counts (not averages) are stored so new readings can be folded in
+# with a single upsert; averages are computed when read.
+from datetime import timedelta
+
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, case, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import declared_attr
+
+from .base import Base
+from .health_metric import HealthMetric
+
+MEASURES = ("weight", "body_fat_pct", "heart_rate")
+
+
+class _RollupColumns:
+    @declared_attr
+    def member_id(cls):
+        return Column(Integer, ForeignKey("members.member_id", ondelete="CASCADE"), primary_key=True)
+
+    period_start  = Column(Date, primary_key=True)
+    reading_count = Column(Integer, nullable=False, default=0)
+
+    weight_count = Column(Integer, nullable=False, default=0)
+    weight_sum   = Column(Float, nullable=False, default=0)
+    weight_min   = Column(Float, nullable=True)
+    weight_max   = Column(Float, nullable=True)
+
+    body_fat_pct_count = Column(Integer, nullable=False, default=0)
+    body_fat_pct_sum   = Column(Float, nullable=False, default=0)
+    body_fat_pct_min   = Column(Float, nullable=True)
+    body_fat_pct_max   = Column(Float, nullable=True)
+
+    heart_rate_count = Column(Integer, nullable=False, default=0)
+    heart_rate_sum   = Column(Float, nullable=False, default=0)
+    heart_rate_min   = Column(Float, nullable=True)
+    heart_rate_max   = Column(Float, nullable=True)
+
+    def average(self, measure: str):
+        count = getattr(self, f"{measure}_count")
+        return getattr(self, f"{measure}_sum") / count if count else None
+
+
+class HealthMetricDaily(_RollupColumns, Base):
+    __tablename__ = "health_metric_daily"
+
+    def __repr__(self) -> str:
+        return f"<HealthMetricDaily(member_id={self.member_id}, day={self.period_start})>"
+
+
+class HealthMetricWeekly(_RollupColumns, Base):
+    __tablename__ = "health_metric_weekly"   # period_start is the Monday
+
+    def __repr__(self) -> str:
+        return f"<HealthMetricWeekly(member_id={self.member_id}, week={self.period_start})>"
+
+
+def day_of(ts):
+    return ts.date()
+
+
+def week_of(ts):
+    d = ts.date()
+    return d - timedelta(days=d.weekday())
+
+
+def _summarise(rows, period_of):
+    # Fold raw readings into one delta row per (member, period)
+    deltas = {}
+    for row in rows:
+        key = (row["member_id"], period_of(row["recorded_at"]))
+        delta = deltas.get(key)
+        if delta is None:
+            delta = dict(member_id=key[0], period_start=key[1], reading_count=0)
+            for m in MEASURES:
+                delta.update({f"{m}_count": 0, f"{m}_sum": 0.0, f"{m}_min": None, f"{m}_max": None})
+            deltas[key] = delta
+        delta["reading_count"] += 1
+        for m in MEASURES:
+            value = row.get(m)
+            if value is None:
+                continue
+            value = float(value)
+            delta[f"{m}_count"] += 1
+            delta[f"{m}_sum"] += value
+            if delta[f"{m}_min"] is None or value < delta[f"{m}_min"]:
+                delta[f"{m}_min"] = value
+            if delta[f"{m}_max"] is None or value > delta[f"{m}_max"]:
+                delta[f"{m}_max"] = value
+    # fixed key order keeps concurrent upserts from deadlocking
+    return [deltas[k] for k in sorted(deltas)]
+
+
+def _pick(current, incoming, better):
+    # min/max merge that treats NULL as "no value yet" on every backend
+    return case(
+        (incoming.is_(None), current),
+        (current.is_(None), incoming),
+        (better(incoming, current), incoming),
+        else_=current,
+    )
+
+
+def _upsert(connection, model, deltas):
+    table = model.__table__
+    insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(table)
+    excluded = stmt.excluded
+    updates = {"reading_count": table.c.reading_count + excluded.reading_count}
+    for m in MEASURES:
+        updates[f"{m}_count"] = table.c[f"{m}_count"] + excluded[f"{m}_count"]
+        updates[f"{m}_sum"] = table.c[f"{m}_sum"] + excluded[f"{m}_sum"]
+        updates[f"{m}_min"] = _pick(table.c[f"{m}_min"], excluded[f"{m}_min"], lambda a, b: a < b)
+        updates[f"{m}_max"] = _pick(table.c[f"{m}_max"], excluded[f"{m}_max"], lambda a, b: a > b)
+    stmt = stmt.on_conflict_do_update(index_elements=["member_id", "period_start"], set_=updates)
+    connection.execute(stmt, deltas)
+
+
+def apply_metric_rows(connection, rows):
+    # Fold new readings (dicts with member_id, recorded_at, weight,
+    # heart_rate, body_fat_pct) into both rollups, in the caller's transaction
+    if not rows:
+        return
+    _upsert(connection, HealthMetricDaily, _summarise(rows, day_of))
+    _upsert(connection, HealthMetricWeekly, _summarise(rows, week_of))
+
+
+@event.listens_for(HealthMetric, "after_insert")
+def _metric_inserted(mapper, connection, target):
+    apply_metric_rows(
+        connection,
+        [
+            dict(
+                member_id=target.member_id,
+                recorded_at=target.recorded_at,
+                weight=target.weight,
+                heart_rate=target.heart_rate,
+                body_fat_pct=target.body_fat_pct,
+            )
+        ],
+    )
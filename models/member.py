@@ -1,6 +1,6 @@
 # models/member.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Date, DateTime
+from sqlalchemy import Column, Integer, String, Date, DateTime, Index, func
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -19,26 +19,39 @@ class Member(Base):
     phone         = Column(String, nullable=True)
     created_at    = Column(DateTime, nullable=False, default=datetime.utcnow)
 
-    # Relationships
+    # Relationships. Collections raise instead of lazy loading (load them
+    # with selectinload where a path needs them); passive_deletes leaves child
+    # rows to the database's ON DELETE CASCADE.
     goals = relationship(
         "FitnessGoal",
         back_populates="member",
         cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
     metrics = relationship(
         "HealthMetric",
         back_populates="member",
         cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
     pt_sessions = relationship(
         "PersonalTrainingSession",
         back_populates="member",
+        lazy="raise_on_sql",
     )
     class_registrations = relationship(
         "ClassRegistration",
         back_populates="member",
         cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
         return f"<Member(id={self.member_id}, email={self.email})>"
+
+
+# case-insensitive email lookups (app/identity_cache.py)
+EMAIL_LOWER_INDEX = Index("ix_members_email_lower", func.lower(Member.email))
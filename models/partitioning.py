@@ -0,0 +1,196 @@
+# models/partitioning.py
+# Monthly range partitioning on PostgreSQL for tables that set
+# info={"partition_key": column} and postgresql_partition_by in __table_args__.
+# The parent is created partitioned with a DEFAULT partition as a catch-all;
+# monthly partitions are added ahead of time (ensure_partitions) and old ones
+# detached (detach_partitions). Other databases get a plain table.
+from datetime import date, datetime
+
+from sqlalchemy import PrimaryKeyConstraint, event, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateIndex
+
+ARCHIVE_SCHEMA = "archive"
+
+
+@compiles(PrimaryKeyConstraint, "postgresql")
+def _partitioned_primary_key(constraint, compiler, **kw):
+    # PostgreSQL wants the partition key in the primary key of a partitioned
+    # table; the ORM keeps identifying rows by the declared key alone
+    key = constraint.table.info.get("partition_key")
+    columns = [c.name for c in constraint.columns]
+    if key is None or key in columns or not columns:
+        return compiler.visit_primary_key_constraint(constraint, **kw)
+    return "PRIMARY KEY (%s)" % ", ".join(compiler.preparer.quote(c) for c in columns + [key])
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    n = month.year * 12 + month.month - 1 + months
+    return date(n // 12, n % 12 + 1, 1)
+
+
+def partition_name(table, month: date) -> str:
+    return f"{table.name}_y{month.year}m{month.month:02d}"
+
+
+def default_partition_name(table) -> str:
+    return f"{table.name}_default"
+
+
+def is_partitioned(connection, table) -> bool:
+    return connection.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+        ),
+        {"name": table.name},
+    ).first() is not None
+
+
+def list_partitions(connection, table):
+    # [(partition name, bound expression)], oldest first; DEFAULT last
+    rows = connection.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :name AND pg_table_is_visible(p.oid) ORDER BY c.relname"
+        ),
+        {"name": table.name},
+    ).all()
+    default = default_partition_name(table)
+    return sorted(rows, key=lambda r: r[0] == default)
+
+
+def _create_partition_indexes(connection, table, name: str):
+    # Give the detached partition its own copy of each parent index, named
+    # after the parent index plus the partition suffix (e.g.
+    # ix_health_metrics_member_recorded_y2025m03). ATTACH adopts them instead
+    # of generating names, so query plans still show the parent index name.
+    quote = connection.dialect.identifier_preparer.quote
+    suffix = name[len(table.name):]
+    for index in table.indexes:
+        ddl = str(CreateIndex(index).compile(dialect=connection.dialect))
+        head = f"CREATE INDEX {quote(index.name)} ON {quote(table.name)} "
+        connection.execute(text(ddl.replace(
+            head, f"CREATE INDEX {quote(index.name + suffix)} ON {quote(name)} ", 1
+        )))
+
+
+def create_partition(connection, table, month: date) -> bool:
+    # Add the partition for one month; rows for it already in the DEFAULT
+    # partition are moved over first. Run it in a short transaction: writes
+    # that land in DEFAULT are blocked until the caller commits. False if it
+    # exists.
+    name = partition_name(table, month)
+    if connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+        return False
+    key = table.info["partition_key"]
+    quote = connection.dialect.identifier_preparer.quote
+    start = datetime.combine(month, datetime.min.time())
+    end = datetime.combine(add_months(month, 1), datetime.min.time())
+    # DDL takes literals, not bound parameters
+    lower, upper = f"'{start:%Y-%m-%d %H:%M:%S}'", f"'{end:%Y-%m-%d %H:%M:%S}'"
+    in_range = f"{quote(key)} >= {lower} AND {quote(key)} < {upper}"
+    default = quote(default_partition_name(table))
+
+    # Writers into DEFAULT wait until the partition is attached (ATTACH would
+    # lock it anyway); without the lock a row inserted between copying and
+    # deleting would be deleted without having been copied. Readers go on.
+    connection.execute(text(f"LOCK TABLE {default} IN EXCLUSIVE MODE"))
+    connection.execute(text(
+        f"CREATE TABLE {quote(name)} (LIKE {quote(table.name)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    connection.execute(text(
+        f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *) "
+        f"INSERT INTO {quote(name)} SELECT * FROM moved"
+    ))
+    # a matching CHECK lets ATTACH skip scanning the new partition
+    check = quote(f"{name}_bounds")
+    connection.execute(text(
+        f"ALTER TABLE {quote(name)} ADD CONSTRAINT {check} CHECK ({quote(key)} IS NOT NULL AND {in_range})"
+    ))
+    _create_partition_indexes(connection, table, name)
+    connection.execute(text(
+        f"ALTER TABLE {quote(table.name)} ATTACH PARTITION {quote(name)} FOR VALUES FROM ({lower}) TO ({upper})"
+    ))
+    connection.execute(text(f"ALTER TABLE {quote(name)} DROP CONSTRAINT {check}"))
+    return True
+
+
+def partition_months(first: date = None, ahead: int = 3):
+    # Months from `first` (default: this month) through `ahead` months past
+    # the current one
+    month = month_start(first or date.today())
+    last = add_months(month_start(date.today()), ahead)
+    months = []
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def ensure_partitions(connection, table, first: date = None, ahead: int = 3):
+    # Monthly partitions for partition_months(first, ahead), all in the
+    # caller's transaction; returns the names created
+    if connection.dialect.name != "postgresql" or not is_partitioned(connection, table):
+        return []
+    return [
+        partition_name(table, month)
+        for month in partition_months(first, ahead)
+        if create_partition(connection, table, month)
+    ]
+
+
+def detach_partitions(connection, table, keep_months: int, archive: bool = False):
+    # Detach monthly partitions that end before the retention window (this
+    # month and the keep_months - 1 before it). Detached tables keep their
+    # rows; archive=True also moves them to the archive schema. Returns names.
+    if connection.dialect.name != "postgresql" or not is_partitioned(connection, table):
+        return []
+    cutoff = add_months(month_start(date.today()), 1 - keep_months)
+    quote = connection.dialect.identifier_preparer.quote
+    prefix = f"{table.name}_y"
+    detached = []
+    for name, _ in list_partitions(connection, table):
+        if not name.startswith(prefix):
+            continue
+        month = date(int(name[len(prefix):len(prefix) + 4]), int(name[-2:]), 1)
+        if month >= cutoff:
+            continue
+        connection.execute(text(f"ALTER TABLE {quote(table.name)} DETACH PARTITION {quote(name)}"))
+        # the partition was made with the parent's defaults (LIKE ... INCLUDING
+        # DEFAULTS); a detached one must not keep the parent's id sequence
+        # in use, or the parent can no longer be dropped
+        for (column,) in connection.execute(text(
+            "SELECT a.attname FROM pg_attrdef d JOIN pg_attribute a "
+            "ON a.attrelid = d.adrelid AND a.attnum = d.adnum "
+            "WHERE d.adrelid = to_regclass(:name) AND pg_get_expr(d.adbin, d.adrelid) LIKE 'nextval(%'"
+        ), {"name": name}):
+            connection.execute(text(f"ALTER TABLE {quote(name)} ALTER COLUMN {quote(column)} DROP DEFAULT"))
+        if archive:
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {quote(ARCHIVE_SCHEMA)}"))
+            connection.execute(text(f"ALTER TABLE {quote(name)} SET SCHEMA {quote(ARCHIVE_SCHEMA)}"))
+        detached.append(name)
+    return detached
+
+
+def _create_partitions(table, connection, **kw):
+    if connection.dialect.name != "postgresql" or "partition_key" not in table.info:
+        return
+    quote = connection.dialect.identifier_preparer.quote
+    default = default_partition_name(table)
+    connection.execute(text(
+        f"CREATE TABLE {quote(default)} (LIKE {quote(table.name)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    _create_partition_indexes(connection, table, default)
+    connection.execute(text(f"ALTER TABLE {quote(table.name)} ATTACH PARTITION {quote(default)} DEFAULT"))
+    ensure_partitions(connection, table)
+
+
+def partition_monthly(table):
+    # Call once per partitioned table, after it is declared
+    event.listen(table, "after_create", _create_partitions)
@@ -1,5 +1,5 @@
 # models/personal_training_session.py
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -7,6 +7,19 @@ from .base import Base
 
 class PersonalTrainingSession(Base):
     __tablename__ = "personal_training_sessions"
+    __table_args__ = (
+        # upcoming sessions for the member dashboard / trainer schedule
+        Index("ix_pt_sessions_member_start", "member_id", "start_time"),
+        Index("ix_pt_sessions_trainer_start", "trainer_id", "start_time"),
+        # room occupancy checks only care about live bookings
+        Index(
+            "ix_pt_sessions_room_start_live",
+            "room_id",
+            "start_time",
+            postgresql_where=text("status <> 'cancelled'"),
+            sqlite_where=text("status <> 'cancelled'"),
+        ),
+    )
 
     session_id  = Column(Integer, primary_key=True, index=True)
     member_id   = Column(Integer, ForeignKey("members.member_id"), nullable=False)
@@ -17,14 +17,17 @@ class Room(Base):
     classes = relationship(
         "FitnessClass",
         back_populates="room",
+        lazy="raise_on_sql",
     )
     pt_sessions = relationship(
         "PersonalTrainingSession",
         back_populates="room",
+        lazy="raise_on_sql",
     )
     equipment = relationship(
         "Equipment",
         back_populates="room",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,198 @@
+# models/room_occupancy.py
+# Per room per clock hour occupancy, kept in step with the live bookings.
+# Each live class / PT session adds its minutes in every hour it touches and
+# the seats it takes in the room (members registered for a class, 1 for a PT
+# session) times those minutes; cancelling or moving it subtracts the same
+# amounts, and class sign-ups / cancellations add or remove one seat
+# (registration_service). Counters only, so a change is a single additive
+# upsert per hour touched.
+from datetime import timedelta
+
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index, delete, event, inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .base import Base
+from .fitness_class import FitnessClass
+from .personal_training_session import PersonalTrainingSession
+
+HOUR = timedelta(hours=1)
+
+
+class RoomOccupancyHourly(Base):
+    __tablename__ = "room_occupancy_hourly"
+    __table_args__ = (
+        # all-rooms heatmaps for a week / month
+        Index("ix_room_occupancy_hourly_hour", "hour_start"),
+    )
+
+    room_id        = Column(Integer, ForeignKey("rooms.room_id", ondelete="CASCADE"), primary_key=True)
+    hour_start     = Column(DateTime, primary_key=True)
+    bookings       = Column(Integer, nullable=False, default=0)   # bookings touching the hour
+    booked_minutes = Column(Float, nullable=False, default=0)
+    seat_minutes   = Column(Float, nullable=False, default=0)     # seats x minutes
+
+    def __repr__(self) -> str:
+        return f"<RoomOccupancyHourly(room_id={self.room_id}, hour={self.hour_start})>"
+
+
+def hour_of(ts):
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def _summarise(bookings, sign, seats_only=False):
+    # Split bookings into one delta row per (room, hour); seats_only leaves
+    # the booking count and booked minutes alone
+    deltas = {}
+    for b in bookings:
+        start, end = b["start_time"], b["end_time"]
+        hour = hour_of(start)
+        while hour < end:
+            minutes = (min(end, hour + HOUR) - max(start, hour)).total_seconds() / 60
+            key = (b["room_id"], hour)
+            delta = deltas.get(key)
+            if delta is None:
+                delta = deltas[key] = dict(
+                    room_id=key[0], hour_start=hour, bookings=0, booked_minutes=0.0, seat_minutes=0.0
+                )
+            if not seats_only:
+                delta["bookings"] += sign
+                delta["booked_minutes"] += sign * minutes
+            delta["seat_minutes"] += sign * minutes * b["seats"]
+            hour += HOUR
+    # fixed key order keeps concurrent upserts from deadlocking
+    return [deltas[k] for k in sorted(deltas)]
+
+
+def apply_bookings(connection, bookings, sign: int = 1, seats_only: bool = False):
+    # Add (sign=1) or remove (sign=-1) bookings, dicts with room_id,
+    # start_time, end_time and seats, in the caller's transaction
+    deltas = _summarise(bookings, sign, seats_only)
+    if not deltas:
+        return
+    table = RoomOccupancyHourly.__table__
+    insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["room_id", "hour_start"],
+        set_={
+            name: table.c[name] + stmt.excluded[name]
+            for name in ("bookings", "booked_minutes", "seat_minutes")
+        },
+    )
+    connection.execute(stmt, deltas)
+    if sign < 0 and not seats_only:
+        # hours nothing is booked in any more
+        rooms = {d["room_id"] for d in deltas}
+        for room_id in sorted(rooms):
+            hours = [d["hour_start"] for d in deltas if d["room_id"] == room_id]
+            connection.execute(
+                delete(table).where(
+                    table.c.room_id == room_id,
+                    table.c.hour_start.between(min(hours), max(hours)),
+                    table.c.bookings <= 0,
+                )
+            )
+
+
+def class_booking(row):
+    # occupancy dict for a class (ORM object or row dict); a class just
+    # inserted in bulk has nobody registered yet
+    get = row.get if isinstance(row, dict) else lambda name: getattr(row, name)
+    return dict(room_id=get("room_id"), start_time=get("start_time"),
+                end_time=get("end_time"), seats=get("registered_count") or 0)
+
+
+def apply_seats(connection, fitness_class, seats: int):
+    # A class gained (seats=1) or lost (seats=-1) a registered member
+    if _live(fitness_class.status):
+        booking = dict(room_id=fitness_class.room_id, start_time=fitness_class.start_time,
+                       end_time=fitness_class.end_time, seats=abs(seats))
+        apply_bookings(connection, [booking], sign=1 if seats > 0 else -1, seats_only=True)
+
+
+# ORM hooks (bulk inserts bypass these and call apply_bookings directly)
+
+def _live(status) -> bool:
+    return status != "cancelled"
+
+
+def _before(target, name):
+    # value as it was before this flush
+    history = inspect(target).attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, name)
+
+
+def _sync(connection, target, seats_attr, tracked):
+    state = inspect(target)
+    if not any(state.attrs[name].history.has_changes() for name in tracked):
+        return
+    old = dict(
+        room_id=_before(target, "room_id"),
+        start_time=_before(target, "start_time"),
+        end_time=_before(target, "end_time"),
+        seats=_before(target, seats_attr) if seats_attr else 1,
+    )
+    if _live(_before(target, "status")):
+        apply_bookings(connection, [old], sign=-1)
+    if _live(target.status):
+        new = dict(room_id=target.room_id, start_time=target.start_time,
+                   end_time=target.end_time, seats=getattr(target, seats_attr) if seats_attr else 1)
+        apply_bookings(connection, [new])
+
+
+# registered_count moves through apply_seats, not these hooks
+_CLASS_TRACKED = ("room_id", "start_time", "end_time", "status")
+_SESSION_TRACKED = ("room_id", "start_time", "end_time", "status")
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    return value
+
+
+# active_history loads an expired attribute before it is overwritten (e.g.
+# after a commit), so _before() can always see the value being replaced
+for _model, _tracked in ((FitnessClass, _CLASS_TRACKED), (PersonalTrainingSession, _SESSION_TRACKED)):
+    for _name in _tracked:
+        event.listen(getattr(_model, _name), "set", _keep_old_value, active_history=True, retval=True)
+
+
+@event.listens_for(FitnessClass, "after_insert")
+def _class_inserted(mapper, connection, target):
+    if _live(target.status):
+        apply_bookings(connection, [class_booking(target)])
+
+
+@event.listens_for(FitnessClass, "after_update")
+def _class_updated(mapper, connection, target):
+    _sync(connection, target, "registered_count", _CLASS_TRACKED)
+
+
+@event.listens_for(FitnessClass, "after_delete")
+def _class_deleted(mapper, connection, target):
+    if _live(target.status):
+        apply_bookings(connection, [class_booking(target)], sign=-1)
+
+
+def _session_booking(target):
+    return dict(room_id=target.room_id, start_time=target.start_time,
+                end_time=target.end_time, seats=1)
+
+
+@event.listens_for(PersonalTrainingSession, "after_insert")
+def _session_inserted(mapper, connection, target):
+    if _live(target.status):
+        apply_bookings(connection, [_session_booking(target)])
+
+
+@event.listens_for(PersonalTrainingSession, "after_update")
+def _session_updated(mapper, connection, target):
+    _sync(connection, target, None, _SESSION_TRACKED)
+
+
+@event.listens_for(PersonalTrainingSession, "after_delete")
+def _session_deleted(mapper, connection, target):
+    if _live(target.status):
+        apply_bookings(connection, [_session_booking(target)], sign=-1)
@@ -1,5 +1,5 @@
 # models/trainer.py
-from sqlalchemy import Column, Integer, String, Date
+from sqlalchemy import Column, Integer, String, Date, Index, func
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -19,16 +19,24 @@ class Trainer(Base):
     pt_sessions = relationship(
         "PersonalTrainingSession",
         back_populates="trainer",
+        lazy="raise_on_sql",
     )
     classes = relationship(
         "FitnessClass",
         back_populates="trainer",
+        lazy="raise_on_sql",
     )
     availabilities = relationship(
         "TrainerAvailability",
         back_populates="trainer",
         cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
         return f"<Trainer(id={self.trainer_id}, email={self.email})>"
+
+
+# case-insensitive email lookups (app/identity_cache.py)
+EMAIL_LOWER_INDEX = Index("ix_trainers_email_lower", func.lower(Trainer.email))
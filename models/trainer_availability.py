@@ -1,5 +1,5 @@
 # models/trainer_availability.py
-from sqlalchemy import Column, Integer, Boolean, Time, ForeignKey
+from sqlalchemy import Column, Integer, Boolean, Date, Time, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -7,6 +7,10 @@ from .base import Base
 
 class TrainerAvailability(Base):
     __tablename__ = "trainer_availabilities"
+    __table_args__ = (
+        # overlap check in set_availability
+        Index("ix_trainer_availabilities_trainer_day", "trainer_id", "day_of_week"),
+    )
 
     availability_id = Column(Integer, primary_key=True, index=True)
     trainer_id      = Column(Integer, ForeignKey("trainers.trainer_id", ondelete="CASCADE"), nullable=False)
@@ -14,6 +18,7 @@ class TrainerAvailability(Base):
     start_time      = Column(Time, nullable=False)
     end_time        = Column(Time, nullable=False)
     is_recurring    = Column(Boolean, nullable=False, default=True)
+    available_on    = Column(Date)   # the one day a one-time slot applies to; NULL when recurring
 
     trainer = relationship(
         "Trainer",
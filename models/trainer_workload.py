@@ -0,0 +1,116 @@
+# models/trainer_workload.py
+# Per trainer per week workload summary, filled in by app/workload.py.
+# Booking and availability changes only note which (trainer, week) pairs went
+# stale in trainer_workload_dirty (a plain INSERT, no contention on the
+# summary rows); a refresh recomputes just those pairs and clears their marks.
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, Index, event, inspect, select
+
+from .base import Base
+from .fitness_class import FitnessClass
+from .personal_training_session import PersonalTrainingSession
+from .trainer_availability import TrainerAvailability
+
+
+class TrainerWorkloadWeekly(Base):
+    __tablename__ = "trainer_workload_weekly"
+    __table_args__ = (
+        # all-trainers read for a week
+        Index("ix_trainer_workload_weekly_week", "week_start"),
+    )
+
+    trainer_id        = Column(Integer, ForeignKey("trainers.trainer_id", ondelete="CASCADE"), primary_key=True)
+    week_start        = Column(Date, primary_key=True)   # Monday
+    class_count       = Column(Integer, nullable=False, default=0)
+    class_minutes     = Column(Float, nullable=False, default=0)
+    pt_count          = Column(Integer, nullable=False, default=0)
+    pt_minutes        = Column(Float, nullable=False, default=0)
+    available_minutes = Column(Float, nullable=False, default=0)
+    refreshed_at      = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<TrainerWorkloadWeekly(trainer_id={self.trainer_id}, week={self.week_start})>"
+
+
+class TrainerWorkloadDirty(Base):
+    # One row per change; the same pair may be marked many times between refreshes
+    __tablename__ = "trainer_workload_dirty"
+
+    dirty_id   = Column(Integer, primary_key=True)
+    trainer_id = Column(Integer, ForeignKey("trainers.trainer_id", ondelete="CASCADE"), nullable=False)
+    week_start = Column(Date, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<TrainerWorkloadDirty(trainer_id={self.trainer_id}, week={self.week_start})>"
+
+
+def week_of(value) -> date:
+    # Monday of the week a date / datetime falls in
+    day = value.date() if isinstance(value, datetime) else value
+    return day - timedelta(days=day.weekday())
+
+
+def mark_weeks(connection, pairs):
+    # Queue (trainer_id, week_start) pairs for the next refresh, in the
+    # caller's transaction
+    rows = [dict(trainer_id=t, week_start=w) for t, w in sorted(set(pairs)) if t is not None]
+    if rows:
+        connection.execute(TrainerWorkloadDirty.__table__.insert(), rows)
+
+
+# ORM hooks (bulk inserts bypass these and call mark_weeks directly)
+
+_TRACKED = ("trainer_id", "start_time", "end_time", "status")
+
+
+def _before(target, name):
+    history = inspect(target).attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, name)
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    return value
+
+
+# load expired values before they are overwritten so the old week is known
+for _model in (FitnessClass, PersonalTrainingSession):
+    for _name in ("trainer_id", "start_time"):
+        event.listen(getattr(_model, _name), "set", _keep_old_value, active_history=True, retval=True)
+
+
+def _booking_changed(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[name].history.has_changes() for name in _TRACKED):
+        return
+    mark_weeks(connection, [
+        (_before(target, "trainer_id"), week_of(_before(target, "start_time"))),
+        (target.trainer_id, week_of(target.start_time)),
+    ])
+
+
+def _booking_added_or_removed(mapper, connection, target):
+    mark_weeks(connection, [(target.trainer_id, week_of(target.start_time))])
+
+
+for _model in (FitnessClass, PersonalTrainingSession):
+    event.listen(_model, "after_insert", _booking_added_or_removed)
+    event.listen(_model, "after_delete", _booking_added_or_removed)
+    event.listen(_model, "after_update", _booking_changed)
+
+
+def _availability_changed(mapper, connection, target):
+    # Weekly hours apply from the current week on; summarised weeks before
+    # it keep the availability they were computed with
+    current = week_of(datetime.utcnow())
+    table = TrainerWorkloadWeekly.__table__
+    weeks = connection.execute(
+        select(table.c.week_start).where(table.c.trainer_id == target.trainer_id, table.c.week_start > current)
+    ).scalars().all()
+    mark_weeks(connection, [(target.trainer_id, w) for w in [current, *weeks]])
+
+
+for _name in ("after_insert", "after_update", "after_delete"):
+    event.listen(TrainerAvailability, _name, _availability_changed)
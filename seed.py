@@ -219,6 +219,7 @@ def seed():
                 description="Gentle vinyasa flow",
                 end_time=end_class,
                 capacity=15,
+                registered_count=1,  # member1's registration below
                 status="scheduled",
             ),
         )
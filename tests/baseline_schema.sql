@@ -0,0 +1,152 @@
+-- tests/baseline_schema.sql
+-- Schema of the baseline release (SQLite), for the migration test
+CREATE TABLE members (
+	member_id INTEGER NOT NULL, 
+	first_name VARCHAR NOT NULL, 
+	last_name VARCHAR NOT NULL, 
+	email VARCHAR NOT NULL, 
+	password_hash VARCHAR NOT NULL, 
+	date_of_birth DATE, 
+	gender VARCHAR, 
+	phone VARCHAR, 
+	created_at DATETIME NOT NULL, 
+	PRIMARY KEY (member_id), 
+	UNIQUE (email)
+);
+CREATE INDEX ix_members_member_id ON members (member_id);
+CREATE TABLE trainers (
+	trainer_id INTEGER NOT NULL, 
+	first_name VARCHAR NOT NULL, 
+	last_name VARCHAR NOT NULL, 
+	email VARCHAR NOT NULL, 
+	phone VARCHAR, 
+	specialization VARCHAR, 
+	hired_at DATE, 
+	PRIMARY KEY (trainer_id), 
+	UNIQUE (email)
+);
+CREATE INDEX ix_trainers_trainer_id ON trainers (trainer_id);
+CREATE TABLE admin_staff (
+	admin_id INTEGER NOT NULL, 
+	first_name VARCHAR NOT NULL, 
+	last_name VARCHAR NOT NULL, 
+	email VARCHAR NOT NULL, 
+	password_hash VARCHAR NOT NULL, 
+	role VARCHAR, 
+	PRIMARY KEY (admin_id), 
+	UNIQUE (email)
+);
+CREATE INDEX ix_admin_staff_admin_id ON admin_staff (admin_id);
+CREATE TABLE rooms (
+	room_id INTEGER NOT NULL, 
+	room_name VARCHAR NOT NULL, 
+	location VARCHAR, 
+	capacity INTEGER NOT NULL, 
+	is_active BOOLEAN NOT NULL, 
+	PRIMARY KEY (room_id)
+);
+CREATE INDEX ix_rooms_room_id ON rooms (room_id);
+CREATE TABLE fitness_goals (
+	goal_id INTEGER NOT NULL, 
+	member_id INTEGER NOT NULL, 
+	goal_type VARCHAR NOT NULL, 
+	target_value NUMERIC NOT NULL, 
+	unit VARCHAR NOT NULL, 
+	start_date DATE NOT NULL, 
+	target_date DATE, 
+	status VARCHAR NOT NULL, 
+	PRIMARY KEY (goal_id), 
+	FOREIGN KEY(member_id) REFERENCES members (member_id) ON DELETE CASCADE
+);
+CREATE INDEX ix_fitness_goals_goal_id ON fitness_goals (goal_id);
+CREATE TABLE health_metrics (
+	metric_id INTEGER NOT NULL, 
+	member_id INTEGER NOT NULL, 
+	recorded_at DATETIME NOT NULL, 
+	weight NUMERIC, 
+	heart_rate INTEGER, 
+	body_fat_pct NUMERIC, 
+	notes VARCHAR, 
+	PRIMARY KEY (metric_id), 
+	FOREIGN KEY(member_id) REFERENCES members (member_id) ON DELETE CASCADE
+);
+CREATE INDEX ix_health_metrics_metric_id ON health_metrics (metric_id);
+CREATE TABLE personal_training_sessions (
+	session_id INTEGER NOT NULL, 
+	member_id INTEGER NOT NULL, 
+	trainer_id INTEGER NOT NULL, 
+	room_id INTEGER NOT NULL, 
+	start_time DATETIME NOT NULL, 
+	end_time DATETIME NOT NULL, 
+	status VARCHAR NOT NULL, 
+	PRIMARY KEY (session_id), 
+	FOREIGN KEY(member_id) REFERENCES members (member_id), 
+	FOREIGN KEY(trainer_id) REFERENCES trainers (trainer_id), 
+	FOREIGN KEY(room_id) REFERENCES rooms (room_id)
+);
+CREATE INDEX ix_personal_training_sessions_session_id ON personal_training_sessions (session_id);
+CREATE TABLE classes (
+	class_id INTEGER NOT NULL, 
+	trainer_id INTEGER NOT NULL, 
+	room_id INTEGER NOT NULL, 
+	created_by_admin_id INTEGER NOT NULL, 
+	class_name VARCHAR NOT NULL, 
+	description VARCHAR, 
+	start_time DATETIME NOT NULL, 
+	end_time DATETIME NOT NULL, 
+	capacity INTEGER NOT NULL, 
+	status VARCHAR NOT NULL, 
+	PRIMARY KEY (class_id), 
+	FOREIGN KEY(trainer_id) REFERENCES trainers (trainer_id), 
+	FOREIGN KEY(room_id) REFERENCES rooms (room_id), 
+	FOREIGN KEY(created_by_admin_id) REFERENCES admin_staff (admin_id)
+);
+CREATE INDEX ix_classes_class_id ON classes (class_id);
+CREATE TABLE trainer_availabilities (
+	availability_id INTEGER NOT NULL, 
+	trainer_id INTEGER NOT NULL, 
+	day_of_week INTEGER NOT NULL, 
+	start_time TIME NOT NULL, 
+	end_time TIME NOT NULL, 
+	is_recurring BOOLEAN NOT NULL, 
+	PRIMARY KEY (availability_id), 
+	FOREIGN KEY(trainer_id) REFERENCES trainers (trainer_id) ON DELETE CASCADE
+);
+CREATE INDEX ix_trainer_availabilities_availability_id ON trainer_availabilities (availability_id);
+CREATE TABLE equipment (
+	equipment_id INTEGER NOT NULL, 
+	room_id INTEGER NOT NULL, 
+	equipment_name VARCHAR NOT NULL, 
+	equipment_type VARCHAR, 
+	serial_number VARCHAR, 
+	is_operational BOOLEAN NOT NULL, 
+	PRIMARY KEY (equipment_id), 
+	FOREIGN KEY(room_id) REFERENCES rooms (room_id)
+);
+CREATE INDEX ix_equipment_equipment_id ON equipment (equipment_id);
+CREATE TABLE class_registrations (
+	registration_id INTEGER NOT NULL, 
+	class_id INTEGER NOT NULL, 
+	member_id INTEGER NOT NULL, 
+	registered_at DATETIME NOT NULL, 
+	attendance_status VARCHAR NOT NULL, 
+	PRIMARY KEY (registration_id), 
+	CONSTRAINT uq_class_member UNIQUE (class_id, member_id), 
+	FOREIGN KEY(class_id) REFERENCES classes (class_id) ON DELETE CASCADE, 
+	FOREIGN KEY(member_id) REFERENCES members (member_id) ON DELETE CASCADE
+);
+CREATE INDEX ix_class_registrations_registration_id ON class_registrations (registration_id);
+CREATE TABLE equipment_maintenance (
+	maintenance_id INTEGER NOT NULL, 
+	equipment_id INTEGER NOT NULL, 
+	admin_id INTEGER NOT NULL, 
+	reported_at DATETIME NOT NULL, 
+	resolved_at DATETIME, 
+	status VARCHAR NOT NULL, 
+	issue_description VARCHAR NOT NULL, 
+	resolution_notes VARCHAR, 
+	PRIMARY KEY (maintenance_id), 
+	FOREIGN KEY(equipment_id) REFERENCES equipment (equipment_id), 
+	FOREIGN KEY(admin_id) REFERENCES admin_staff (admin_id)
+);
+CREATE INDEX ix_equipment_maintenance_maintenance_id ON equipment_maintenance (maintenance_id);
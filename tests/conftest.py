@@ -0,0 +1,55 @@
+# tests/conftest.py
+# The tests run against a throwaway SQLite file (or FITNESS_TEST_DATABASE_URL).
+# models/base.py builds the engine at import, so the URL is set before any
+# app / models import.
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="fitness-tests-")
+os.environ["FITNESS_DATABASE_URL"] = os.environ.get(
+    "FITNESS_TEST_DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+)
+
+import pytest  # noqa: E402
+
+from models import Base, engine  # noqa: E402
+from app.db import get_session, remove_session  # noqa: E402
+from app.identity_cache import caches  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def database():
+    # Fresh tables (and an empty identity cache) for every test
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    for cache in caches.values():
+        cache.clear()
+    yield engine
+    remove_session()
+
+
+@pytest.fixture
+def session(database):
+    session = get_session()
+    yield session
+    session.rollback()
+
+
+@pytest.fixture
+def club(session):
+    # One admin, two trainers, a member and two rooms, committed
+    from types import SimpleNamespace
+
+    from models import AdminStaff, Member, Room, Trainer
+
+    club = SimpleNamespace(
+        admin=AdminStaff(first_name="Ada", last_name="Admin", email="admin@club.com", password_hash="x"),
+        trainer=Trainer(first_name="Tom", last_name="Trainer", email="tom@club.com"),
+        other_trainer=Trainer(first_name="Yara", last_name="Yoga", email="yara@club.com"),
+        member=Member(first_name="Mia", last_name="Member", email="mia@club.com", password_hash="x"),
+        room=Room(room_name="Studio A", capacity=20, is_active=True),
+        other_room=Room(room_name="Weight Room", capacity=15, is_active=True),
+    )
+    session.add_all(vars(club).values())
+    session.commit()
+    return club
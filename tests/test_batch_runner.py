@@ -0,0 +1,85 @@
+# tests/test_batch_runner.py
+import json
+
+from sqlalchemy import select
+
+from app.batch_runner import parse_line, run_operation, run_transaction
+from app.errors import ServiceError
+from app.identity_cache import lookup_member
+from app.member_service import create_member
+from app.operations import OPERATIONS, Operation
+from models import HealthMetric, Member
+
+
+def _line(op, **args):
+    return json.dumps(dict(op=op, args=args))
+
+
+def _register(email):
+    return _line("register_member", first_name="Ana", last_name="Li", email=email, password="x")
+
+
+def _emails(session):
+    return set(session.execute(select(Member.email)).scalars())
+
+
+def _create_then_fail(session, email):
+    create_member(session, "Bo", "Ng", email, "x")
+    lookup_member(session, email)
+    raise ServiceError("rejected after the insert")
+
+
+def test_failing_line_rolls_back_only_its_savepoint(monkeypatch, session):
+    monkeypatch.setitem(OPERATIONS, "create_then_fail", Operation(_create_then_fail, lambda r: r))
+    results = run_transaction([
+        (1, _register("kept1@x.com")),
+        (2, _line("create_then_fail", email="dropped@x.com")),
+        (3, _register("kept2@x.com")),
+    ])
+
+    assert [r["ok"] for r in results] == [True, False, True]
+    assert results[1]["error"] == "rejected after the insert"
+    assert _emails(session) == {"kept1@x.com", "kept2@x.com"}
+
+
+def test_outer_rollback_undoes_released_savepoints(session):
+    # pysqlite's implicit transactions turn the first SAVEPOINT into the
+    # outermost transaction, so RELEASE used to commit it for good
+    for text in (_register("first@x.com"), _register("second@x.com")):
+        ok, _ = run_operation(session, *parse_line(text))
+        assert ok
+    session.rollback()
+
+    assert _emails(session) == set()
+
+
+def test_bad_argument_type_fails_its_own_line(session):
+    results = run_transaction([
+        (1, _register("new1@x.com")),
+        (2, _line("add_health_metric", email="new1@x.com", weight=70)),
+        (3, _line("book_pt_session", email="new1@x.com", room_id=1, trainer_id=1, start_time=12345)),
+        (4, _line("free_pt_slots", room_id=1, minutes="sixty")),
+    ])
+
+    assert [r["ok"] for r in results] == [True, True, False, False]
+    assert "start_time" in results[2]["error"]
+    assert "minutes" in results[3]["error"]
+    assert _emails(session) == {"new1@x.com"}
+    assert session.execute(select(HealthMetric.metric_id)).first() is not None
+
+
+def test_numeric_strings_are_coerced(session):
+    results = run_transaction([(1, _line("upcoming_classes", limit="5"))])
+    assert results == [dict(line=1, op="upcoming_classes", ok=True, result=[])]
+
+
+def test_rolled_back_lookups_are_not_cached(monkeypatch, session):
+    monkeypatch.setitem(OPERATIONS, "create_then_fail", Operation(_create_then_fail, lambda r: r))
+    run_transaction([
+        (1, _register("kept@x.com")),
+        (2, _line("create_then_fail", email="dropped@x.com")),
+    ])
+
+    assert lookup_member(session, "dropped@x.com") is None
+    assert lookup_member(session, "kept@x.com").email == "kept@x.com"
+
@@ -0,0 +1,75 @@
+# tests/test_book_pt_slot.py
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from app.errors import BookingConflict, NotFound, ServiceError
+from app.member_service import book_pt_slot
+from models import TrainerAvailability
+
+# a Monday well in the future
+MONDAY = date(2030, 1, 7)
+
+
+@pytest.fixture
+def available(session, club):
+    # Tom works Mondays 09:00-12:00
+    session.add(TrainerAvailability(
+        trainer_id=club.trainer.trainer_id, day_of_week=1, start_time=time(9), end_time=time(12),
+    ))
+    session.commit()
+    return club
+
+
+def _book(session, club, start, minutes=60, trainer_id=None):
+    return book_pt_slot(
+        session, club.member.email, club.room.room_id,
+        trainer_id or club.trainer.trainer_id, start, minutes,
+    )
+
+
+def test_books_inside_availability(session, available):
+    pt = _book(session, available, datetime.combine(MONDAY, time(10)))
+    assert pt.end_time == datetime.combine(MONDAY, time(11))
+
+
+def test_rejects_time_outside_availability(session, available):
+    with pytest.raises(ServiceError, match="not available"):
+        _book(session, available, datetime.combine(MONDAY, time(11, 30)))
+    with pytest.raises(ServiceError, match="not available"):
+        _book(session, available, datetime.combine(MONDAY + timedelta(days=1), time(10)))
+
+
+def test_rejects_unknown_trainer(session, available):
+    with pytest.raises(NotFound, match="Trainer not found"):
+        _book(session, available, datetime.combine(MONDAY, time(10)), trainer_id=9999)
+
+
+def test_rejects_non_positive_minutes(session, available):
+    with pytest.raises(ServiceError, match="^Minutes must be positive"):
+        _book(session, available, datetime.combine(MONDAY, time(10)), minutes=0)
+
+
+def test_rejects_the_past(session, available):
+    with pytest.raises(ServiceError, match="past"):
+        _book(session, available, datetime(2020, 1, 6, 10))
+
+
+def test_rejects_overlap(session, available):
+    _book(session, available, datetime.combine(MONDAY, time(10)))
+    session.commit()
+    with pytest.raises(BookingConflict):
+        _book(session, available, datetime.combine(MONDAY, time(10, 30)))
+
+
+def test_one_time_availability_applies_on_its_date_only(session, club):
+    # Tom is free one Tuesday only
+    session.add(TrainerAvailability(
+        trainer_id=club.trainer.trainer_id, day_of_week=2, start_time=time(9), end_time=time(12),
+        is_recurring=False, available_on=MONDAY + timedelta(days=1),
+    ))
+    session.commit()
+    with pytest.raises(ServiceError, match="not available"):
+        _book(session, club, datetime.combine(MONDAY + timedelta(days=8), time(10)))
+    pt = _book(session, club, datetime.combine(MONDAY + timedelta(days=1), time(10)))
+    assert pt.start_time.date() == MONDAY + timedelta(days=1)
@@ -0,0 +1,58 @@
+# tests/test_booking_overlap.py
+# Room / trainer double bookings are rejected by the database on every
+# supported backend (exclusion constraints on PostgreSQL, triggers on SQLite)
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.admin_service import create_class
+from app.errors import BookingConflict
+from models import BookingInterval
+from models.booking_interval import overlap_conflict
+
+START = datetime(2030, 1, 7, 9, 0)
+
+
+def _class(session, club, trainer, room, start=START, minutes=60):
+    return create_class(
+        session, club.admin.email, trainer.email, room.room_id, "Spin",
+        start, start + timedelta(minutes=minutes), 10,
+    )
+
+
+def test_same_room_and_hour_is_rejected(session, club):
+    _class(session, club, club.trainer, club.room)
+    session.commit()
+
+    with pytest.raises(BookingConflict) as conflict:
+        _class(session, club, club.other_trainer, club.room, START + timedelta(minutes=30))
+    assert conflict.value.kind == "room"
+
+
+def test_same_trainer_is_rejected_in_another_room(session, club):
+    _class(session, club, club.trainer, club.room)
+    session.commit()
+
+    with pytest.raises(BookingConflict) as conflict:
+        _class(session, club, club.trainer, club.other_room)
+    assert conflict.value.kind == "trainer"
+
+
+def test_back_to_back_bookings_are_allowed(session, club):
+    _class(session, club, club.trainer, club.room)
+    _class(session, club, club.trainer, club.room, START + timedelta(hours=1))
+    session.commit()
+
+
+def test_core_inserts_are_checked_too(session, club):
+    first = _class(session, club, club.trainer, club.room)
+    session.commit()
+
+    with pytest.raises(IntegrityError) as error:
+        session.execute(insert(BookingInterval), [dict(
+            room_id=club.room.room_id, trainer_id=club.other_trainer.trainer_id,
+            class_id=first.class_id + 1, start_time=START, end_time=START + timedelta(hours=1),
+        )])
+    assert overlap_conflict(error.value) == "room"
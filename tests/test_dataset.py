@@ -0,0 +1,33 @@
+# tests/test_dataset.py
+from sqlalchemy import select
+
+from app.occupancy import rebuild_occupancy
+from app.workload import refresh_workload, rebuild_workload
+from benchmarks.dataset import ensure_dataset
+from models import RoomOccupancyHourly, TrainerWorkloadWeekly, engine
+
+
+def _snapshot(model, key):
+    with engine.connect() as connection:
+        table = model.__table__
+        return sorted(
+            tuple(r._mapping[c.name] for c in table.c if c.name != "refreshed_at")
+            for r in connection.execute(select(table).order_by(*key))
+        )
+
+
+def test_bulk_loaded_bookings_fill_summaries(database):
+    ensure_dataset(engine, 100, metrics_per_member=1, log=lambda message: None)
+    refresh_workload()
+    occupancy = _snapshot(RoomOccupancyHourly, ["room_id", "hour_start"])
+    workload = _snapshot(TrainerWorkloadWeekly, ["trainer_id", "week_start"])
+    assert occupancy
+
+    with engine.begin() as connection:
+        rebuild_occupancy(connection)
+        rebuild_workload(connection)
+    assert occupancy == _snapshot(RoomOccupancyHourly, ["room_id", "hour_start"])
+    # rebuild only summarises weeks with bookings; the availability marks
+    # also summarise the current, empty week
+    rebuilt = _snapshot(TrainerWorkloadWeekly, ["trainer_id", "week_start"])
+    assert rebuilt and set(rebuilt) <= set(workload)
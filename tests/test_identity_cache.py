@@ -0,0 +1,15 @@
+# tests/test_identity_cache.py
+from app.identity_cache import caches, lookup_member
+from app.member_service import create_member
+
+
+def test_lookup_of_uncommitted_member_is_cached_on_commit_only(session):
+    create_member(session, "Cy", "Oh", "cy@x.com", "x")
+    assert lookup_member(session, "cy@x.com") is not None
+    session.rollback()
+    assert lookup_member(session, "cy@x.com") is None
+
+    create_member(session, "Cy", "Oh", "cy@x.com", "x")
+    ref = lookup_member(session, "cy@x.com")
+    session.commit()
+    assert caches["member"].get("cy@x.com") == ref
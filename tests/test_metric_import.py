@@ -0,0 +1,36 @@
+# tests/test_metric_import.py
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.metric_import import import_metrics
+from models import HealthMetric
+
+
+def test_emails_match_case_insensitively(tmp_path, session, club):
+    path = tmp_path / "readings.csv"
+    path.write_text(
+        "email,recorded_at,weight,heart_rate,body_fat_pct,notes\n"
+        "Mia@Club.com,2030-01-07T08:00:00,70,,,\n"
+        " MIA@CLUB.COM ,2030-01-08T08:00:00,69.5,,,\n"
+        "nobody@club.com,2030-01-08T08:00:00,80,,,\n"
+    )
+    rejected = []
+
+    imported, rejected_count = import_metrics(str(path), report=lambda line, msg: rejected.append(line))
+
+    assert (imported, rejected_count, rejected) == (2, 1, [4])
+    member_ids = session.execute(select(HealthMetric.member_id)).scalars().all()
+    assert member_ids == [club.member.member_id] * 2
+
+
+def test_recorded_at_with_offset_is_stored_as_utc(tmp_path, session, club):
+    path = tmp_path / "readings.jsonl"
+    path.write_text(
+        '{"email": "mia@club.com", "recorded_at": "2030-01-07T10:30:00+02:00", "weight": 70}\n'
+        '{"email": "mia@club.com", "recorded_at": "2030-01-08T03:00:00-05:00", "weight": 69}\n'
+    )
+
+    assert import_metrics(str(path), report=lambda line, msg: None) == (2, 0)
+    recorded = session.execute(select(HealthMetric.recorded_at).order_by(HealthMetric.recorded_at)).scalars().all()
+    assert recorded == [datetime(2030, 1, 7, 8, 30), datetime(2030, 1, 8, 8)]
@@ -0,0 +1,87 @@
+# tests/test_migrations.py
+# migrate_db.py: a database created by the baseline release takes every
+# migration in order and passes --verify, and each migration is recorded in
+# the transaction that applied it.
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import inspect, text
+
+import migrate_db
+from migrate_db import ensure_migrations_table, migrate, run_migration
+from migrations import MIGRATIONS
+from models import Base, engine
+
+BASELINE = Path(__file__).with_name("baseline_schema.sql")
+
+
+BASELINE_ROWS = [
+    "INSERT INTO members VALUES (1, 'Mia', 'Member', 'mia@club.com', 'x', NULL, NULL, NULL, '2024-01-01')",
+    "INSERT INTO trainers VALUES (1, 'Tom', 'Trainer', 'tom@club.com', NULL, NULL, NULL)",
+    "INSERT INTO admin_staff VALUES (1, 'Ada', 'Admin', 'admin@club.com', 'x', NULL)",
+    "INSERT INTO rooms VALUES (1, 'Studio A', NULL, 20, 1)",
+    "INSERT INTO classes VALUES (1, 1, 1, 1, 'Yoga', NULL, '2030-01-07 09:00:00', '2030-01-07 10:00:00', 10, 'scheduled')",
+    "INSERT INTO personal_training_sessions VALUES (1, 1, 1, 1, '2030-01-07 11:00:00', '2030-01-07 12:00:00', 'scheduled')",
+    "INSERT INTO class_registrations VALUES (1, 1, 1, '2029-12-01', 'registered')",
+    "INSERT INTO health_metrics VALUES (1, 1, '2024-01-01 08:00:00', 70, 60, NULL, NULL)",
+]
+
+
+@pytest.fixture
+def baseline_database(database):
+    Base.metadata.drop_all(engine)
+    raw = engine.raw_connection()
+    try:
+        raw.driver_connection.executescript(BASELINE.read_text())
+        for statement in BASELINE_ROWS:
+            raw.driver_connection.execute(statement)
+        raw.driver_connection.commit()
+    finally:
+        raw.close()
+    yield engine
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+
+
+@pytest.mark.skipif(engine.dialect.name != "sqlite", reason="baseline_schema.sql is SQLite DDL")
+def test_baseline_database_migrates_through_every_migration(baseline_database):
+    assert migrate(verify=True)
+
+    with engine.connect() as connection:
+        applied = set(connection.execute(text("SELECT name FROM schema_migrations")).scalars())
+        assert applied == {m.NAME for m in MIGRATIONS}
+        # backfills ran against the existing bookings
+        assert connection.execute(text("SELECT count(*) FROM booking_intervals")).scalar() == 2
+        assert connection.execute(text("SELECT count(*) FROM room_occupancy_hourly")).scalar() > 0
+        assert connection.execute(text("SELECT count(*) FROM trainer_workload_weekly")).scalar() == 1
+
+    # a second run has nothing left to do
+    assert migrate()
+
+
+def test_migration_and_its_record_commit_together(monkeypatch):
+    # a crash after the upgrade but before the record leaves neither behind
+    migration = SimpleNamespace(
+        NAME="999_test", upgrade=lambda conn: conn.execute(text("CREATE TABLE migration_probe (id INTEGER)")),
+    )
+    with engine.begin() as connection:
+        ensure_migrations_table(connection)
+
+    def crash(connection, name):
+        raise RuntimeError("crashed")
+
+    try:
+        with monkeypatch.context() as patch:
+            patch.setattr(migrate_db, "record_migration", crash)
+            with pytest.raises(RuntimeError):
+                run_migration(migration)
+        assert not inspect(engine).has_table("migration_probe")
+
+        run_migration(migration)
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT name FROM schema_migrations")).scalars().all() == ["999_test"]
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS migration_probe"))
+            connection.execute(text("DROP TABLE schema_migrations"))
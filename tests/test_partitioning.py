@@ -0,0 +1,177 @@
+# tests/test_partitioning.py
+# health_metrics partitioning (models/partitioning.py). PostgreSQL only: set
+# FITNESS_TEST_DATABASE_URL to a scratch PostgreSQL database to run these.
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event, inspect, text
+from sqlalchemy.exc import OperationalError
+
+from migrations import m001_hot_query_indexes as m001, m009_health_metric_partitions as m009
+from models import HealthMetric, engine
+from models.partitioning import (
+    ARCHIVE_SCHEMA,
+    add_months,
+    create_partition,
+    default_partition_name,
+    detach_partitions,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    month_start,
+    partition_name,
+)
+
+pytestmark = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="partitioning is PostgreSQL only"
+)
+
+table = HealthMetric.__table__
+
+
+def test_primary_key_includes_partition_key():
+    # the compile hook adds recorded_at; the ORM still maps metric_id alone
+    key = inspect(engine).get_pk_constraint(table.name)
+    assert key["constrained_columns"] == ["metric_id", "recorded_at"]
+    assert [c.name for c in inspect(HealthMetric).primary_key] == ["metric_id"]
+
+
+def test_partitions_created_with_parent_index_names():
+    with engine.connect() as conn:
+        names = [name for name, _ in list_partitions(conn, table)]
+        month = month_start(date.today())
+        assert names[-1] == default_partition_name(table)
+        assert partition_name(table, month) in names
+        assert partition_name(table, add_months(month, 3)) in names
+
+        indexes = {r[0] for r in conn.execute(text(
+            "SELECT indexname FROM pg_indexes WHERE tablename = :name"
+        ), {"name": partition_name(table, month)})}
+    assert f"ix_health_metrics_member_recorded_y{month.year}m{month.month:02d}" in indexes
+
+
+def test_rows_route_to_their_month(session, member_id):
+    session.add(HealthMetric(member_id=member_id, recorded_at=datetime.utcnow(), weight=70))
+    session.add(HealthMetric(member_id=member_id, recorded_at=datetime(2001, 1, 1), weight=80))
+    session.commit()
+
+    current = partition_name(table, month_start(date.today()))
+    counts = {
+        name: session.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+        for name in (current, default_partition_name(table))
+    }
+    assert counts == {current: 1, default_partition_name(table): 1}
+
+
+@pytest.fixture
+def member_id(session, club):
+    # end the session's transaction once the id is read, so the DDL below
+    # isn't queued behind its lock on members
+    member_id = club.member.member_id
+    session.commit()
+    return member_id
+
+
+def _count(connection, name):
+    return connection.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+
+
+def test_new_partition_takes_its_rows_from_default(member_id):
+    month = add_months(month_start(date.today()), 12)   # beyond the partitions made ahead
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [
+            dict(member_id=member_id, recorded_at=datetime.combine(month, datetime.min.time()), weight=70),
+            dict(member_id=member_id, recorded_at=datetime(2001, 1, 1), weight=80),
+        ])
+    with engine.begin() as conn:
+        assert partition_name(table, month) in ensure_partitions(conn, table, ahead=12)
+    with engine.connect() as conn:
+        assert _count(conn, partition_name(table, month)) == 1
+        assert _count(conn, default_partition_name(table)) == 1   # 2001 has no partition
+        assert _count(conn, table.name) == 2
+
+
+def test_moving_rows_out_of_default_holds_writes_to_it(member_id):
+    # a write into DEFAULT made right after the rows were moved must wait
+    # for the partition to be attached rather than slip in beside them
+    month = add_months(month_start(date.today()), 12)
+    blocked = []
+
+    def write_after_move(conn, cursor, statement, *args):
+        if not statement.startswith("WITH moved"):
+            return
+        with engine.connect() as writer:
+            try:
+                with writer.begin():
+                    writer.execute(text("SET LOCAL lock_timeout = '200ms'"))
+                    writer.execute(table.insert().values(
+                        member_id=member_id, recorded_at=datetime.combine(month, datetime.min.time()), weight=80,
+                    ))
+            except OperationalError as e:
+                blocked.append("lock timeout" in str(e))
+
+    with engine.begin() as creator:
+        event.listen(creator, "after_cursor_execute", write_after_move)
+        create_partition(creator, table, month)
+    assert blocked == [True]
+
+
+def test_detach_keeps_old_months_as_archive_tables(member_id):
+    first = add_months(month_start(date.today()), -5)
+    with engine.begin() as conn:
+        ensure_partitions(conn, table, first=first)
+        conn.execute(table.insert(), [
+            dict(member_id=member_id, recorded_at=datetime.combine(add_months(first, n), datetime.min.time()),
+                 weight=70)
+            for n in range(6)
+        ])
+    try:
+        with engine.begin() as conn:
+            detached = detach_partitions(conn, table, keep_months=3, archive=True)
+        assert detached == [partition_name(table, add_months(first, n)) for n in range(3)]
+        with engine.connect() as conn:
+            assert _count(conn, table.name) == 3
+            assert _count(conn, f"{ARCHIVE_SCHEMA}.{detached[0]}") == 1
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {ARCHIVE_SCHEMA} CASCADE"))
+
+
+# health_metrics as the baseline release (and m001) created it
+UNPARTITIONED = [
+    "CREATE TABLE health_metrics (metric_id SERIAL PRIMARY KEY,"
+    " member_id INTEGER NOT NULL REFERENCES members (member_id) ON DELETE CASCADE,"
+    " recorded_at TIMESTAMP NOT NULL, weight NUMERIC, heart_rate INTEGER, body_fat_pct NUMERIC, notes VARCHAR)",
+    "CREATE INDEX ix_health_metrics_metric_id ON health_metrics (metric_id)",
+    "CREATE INDEX ix_health_metrics_member_recorded ON health_metrics (member_id, recorded_at DESC)",
+]
+
+
+def test_m009_converts_an_existing_table(session, member_id):
+    first = add_months(month_start(date.today()), -2)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE health_metrics CASCADE"))
+        for statement in UNPARTITIONED:
+            conn.execute(text(statement))
+        conn.execute(table.insert(), [
+            dict(member_id=member_id, recorded_at=datetime.combine(add_months(first, n), datetime.min.time()), weight=70)
+            for n in range(3)
+        ])
+        m009.upgrade(conn)
+
+    with engine.connect() as conn:
+        assert is_partitioned(conn, table)
+        assert to_regclass(conn, m009.OLD) is None
+        for n in range(3):
+            assert _count(conn, partition_name(table, add_months(first, n))) == 1
+        assert m009.verify(conn)
+        assert m001.verify(conn)
+
+    # the sequence carried over, so new ids follow the copied ones
+    session.add(HealthMetric(member_id=member_id, recorded_at=datetime.utcnow(), weight=71))
+    session.commit()
+    assert session.execute(text("SELECT max(metric_id) FROM health_metrics")).scalar() == 4
+
+
+def to_regclass(conn, name):
+    return conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
@@ -0,0 +1,121 @@
+# tests/test_query_counts.py
+# Statement budgets for the listing views: each view issues a fixed number of
+# SQL statements, on the first (cold identity cache) call as well as once
+# warm, however many rows it shows.
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from app.admin_service import update_maintenance_issue
+from app.identity_cache import caches
+from app.member_service import show_dashboard, view_health_history
+from app.trainer_service import view_schedule
+from benchmarks.bench_services import call
+from models import (
+    Equipment,
+    EquipmentMaintenance,
+    FitnessClass,
+    FitnessGoal,
+    HealthMetric,
+    PersonalTrainingSession,
+    engine,
+)
+
+EXTRA_ROWS = 25
+START = datetime(2060, 1, 1, 6)   # upcoming, and clear of other bookings
+
+
+def add_schedule_rows(session, ids, first, count):
+    # upcoming classes and PT sessions for the trainer, alternating rooms
+    for i in range(first, first + count):
+        start = START + timedelta(hours=2 * i)
+        room_id = (ids.room, ids.other_room)[i % 2]
+        session.add(FitnessClass(
+            trainer_id=ids.trainer, room_id=room_id,
+            created_by_admin_id=ids.admin, class_name="Query Count Check",
+            start_time=start, end_time=start + timedelta(minutes=50), capacity=10, status="scheduled",
+        ))
+        session.add(PersonalTrainingSession(
+            member_id=ids.member, trainer_id=ids.trainer, room_id=room_id,
+            start_time=start + timedelta(hours=1), end_time=start + timedelta(hours=1, minutes=50),
+            status="scheduled",
+        ))
+
+
+def add_maintenance_rows(session, ids, first, count):
+    # each record on its own equipment, so the listing shows them all
+    for i in range(first, first + count):
+        equipment = Equipment(room_id=ids.room, equipment_name=f"Bike {i}")
+        session.add(equipment)
+        session.flush()
+        session.add(EquipmentMaintenance(
+            equipment_id=equipment.equipment_id, admin_id=ids.admin,
+            reported_at=START + timedelta(minutes=i), status="open",
+            issue_description="Query count check",
+        ))
+
+
+def add_member_rows(session, ids, first, count):
+    for i in range(first, first + count):
+        session.add(HealthMetric(
+            member_id=ids.member, recorded_at=START + timedelta(days=i), weight=70, heart_rate=60,
+        ))
+        session.add(FitnessGoal(
+            member_id=ids.member, goal_type="weight_loss", target_value=1, unit="kg",
+            start_date=date(2060, 1, 1), status="active",
+        ))
+
+
+# view -> (service, input() answers, add rows, statements when cold, when warm)
+VIEWS = {
+    "view_schedule": (view_schedule, ["tom@club.com"], add_schedule_rows, 3, 2),
+    "update_maintenance_issue": (update_maintenance_issue, ["0", "in_progress"], add_maintenance_rows, 2, 2),
+    "show_dashboard": (show_dashboard, ["mia@club.com"], add_member_rows, 1, 1),
+    "view_health_history": (view_health_history, ["mia@club.com", "q"], add_member_rows, 2, 1),
+}
+
+
+@pytest.fixture
+def statements():
+    counter = {"n": 0}
+
+    def count(conn, cursor, statement, *args):
+        # SQLite's BEGIN is sent explicitly (models/base.py); PostgreSQL's
+        # driver opens transactions without a statement of its own
+        if statement != "BEGIN":
+            counter["n"] += 1
+
+    def run(fn, answers):
+        counter["n"] = 0
+        call(fn, answers)
+        return counter["n"]
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield run
+    event.remove(engine, "before_cursor_execute", count)
+
+
+@pytest.mark.parametrize("name", VIEWS)
+def test_statement_budget(session, club, statements, name):
+    fn, answers, add_rows, cold_budget, budget = VIEWS[name]
+    # the views close the shared session, detaching the club objects
+    ids = SimpleNamespace(
+        admin=club.admin.admin_id, trainer=club.trainer.trainer_id, member=club.member.member_id,
+        room=club.room.room_id, other_room=club.other_room.room_id,
+    )
+    add_rows(session, ids, 0, 1)
+    session.commit()
+
+    cold = statements(fn, answers)
+    assert cold <= cold_budget
+    warm = statements(fn, answers)
+    assert warm <= budget
+
+    add_rows(session, ids, 1, EXTRA_ROWS)
+    session.commit()
+    assert statements(fn, answers) == warm
+    for cache in caches.values():
+        cache.clear()
+    assert statements(fn, answers) == cold
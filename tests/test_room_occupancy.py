@@ -0,0 +1,45 @@
+# tests/test_room_occupancy.py
+# Class seats in the hourly buckets follow registrations, and agree with a
+# rebuild from scratch.
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.occupancy import rebuild_occupancy
+from app.registration_service import cancel_registration, register_for_class
+from models import FitnessClass, Member, RoomOccupancyHourly
+
+START = datetime(2060, 1, 5, 9)
+
+
+def _seat_minutes(session):
+    return session.execute(
+        select(RoomOccupancyHourly.hour_start, RoomOccupancyHourly.bookings, RoomOccupancyHourly.seat_minutes)
+        .order_by(RoomOccupancyHourly.hour_start)
+    ).all()
+
+
+def test_class_seats_follow_registrations(session, club):
+    fitness_class = FitnessClass(
+        trainer_id=club.trainer.trainer_id, room_id=club.room.room_id,
+        created_by_admin_id=club.admin.admin_id, class_name="Spin",
+        start_time=START, end_time=START.replace(minute=30), capacity=10, status="scheduled",
+    )
+    other = Member(first_name="Oli", last_name="Other", email="oli@club.com", password_hash="x")
+    session.add_all([fitness_class, other])
+    session.commit()
+    class_id, member_ids = fitness_class.class_id, (club.member.member_id, other.member_id)
+    assert _seat_minutes(session) == [(START, 1, 0)]
+
+    for member_id in member_ids:
+        register_for_class(session, member_id, class_id)
+    session.commit()
+    assert _seat_minutes(session) == [(START, 1, 60)]
+
+    cancel_registration(session, member_ids[0], class_id)
+    session.commit()
+    assert _seat_minutes(session) == [(START, 1, 30)]
+
+    rebuild_occupancy(session.connection())
+    session.commit()
+    assert _seat_minutes(session) == [(START, 1, 30)]
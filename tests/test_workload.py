@@ -0,0 +1,40 @@
+# tests/test_workload.py
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import select
+
+from app.operations import OPERATIONS, prepare
+from app.workload import refresh_workload
+from models import PersonalTrainingSession, TrainerWorkloadDirty
+
+MONDAY = date(2030, 1, 7)
+
+
+def _session(club, start):
+    return PersonalTrainingSession(
+        member_id=club.member.member_id, trainer_id=club.trainer.trainer_id, room_id=club.room.room_id,
+        start_time=start, end_time=start + timedelta(hours=1), status="scheduled",
+    )
+
+
+def _pt_sessions(session, club):
+    spec, args = prepare("trainer_workload", dict(
+        week_start=MONDAY.isoformat(), trainer_id=club.trainer.trainer_id,
+    ))
+    (row,) = spec.run(session, **args)
+    return row.pt_sessions
+
+
+def test_api_reads_refreshed_weeks(session, club):
+    session.add(_session(club, datetime.combine(MONDAY, time(9))))
+    session.commit()
+    refresh_workload()
+    assert _pt_sessions(session, club) == 1
+
+    # the new booking only marks its week stale; the read refreshes it
+    session.add(_session(club, datetime.combine(MONDAY + timedelta(days=2), time(9))))
+    session.commit()
+    assert _pt_sessions(session, club) == 2
+    session.commit()
+    assert session.execute(select(TrainerWorkloadDirty)).first() is None
+    assert not OPERATIONS["trainer_workload"].read_only